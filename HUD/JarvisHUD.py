@@ -1,23 +1,40 @@
 import pygame
 import pyaudio
-import struct
 from PIL import Image, ImageSequence
 import datetime
-import calendar as cal_module
 import threading
 import os
-import cv2
 import mediapipe as mp
 import numpy as np
 import google.genai as genai
 import speech_recognition as sr
 import pyttsx3
 import json
+import queue
 import requests
-from bs4 import BeautifulSoup
 import urllib.parse
-from token_counter import estimate_tokens, estimate_conversation_tokens, trim_to_token_budget, create_conversation_summary, get_context_stats
+from token_counter import estimate_tokens, set_tokenizer
 from vits_tts import VITSTTSEngine
+from face_atlas import FaceAtlas
+from hud_renderer import HUDRenderer, HUDFonts
+from frame_profiler import FrameProfiler
+from hand_tracking import NO_HAND
+from tracking_scheduler import HandTrackingScheduler
+from camera_capture import CameraCapture
+from audio_capture import MicrophoneCapture, LevelMeter
+from audio_meter import band_pulse, measure_levels
+from gemini_stream import stream_response, FakeStreamingClient
+from request_pipeline import RequestPipeline, RequestCancelled
+from conversation_store import ConversationStore
+from budget_packer import Segment, pack_segments
+from prompt_cache import PromptCache, split_turns, build_prefix, build_suffix
+from response_cache import ResponseCache, response_fingerprint, is_time_sensitive
+from long_term_memory import LongTermMemory
+from summary_tree import SummaryTree
+from search_cache import SearchCache
+from http_client import HTTPClient, ContentRejected
+from page_enrichment import PageEnricher, result_url
+from html_extract import StreamingTextExtractor, extract_results, extract_text, resolve_backend
 
 # Load environment variables from .env file
 try:
@@ -31,14 +48,24 @@ except ImportError:
 
 # Gemini API Configuration
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')  # Load from environment variable
-if not GEMINI_API_KEY:
+GEMINI_MODEL = 'gemini-2.5-flash'  # Best price-performance
+ENABLE_STREAMING = True  # Show Gemini answers in the chat panel while they are generated
+USE_FAKE_GEMINI = os.getenv('LUDO_FAKE_GEMINI', '') == '1'  # Offline canned responses for testing
+REQUEST_QUEUE_SIZE = 4  # Queries waiting behind the running one (oldest dropped when full)
+REQUEST_TIMEOUT_S = 60  # Abandon a text query after this long
+VOICE_REQUEST_TIMEOUT_S = 90  # Voice queries also include listening time
+if not GEMINI_API_KEY and not USE_FAKE_GEMINI:
     print("⚠️ WARNING: GEMINI_API_KEY not found in environment variables!")
     print("Please create a .env file or set the GEMINI_API_KEY environment variable.")
     print("See .env.example for template.")
 
 try:
     # Configure Gemini API (new SDK)
-    if GEMINI_API_KEY:
+    if USE_FAKE_GEMINI:
+        gemini_client = FakeStreamingClient()
+        gemini_enabled = True
+        print("🧪 Using offline fake Gemini client (LUDO_FAKE_GEMINI=1)")
+    elif GEMINI_API_KEY:
         gemini_client = genai.Client(api_key=GEMINI_API_KEY)
         gemini_enabled = True
         print("✅ Gemini API initialized (google.genai SDK)")
@@ -54,6 +81,15 @@ except Exception as e:
 # Voice Assistant Configuration
 ENABLE_VOICE_ASSISTANT = True  # Set to True or False
 ENABLE_HAND_TRACKING = True  # Set to True or False for hand control
+HAND_TRACKING_FPS = 15  # Maximum hand inference rate
+HAND_TRACKING_WIDTH = 320  # Camera frames are downscaled to this width before inference
+HAND_MOTION_THRESHOLD = 3.0  # Skip inference while the camera image changes less than this (0-255)
+HAND_IDLE_INFERENCE_S = 1.0  # Still run inference this often when nothing moves
+CAMERA_WIDTH = 640  # Requested webcam resolution
+CAMERA_HEIGHT = 480
+CAMERA_FPS = 30  # Requested webcam frame rate
+CAMERA_FOURCC = "MJPG"  # Webcam pixel format ("" keeps the driver default)
+HAND_LATENCY_REPORT_S = 60  # Print capture-to-landmark latency this often (0 disables)
 
 # === VITS Neural Voice Configuration (FREE) ===
 USE_VITS_TTS = True  # Use VITS neural voices (Piper)
@@ -70,6 +106,10 @@ AZURE_VOICE_STYLE = "friendly"  # Speaking style: chat, cheerful, empathetic, ex
 AZURE_SPEAKING_RATE = 1.05  # 0.5 to 2.0 (1.0 = normal)
 AZURE_PITCH = "+0Hz"  # Pitch adjustment: -50Hz to +50Hz or relative like "+10%"
 
+# Frame Profiler (press P to toggle the per-section timing overlay)
+PROFILER_WINDOW = 90  # Frames averaged in the overlay
+PROFILER_JSONL_FILE = os.getenv('LUDO_PROFILE_JSONL', '')  # Append per-frame timings here while profiling (empty = off)
+
 # Voice Settings (Customize LUDO's voice here!)
 VOICE_INDEX = 1      # Voice selection: 0 (Microsoft David - smooth male voice)
 VOICE_RATE = 165        # Speech speed: 165 for younger, smoother sound
@@ -78,22 +118,78 @@ VOICE_VOLUME = 0.85     # Volume: 0.85 for softer, more soothing tone
 # Conversation Memory Settings
 MAX_CONVERSATION_HISTORY = 20  # Keep last N messages (user + assistant pairs)
 MAX_CONTEXT_TOKENS = 2000  # Maximum tokens for context window
+TOKENIZER = os.getenv('LUDO_TOKENIZER', 'auto')  # auto, heuristic, sentencepiece:<model path> or tiktoken:<encoding>
 RECENT_CONVERSATION_COUNT = 10  # Keep last N messages in full detail (5 exchanges)
 ENABLE_AUTO_SUMMARIZATION = True  # Automatically summarize old conversations
+SUMMARY_FANOUT = 4  # Block summaries merged into one higher-level summary
+SUMMARY_MAX_CHARS = 500  # Length of the summary sent with the prompt
+PROMPT_PREFIX_BLOCK = 6  # Messages per block of the cached prompt prefix (keep even: user + assistant pairs)
+ENABLE_CONTEXT_CACHING = True  # Store the stable prompt prefix with Gemini context caching
+CONTEXT_CACHE_MIN_TOKENS = 1024  # Smaller prefixes are sent inline (the API rejects smaller caches)
+CONTEXT_CACHE_TTL_S = 900  # Lifetime of the provider-side prompt cache
+WEB_RESULTS_HEADER = "\n\n[REAL-TIME WEB RESULTS]:\n"
+WEB_RESULTS_FOOTER = "\n[Use these current results to answer accurately.]\n"
+WEB_PAGES_HEADER = "\n\n[PAGE EXTRACTS]:\n"
+LUDO_SYSTEM_PROMPT = "You are LUDO, a helpful AI assistant with internet access. Use search results when provided for accurate, current information."
 MEMORY_FILE = r"E:\brainstroming\AI_Miles\HUD\.ludo_memory.json"  # Persistent memory file
 CONTEXT_FILE = r"E:\brainstroming\AI_Miles\HUD\.ludo_context.json"  # Project context file
 PROJECTS_FILE = r"E:\brainstroming\AI_Miles\HUD\.ludo_projects.json"  # Project tracking file
 
+# Response cache settings
+ENABLE_RESPONSE_CACHE = True  # Reuse answers to repeated questions instead of calling the API
+RESPONSE_CACHE_FILE = r"E:\brainstroming\AI_Miles\HUD\.ludo_response_cache.json"  # Persistent response cache
+RESPONSE_CACHE_MAX_ENTRIES = 200  # Least recently used answers beyond this are evicted
+RESPONSE_CACHE_TTL_S = 7 * 24 * 3600  # Lifetime of a cached answer
+RESPONSE_CACHE_SEARCH_TTL_S = 600  # Shorter lifetime for answers built on web results
+
+# Web search cache settings
+SEARCH_CACHE_FILE = r"E:\brainstroming\AI_Miles\HUD\.ludo_search_cache.json"  # Persistent search results
+SEARCH_CACHE_MAX_BYTES = 512 * 1024  # Least recently used searches beyond this size are evicted
+
+# HTTP settings (web search and page fetches share one pooled client)
+HTTP_CONNECT_TIMEOUT_S = 5  # Seconds to establish a connection
+HTTP_READ_TIMEOUT_S = 10  # Seconds to wait for data on an open connection
+HTTP_PER_HOST_CONNECTIONS = 4  # Concurrent keep-alive connections per host
+ENABLE_HTTP2 = False  # Use httpx with HTTP/2 (needs the h2 package; falls back to requests)
+HTML_BACKEND = resolve_backend(os.getenv('LUDO_HTML_BACKEND', 'auto'))  # auto, stream, selectolax, lxml or bs4
+PAGE_MAX_BYTES = 512 * 1024  # Page downloads stop after this many bytes
+PAGE_TEXT_MAX_CHARS = 2000  # Page downloads stop once this much text was extracted
+ENABLE_PAGE_ENRICHMENT = True  # Add text from the top result pages to the web context
+WEB_ENRICH_TOP_N = 3  # Result pages fetched concurrently
+WEB_ENRICH_DEADLINE_S = 2.5  # Pages that have not arrived by then are cancelled
+WEB_PAGES_MAX_TOKENS = 600  # Budget shared by the page extracts
+
+# Long-term memory settings
+ENABLE_LONG_TERM_MEMORY = True  # Archive every exchange and recall relevant old ones by BM25
+MEMORY_INDEX_FILE = r"E:\brainstroming\AI_Miles\HUD\.ludo_memory_index.db"  # SQLite archive + full-text index
+MEMORY_RECALL_K = 5  # Candidate exchanges retrieved per question
+MEMORY_RECALL_TOKENS = 300  # Token budget for recalled exchanges
+MEMORY_RECALL_HEADER = "\n[Related earlier conversation]:\n"
+
 # Voice assistant globals
 user_query = ""
 assistant_response = ""
 listening = False
 processing = False
-conversation_history = []  # Stores conversation memory
-conversation_summary = ""  # Condensed summary of old conversations
+conversation_history = ConversationStore()  # Stores conversation memory
+conversation_summary = SummaryTree(SUMMARY_FANOUT, max_chars=SUMMARY_MAX_CHARS)  # Condensed summary of old conversations
+summarized_messages = 0  # Leading conversation_history messages already in conversation_summary
+summary_lock = threading.Lock()
+streaming_exchange = None  # (history length, query, partial answer) while a response is streaming in
 text_input = ""  # Text input buffer
 input_active = False  # Whether text input is active
-search_cache = {}  # Cache for web search results (query -> results)
+search_cache = SearchCache(SEARCH_CACHE_FILE, SEARCH_CACHE_MAX_BYTES)  # Web search results (per-class TTL, stale-while-revalidate)
+http_client = HTTPClient(HTTP_CONNECT_TIMEOUT_S, HTTP_READ_TIMEOUT_S, HTTP_PER_HOST_CONNECTIONS, http2=ENABLE_HTTP2)
+page_enricher = PageEnricher(lambda url, cancel: fetch_url_content(url, cancel))
+print(f"🔢 Token counting with {set_tokenizer(TOKENIZER).name}")
+prompt_cache = PromptCache(gemini_client, GEMINI_MODEL, CONTEXT_CACHE_TTL_S, CONTEXT_CACHE_MIN_TOKENS, ENABLE_CONTEXT_CACHING)
+response_cache = ResponseCache(RESPONSE_CACHE_FILE, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_S) if ENABLE_RESPONSE_CACHE else None
+long_term_memory = None
+if ENABLE_LONG_TERM_MEMORY:
+    try:
+        long_term_memory = LongTermMemory(MEMORY_INDEX_FILE)
+    except Exception as e:
+        print(f"⚠️ Long-term memory unavailable: {e}")
 
 # VITS TTS engine
 vits_engine = None
@@ -119,9 +215,7 @@ current_context = {
 projects_data = {}  # Tracks project activity and deadlines
 
 
-hand_landmarks_global = None
-hand_closed_global = False
-wrist_screen_pos = (0, 0)
+hand_snapshot = NO_HAND  # Latest HandSnapshot (screen-space points, fist state, wrist, sequence number)
 ludo_x = None
 ludo_y = None
 grab_active = False
@@ -140,6 +234,9 @@ chat_font = pygame.font.SysFont("Segoe UI Emoji", 20)  # Supports emojis
 
 track_font = pygame.font.SysFont("SF Mono", 18)
 
+# Wrapped + pre-rendered chat/notepad text, reused across frames
+TEXT_LAYOUT_CACHE_SIZE = 256  # Max cached layouts (LRU eviction)
+
 
 
 CYAN = (0, 255, 255)
@@ -164,8 +261,18 @@ pygame.display.set_caption('L.U.D.O')
 # Load LUDO face GIF
 gif_path = r'E:\brainstroming\AI_Miles\HUD\jarvis.gif'
 gif = Image.open(gif_path)
-frames = [frame.copy().convert("RGBA") for frame in ImageSequence.Iterator(gif)]
-frame_surfaces = [pygame.image.frombuffer(frame.tobytes(), frame.size, "RGBA") for frame in frames]
+
+# Face frames are tinted once and cached at quantized scales. Frames are decoded
+# one at a time so only the tinted copies stay in memory.
+FACE_ATLAS_SCALE_STEPS = 8  # Number of distinct face sizes between silence and loud input
+FACE_ATLAS_MAX_MB = 256  # Memory ceiling for cached scaled frames; whole steps only (800x600 GIF: the 3 quietest steps)
+face_atlas = FaceAtlas(
+    (pygame.image.frombuffer(rgba.tobytes(), rgba.size, "RGBA")
+     for rgba in (frame.convert("RGBA") for frame in ImageSequence.Iterator(gif))),
+    CYAN, base_scale=0.6, scale_steps=FACE_ATLAS_SCALE_STEPS, max_bytes=FACE_ATLAS_MAX_MB * 1024 * 1024
+)
+gif.close()
+face_atlas.prewarm()
 
 # Load Discord Icon
 discord_icon_path = r'E:\brainstroming\AI_Miles\HUD\discord.png'
@@ -182,113 +289,23 @@ discord_pos_y = screen.get_height() - discord_icon.get_height() - discord_offset
 
 
 
-# PyAudio setup
+# PyAudio setup (callback mode - the render loop only reads the published level)
+AUDIO_METER_WINDOW = 2048  # Samples measured per level update
+FACE_PEAK_ATTACK = 12000  # Sample peak above which the face snaps toward the new size
 try:
     p = pyaudio.PyAudio()
-    stream = p.open(format=pyaudio.paInt16, channels=1, rate=44100, input=True, frames_per_buffer=512)
+    mic_capture = MicrophoneCapture(p, rate=44100, channels=1, frames_per_buffer=512)
+    audio_meter = LevelMeter(mic_capture.ring, lambda data: measure_levels(data, rate=44100),
+                             window_bytes=AUDIO_METER_WINDOW * 2)
+    mic_capture.start()
+    audio_meter.start()
     audio_enabled = True
 except Exception as e:
     print(f"Audio initialization failed: {e}. Running without audio visualization.")
     audio_enabled = False
     p = None
-    stream = None
-
-def get_volume(data):
-    count = len(data) // 2
-    format = "%dh" % count
-    shorts = struct.unpack(format, data)
-    sum_squares = sum(s**2 for s in shorts)
-    return (sum_squares / count)**0.5
-
-def get_calendar_data():
-    try:
-        now = datetime.datetime.now()
-        month_cal = cal_module.month(now.year, now.month)
-        lines = month_cal.strip().split('\n')
-        return lines
-    except Exception as e:
-        print(f"Calendar fetch error: {e}")
-        return []
-
-
-
-def wrap_text(text, font, max_width):
-    """Wrap text to fit within a maximum width"""
-    words = text.split(' ')
-    lines = []
-    current_line = []
-    
-    for word in words:
-        test_line = ' '.join(current_line + [word])
-        test_surface = font.render(test_line, True, (255, 255, 255))
-        
-        if test_surface.get_width() <= max_width:
-            current_line.append(word)
-        else:
-            if current_line:
-                lines.append(' '.join(current_line))
-                current_line = [word]
-            else:
-                # Word is too long, split it
-                lines.append(word)
-    
-    if current_line:
-        lines.append(' '.join(current_line))
-    
-    return lines
-
-def render_calendar(surface, x, y):
-    lines = get_calendar_data()
-    if not lines:
-        return
-
-    today = datetime.datetime.now().day
-    weekdays = lines[1].split()
-    cell_width = 35
-    margin_left = 10
-    cell_height = calendar_font.get_height() + 6
-
-    header_surface = calendar_font.render(lines[0], True, CYAN)
-    surface.blit(header_surface, (x, y))
-    y_offset = y + header_surface.get_height() + 10
-
-    cur_x = x
-    for idx, day in enumerate(weekdays):
-        day_surface = calendar_font.render(day, True, CYAN)
-        if idx > 0:
-            cur_x += margin_left
-        surface.blit(day_surface, (cur_x, y_offset))
-        cur_x += cell_width
-
-    y_offset += cell_height + 10
-
-    for week_line in lines[2:]:
-        cur_x = x
-        for i in range(7):
-            start = i * 3
-            day_str = week_line[start:start+3].strip()
-            if day_str == '':
-                day_str = ' '
-
-            if i > 0:
-                cur_x += margin_left
-
-            if day_str.isdigit() and int(day_str) == today:
-                highlight_surf = pygame.Surface((cell_width, cell_height), pygame.SRCALPHA)
-                pygame.draw.ellipse(highlight_surf, CYAN + (HIGHLIGHT_ALPHA,), highlight_surf.get_rect())
-                surface.blit(highlight_surf, (cur_x, y_offset))
-                day_surface = calendar_font.render(day_str, True, BLACK)
-            else:
-                day_surface = calendar_font.render(day_str, True, CYAN)
-
-            day_rect = day_surface.get_rect()
-            day_pos_x = cur_x + (cell_width - day_rect.width) // 2
-            day_pos_y = y_offset + (cell_height - day_rect.height) // 2
-            surface.blit(day_surface, (day_pos_x, day_pos_y))
-
-            cur_x += cell_width
-
-        y_offset += cell_height + 6
+    mic_capture = None
+    audio_meter = None
 
 def toggle_fullscreen(screen, fullscreen):
     if fullscreen:
@@ -312,23 +329,46 @@ def save_conversation_memory():
     """Save conversation history to file"""
     try:
         with open(MEMORY_FILE, 'w', encoding='utf-8') as f:
-            json.dump(conversation_history, f, indent=2, ensure_ascii=False)
+            json.dump(conversation_history.to_list(), f, indent=2, ensure_ascii=False)
     except Exception as e:
         print(f"Failed to save memory: {e}")
 
 def load_conversation_memory():
     """Load conversation history from file"""
-    global conversation_history
     try:
         if os.path.exists(MEMORY_FILE):
             with open(MEMORY_FILE, 'r', encoding='utf-8') as f:
-                conversation_history = json.load(f)
+                conversation_history.replace(json.load(f))
             print(f"💾 Loaded {len(conversation_history)//2} previous conversation(s) from memory")
         else:
             print("💾 Starting with fresh memory")
     except Exception as e:
         print(f"Failed to load memory: {e}")
-        conversation_history = []
+        conversation_history.clear()
+
+def summarize_history(end):
+    """Fold conversation_history[:end] into the summary; each message is summarized once"""
+    global summarized_messages
+    with summary_lock:
+        if end > summarized_messages:
+            conversation_summary.add(conversation_history[summarized_messages:end])
+            print(f"📝 Summarized {end - summarized_messages} messages ({conversation_summary.messages} in total)")
+            summarized_messages = end
+
+def evict_history(count):
+    """Drop the oldest messages, summarizing any that had not been summarized yet"""
+    global summarized_messages
+    with summary_lock:
+        if ENABLE_AUTO_SUMMARIZATION and count > summarized_messages:
+            conversation_summary.add(conversation_history[summarized_messages:count])
+        conversation_history.drop_oldest(count)
+        summarized_messages = max(0, summarized_messages - count)
+
+def clear_conversation_summary():
+    global summarized_messages
+    with summary_lock:
+        conversation_summary.clear()
+        summarized_messages = 0
 
 # Context & Project Management Functions
 def save_context():
@@ -500,86 +540,85 @@ def get_project_reminders():
 # === Internet Access Functions ===
 def search_web(query, num_results=3):
     """Search the web using DuckDuckGo with caching and improved error handling"""
-    global search_cache
-    
-    # Check cache first
-    cache_key = query.lower().strip()
-    if cache_key in search_cache:
-        print(f"📦 Using cached search results for: {query[:50]}...")
-        return search_cache[cache_key]
+    # Check cache first; stale results are returned at once and refreshed in the background
+    results, fresh = search_cache.get(query)
+    if results:
+        if fresh:
+            print(f"📦 Using cached search results for: {query[:50]}...")
+        else:
+            print(f"📦 Using stale search results for: {query[:50]}... (refreshing)")
+            search_cache.refresh_async(query, lambda: fetch_search_results(query, num_results))
+        return results[:num_results]
     
+    results = fetch_search_results(query, num_results)
+    if results:
+        search_cache.put(query, results)
+    return results
+
+def fetch_search_results(query, num_results=3):
+    """Scrape DuckDuckGo results for a query (None when the search failed)"""
     try:
         search_url = f"https://html.duckduckgo.com/html/?q={urllib.parse.quote(query)}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
         
         print(f"🔍 Searching web for: {query[:50]}...")
-        response = requests.get(search_url, headers=headers, timeout=15)
+        response = http_client.get(search_url)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        results = []
-        for result in soup.find_all('div', class_='result')[:num_results]:
-            title_tag = result.find('a', class_='result__a')
-            snippet_tag = result.find('a', class_='result__snippet')
-            
-            if title_tag and snippet_tag:
-                title = title_tag.get_text(strip=True)
-                snippet = snippet_tag.get_text(strip=True)
-                url = title_tag.get('href', '')
-                
-                # Clean up snippet - limit length
-                if len(snippet) > 200:
-                    snippet = snippet[:200] + '...'
-                
-                results.append({
-                    'title': title,
-                    'url': url,
-                    'snippet': snippet
-                })
+        timing = response.timing
+        print(f"⏱️ Search: {timing.total_ms:.0f} ms (connect {timing.connect_ms:.0f} ms, {timing.bytes // 1024} KB)")
         
-        # Cache results (limit cache size to 20 entries)
-        if len(search_cache) > 20:
-            # Remove oldest entry
-            search_cache.pop(next(iter(search_cache)))
-        search_cache[cache_key] = results
+        # Parsing stops once num_results results have been read
+        results = extract_results(response.text, num_results, HTML_BACKEND)
+        for result in results:
+            # Clean up snippet - limit length
+            if len(result['snippet']) > 200:
+                result['snippet'] = result['snippet'][:200] + '...'
         
         return results
     except requests.exceptions.ConnectionError:
         print(f"⚠️ No internet connection available")
         return None  # Return None to indicate connection error
     except requests.exceptions.Timeout:
-        print(f"⚠️ Web search timed out (15s)")
+        print(f"⚠️ Web search timed out ({HTTP_READ_TIMEOUT_S}s)")
         return None
     except Exception as e:
         print(f"⚠️ Web search error: {type(e).__name__}: {str(e)[:50]}")
         return None
 
-def fetch_url_content(url):
-    """Fetch and extract main content from a URL"""
+def fetch_url_content(url, cancel=None):
+    """
+    Fetch and extract main content from a URL
+
+    The page is streamed: non-HTML responses are rejected from their headers
+    and the download stops at PAGE_MAX_BYTES or as soon as PAGE_TEXT_MAX_CHARS
+    of text have been extracted.
+
+    Args:
+        url: Page URL
+        cancel: Optional threading.Event; once set the download stops
+
+    Returns:
+        str or None: Up to PAGE_TEXT_MAX_CHARS characters of page text, None on failure
+    """
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(['script', 'style', 'nav', 'footer', 'header']):
-            script.decompose()
-        
-        # Get text content
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        # Limit to first 2000 characters
-        return text[:2000] if text else "Could not extract content from URL"
+        # Text outside scripts, styles, navigation, headers and footers
+        if HTML_BACKEND in ('auto', 'stream'):
+            extractor = StreamingTextExtractor(PAGE_TEXT_MAX_CHARS)
+            http_client.stream_text(url, extractor.feed, PAGE_MAX_BYTES, cancel=cancel)
+            text = extractor.text()
+        else:
+            # Tree-building backends need the whole (capped) document first
+            pieces = []
+            http_client.stream_text(url, pieces.append, PAGE_MAX_BYTES, cancel=cancel)
+            text = extract_text("".join(pieces), PAGE_TEXT_MAX_CHARS, HTML_BACKEND)
+        if cancel is not None and cancel.is_set():
+            return None
+        return text or None
+    except ContentRejected as e:
+        print(f"Skipped non-HTML page: {e}")
+        return None
     except Exception as e:
         print(f"URL fetch error: {e}")
-        return f"Error fetching URL: {str(e)}"
+        return None
 
 def check_if_needs_internet(query):
     """Determine if a query needs internet search with improved precision"""
@@ -628,7 +667,7 @@ def check_if_needs_internet(query):
     return False
 
 # Voice Assistant Functions
-def listen_for_voice():
+def listen_for_voice(request=None):
     """Listen for voice input and convert to text"""
     global user_query, listening, processing
     
@@ -648,23 +687,35 @@ def listen_for_voice():
             
             try:
                 query = recognizer.recognize_google(audio)
+                if request is not None:
+                    request.check()  # A newer query arrived while we were listening
                 user_query = query
                 print(f"You said: {query}")
-                get_gemini_response(query)
+                get_gemini_response(query, request)
             except sr.UnknownValueError:
                 print("Could not understand audio")
                 processing = False
             except sr.RequestError as e:
                 print(f"Speech recognition error: {e}")
                 processing = False
+    except RequestCancelled:
+        # Superseded: the pipeline records it and the newer request owns the UI state
+        raise
     except Exception as e:
         print(f"Microphone error: {e}")
         listening = False
         processing = False
 
-def get_gemini_response(query):
-    """Get response from Gemini API with optimized memory and internet access"""
-    global assistant_response, processing, conversation_history, conversation_summary, user_query
+def get_gemini_response(query, request=None):
+    """
+    Get response from Gemini API with optimized memory and internet access
+
+    Args:
+        query: User question
+        request: Pipeline Request; a stale request stops streaming and never
+                 touches conversation_history
+    """
+    global assistant_response, processing, conversation_history, user_query, streaming_exchange
     
     try:
         # Check if this is a notepad command
@@ -677,119 +728,229 @@ def get_gemini_response(query):
             return
         
         # Check if query needs internet search
-        web_context = ""
-        internet_available = True
+        web_note = ""  # Short instruction when search failed or found nothing
+        search_results = None
+        web_results = []
+        web_pages = []
+        needs_internet = check_if_needs_internet(query)
         
-        if check_if_needs_internet(query):
+        if needs_internet:
             print("🌐 Query requires internet search...")
             search_results = search_web(query, num_results=3)
             
             if search_results is None:
                 # Connection error - no internet
-                internet_available = False
-                web_context = "\n[SYSTEM: Internet search attempted but no connection available. Provide answer from training knowledge and inform user internet is unavailable.]\n"
+                web_note = "[SYSTEM: Internet search attempted but no connection available. Provide answer from training knowledge and inform user internet is unavailable.]"
             elif search_results:
-                # Found results - format concisely
-                web_context = "\n\n[REAL-TIME WEB RESULTS]:\n"
-                for i, result in enumerate(search_results, 1):
-                    web_context += f"{i}. {result['title']}\n{result['snippet']}\n"
-                web_context += "[Use these current results to answer accurately.]\n"
+                # Found results - format concisely, best first
+                web_results = [f"{i}. {result['title']}\n{result['snippet']}" for i, result in enumerate(search_results, 1)]
                 print(f"✅ Found {len(search_results)} results")
             else:
                 # No results found
-                web_context = "\n[SYSTEM: Web search found no results. Use training knowledge.]\n"
+                web_note = "[SYSTEM: Web search found no results. Use training knowledge.]"
         
         # === MEMORY OPTIMIZATION ===
         # Get current context stats
-        stats = get_context_stats(conversation_history)
+        stats = conversation_history.stats()
         print(f"📊 Memory: {stats['user_messages']} exchanges, ~{stats['total_tokens']} tokens")
         
-        # Build optimized context
+        # Older turns are represented by the summary; the window start only moves in
+        # blocks of PROMPT_PREFIX_BLOCK messages so the prompt prefix stays stable
+        window_start = 0
+        summary = ""
         if ENABLE_AUTO_SUMMARIZATION and len(conversation_history) > RECENT_CONVERSATION_COUNT:
-            # Split into recent and old conversations
-            old_conversations = conversation_history[:-RECENT_CONVERSATION_COUNT]
-            recent_conversations = conversation_history[-RECENT_CONVERSATION_COUNT:]
-            
-            # Summarize old conversations if not already done
-            if not conversation_summary and old_conversations:
-                conversation_summary = create_conversation_summary(old_conversations, max_length=300)
-                print(f"📝 Created summary of {len(old_conversations)} old messages")
-            
-            # Build context with summary + recent
-            if conversation_summary:
-                context = f"[Previous context summary: {conversation_summary}]\n\n" + "\n".join(recent_conversations)
-            else:
-                context = "\n".join(recent_conversations)
-        else:
-            # Use all history if small enough
-            context = "\n".join(conversation_history)
+            window_start = (len(conversation_history) - RECENT_CONVERSATION_COUNT) // PROMPT_PREFIX_BLOCK * PROMPT_PREFIX_BLOCK
+            # Only the blocks that left the window since the last turn are summarized
+            summarize_history(window_start)
+            summary = conversation_summary.text
+        window = conversation_history[window_start:]
         
-        # Apply token budget limit
-        context_tokens = estimate_tokens(context)
-        web_tokens = estimate_tokens(web_context)
+        # Recall older exchanges that are relevant to this question from the archive,
+        # skipping the ones still in the window
+        recalled = []
+        if long_term_memory is not None:
+            try:
+                before_id = long_term_memory.last_id - len(window) // 2 + 1
+                recalled = long_term_memory.recall(query, MEMORY_RECALL_TOKENS, MEMORY_RECALL_K, before_id)
+            except Exception as e:
+                print(f"Memory recall failed: {e}")
         
-        if context_tokens + web_tokens > MAX_CONTEXT_TOKENS:
-            print(f"⚠️ Context too large ({context_tokens + web_tokens} tokens), trimming...")
-            # Trim context to fit budget (leave room for web context)
-            available_tokens = MAX_CONTEXT_TOKENS - web_tokens - 100  # 100 token buffer
-            trimmed_history = trim_to_token_budget(conversation_history, available_tokens)
-            context = "\n".join(trimmed_history)
-            print(f"✂️ Trimmed to {len(trimmed_history)} messages (~{estimate_tokens(context)} tokens)")
+        # Reuse a cached answer when the same question meets the same web results.
+        # Questions that refer back ("what did I ask first?") are keyed on the
+        # conversation too. The key is taken before page enrichment and packing, whose
+        # output depends on which pages beat the deadline, so it is stable and a hit
+        # skips the page fetches.
+        cache_fingerprint = None
+        cached_answer = None
+        if response_cache is not None and not is_time_sensitive(query):
+            cache_fingerprint = response_fingerprint(
+                query, (LUDO_SYSTEM_PROMPT, web_note, "\n".join(web_results)),
+                (summary, "\n".join(window), "\n".join(recalled))
+            )
+            cached_answer = response_cache.get(query, cache_fingerprint)
         
-        # Build system prompt
-        if internet_available:
-            system_prompt = "You are LUDO, a helpful AI assistant with internet access. Use search results when provided for accurate, current information."
-        else:
-            system_prompt = "You are LUDO, a helpful AI assistant. Internet access currently unavailable."
+        # Read the top pages in parallel; whatever misses the deadline is dropped
+        if ENABLE_PAGE_ENRICHMENT and search_results and cached_answer is None:
+            urls = [result_url(result['url']) for result in search_results[:WEB_ENRICH_TOP_N]]
+            extracts, enrich_stats = page_enricher.enrich(
+                urls, WEB_ENRICH_DEADLINE_S, WEB_PAGES_MAX_TOKENS,
+                should_stop=(lambda: request.cancelled) if request is not None else None
+            )
+            web_pages = [f"[{i + 1}] {search_results[i]['title']}: {text}" for i, text in sorted(extracts.items())]
+            print(f"📄 Page extracts: {enrich_stats}")
         
-        # Build full conversation
-        if context:
-            full_conversation = f"{system_prompt}\n\n{context}\n{web_context}\nUser: {query}\nLUDO:"
+        # Share MAX_CONTEXT_TOKENS by priority: the system prompt, the question and the
+        # last exchange always go in, then web results, page extracts, earlier turns
+        # (newest first), the summary and finally recalled exchanges. Only the system
+        # prompt and history turns recur across turns, so only their counts are memoized.
+        required = [f"User: {query}\nLUDO:"]
+        if web_note:
+            required.append(web_note)
+        elif web_results:
+            required.append(WEB_RESULTS_HEADER + WEB_RESULTS_FOOTER + (WEB_PAGES_HEADER if web_pages else ""))
+        packed = pack_segments([
+            Segment("system", [LUDO_SYSTEM_PROMPT], 0, min_items=1, count_tokens=estimate_tokens),
+            Segment("query", required, 0, min_items=len(required)),
+            Segment("web", web_results, 1),
+            Segment("pages", web_pages, 2),
+            Segment("turns", window, 3, keep="newest", min_items=2, count_tokens=estimate_tokens),
+            Segment("summary", [summary] if summary else [], 4),
+            Segment("recalled", recalled, 5),
+        ], MAX_CONTEXT_TOKENS)
+        print(f"📦 Context budget {MAX_CONTEXT_TOKENS}: {packed.breakdown()}")
+        
+        web_context = ""
+        if packed['web']:
+            web_context = WEB_RESULTS_HEADER + "\n".join(packed['web'])
+            if packed['pages']:
+                web_context += WEB_PAGES_HEADER + "\n".join(packed['pages'])
+            web_context += WEB_RESULTS_FOOTER
+        elif web_note:
+            web_context = f"\n{web_note}\n"
+        memory_context = MEMORY_RECALL_HEADER + "\n".join(packed['recalled']) + "\n" if packed['recalled'] else ""
+        
+        # Build the prompt as a stable prefix (system prompt, summary, older turns) and a
+        # small per-turn suffix, split at a block boundary so the prefix repeats across
+        # turns and can be served from Gemini's context cache
+        if packed.allocation['turns']['dropped'] == 0:
+            stable_turns, recent_turns = split_turns(window, PROMPT_PREFIX_BLOCK)
         else:
-            full_conversation = f"{system_prompt}\n\n{web_context}\nUser: {query}\nLUDO:"
+            stable_turns, recent_turns = [], packed['turns']
+        prompt_prefix = build_prefix(LUDO_SYSTEM_PROMPT, "".join(packed['summary']), stable_turns)
+        prompt_suffix = build_suffix(recent_turns, memory_context + web_context, query)
         
-        # Final token check
-        final_tokens = estimate_tokens(full_conversation)
-        print(f"🎯 Sending {final_tokens} tokens to API")
+        # Send to Gemini, showing the answer in the chat panel as it streams in
+        history_length = len(conversation_history)
         
-        # Send to Gemini (new SDK - using Gemini 2.5 Flash for best price-performance)
-        response = gemini_client.models.generate_content(
-            model='gemini-2.5-flash',
-            contents=full_conversation
-        )
+        def publish(apply):
+            # UI state is written under the commit lock, so a superseded request can
+            # never overwrite what the request that replaced it shows
+            if request is None:
+                apply()
+            elif not request.commit(apply):
+                raise RequestCancelled(query)
         
-        assistant_response = response.text
+        def show_partial(text):
+            def apply():
+                global assistant_response, streaming_exchange
+                assistant_response = text
+                streaming_exchange = (history_length, query, text)
+            publish(apply)
         
-        # Store in conversation history (without web context to save space)
-        conversation_history.append(f"User: {query}")
-        conversation_history.append(f"LUDO: {assistant_response}")
+        # The answer stays local until commit_exchange publishes it
+        if cached_answer is not None:
+            answer = cached_answer
+            print(f"⚡ Response cache hit ({response_cache.report()})")
+        else:
+            contents, config, sent_tokens = prompt_cache.request(prompt_prefix, prompt_suffix)
+            print(f"🎯 Sending ~{sent_tokens} tokens to API (prefix ~{prompt_cache.prefix_tokens}, "
+                  f"{'cached' if config else 'inline'})")
+            
+            def start_stream():
+                global streaming_exchange
+                streaming_exchange = (history_length, query, "")
+            publish(start_stream)
+            try:
+                answer, timings = stream_response(
+                    gemini_client, GEMINI_MODEL, contents,
+                    on_text=show_partial, stream=ENABLE_STREAMING, config=config
+                )
+            except RequestCancelled:
+                raise
+            except Exception as e:
+                if config is None:
+                    raise
+                # The cached prefix expired or was evicted: drop it and resend inline
+                print(f"⚠️ Cached prompt prefix rejected ({e}), retrying inline")
+                contents, config, sent_tokens = prompt_cache.cache_failed(prompt_prefix, prompt_suffix)
+                answer, timings = stream_response(
+                    gemini_client, GEMINI_MODEL, contents,
+                    on_text=show_partial, stream=ENABLE_STREAMING, config=config
+                )
+            ttft = f"{timings.ttft_ms:.0f} ms" if timings.ttft_ms is not None else "n/a"
+            print(f"⏱️ Gemini: first token {ttft}, total {timings.total_ms:.0f} ms ({timings.chunks} chunks)")
+            if timings.prompt_tokens is not None:
+                print(f"📨 Input tokens: {timings.prompt_tokens} billed, {timings.cached_tokens or 0} from cache")
         
-        # Limit conversation history size
-        if len(conversation_history) > MAX_CONVERSATION_HISTORY:
-            # Move excess to summary before trimming
-            if ENABLE_AUTO_SUMMARIZATION:
-                excess = conversation_history[:len(conversation_history) - MAX_CONVERSATION_HISTORY]
-                if excess:
-                    old_summary = conversation_summary
-                    new_summary = create_conversation_summary(excess, max_length=200)
-                    conversation_summary = f"{old_summary} | {new_summary}" if old_summary else new_summary
-                    # Trim summary if too long
-                    if len(conversation_summary) > 500:
-                        conversation_summary = conversation_summary[-500:]
+        def commit_exchange():
+            global assistant_response, streaming_exchange
+            assistant_response = answer
+            # Store in conversation history (without web context to save space)
+            conversation_history.append(f"User: {query}")
+            conversation_history.append(f"LUDO: {answer}")
+            streaming_exchange = None
+            # Spoken by the speech thread, outside this request's timeout
+            speech_queue.put(answer)
+            if long_term_memory is not None:
+                try:
+                    long_term_memory.add(query, answer)
+                except Exception as e:
+                    print(f"Failed to archive exchange: {e}")
             
-            conversation_history = conversation_history[-MAX_CONVERSATION_HISTORY:]
+            # Limit conversation history size, trimming whole prompt blocks so the
+            # cached prompt prefix stays aligned
+            if len(conversation_history) > MAX_CONVERSATION_HISTORY:
+                overflow = len(conversation_history) - MAX_CONVERSATION_HISTORY
+                trim = -(-overflow // PROMPT_PREFIX_BLOCK) * PROMPT_PREFIX_BLOCK
+                evict_history(trim)
+            
+            # Save memory to file
+            save_conversation_memory()
+        
+        # Only the current request may write history, in submission order
+        publish(commit_exchange)
         
-        # Save memory to file
-        save_conversation_memory()
+        if cache_fingerprint and cached_answer is None:
+            response_cache.put(query, cache_fingerprint, answer, timings.total_ms,
+                               ttl_s=RESPONSE_CACHE_SEARCH_TTL_S if needs_internet else None)
         
-        print(f"LUDO: {assistant_response}")
+        print(f"LUDO: {answer}")
         print(f"💾 Memory: {len(conversation_history)//2} exchanges saved, {len(conversation_summary)} chars summarized")
-        speak_response(assistant_response)
+    except RequestCancelled:
+        print(f"⏭️ Dropped stale answer to: {query}")
+        raise
     except Exception as e:
         print(f"Gemini API error: {e}")
-        assistant_response = "I'm sorry, I encountered an error."
+        
+        def show_error():
+            global assistant_response
+            assistant_response = "I'm sorry, I encountered an error."
+        
+        if request is None:
+            show_error()
+        else:
+            request.commit(show_error)
     finally:
-        processing = False
+        # A superseded request leaves the shared UI state to the one that replaced it
+        def finish():
+            global streaming_exchange, processing
+            streaming_exchange = None
+            processing = False
+        
+        if request is None:
+            finish()
+        else:
+            request.commit(finish)
 
 def detect_emotion(text):
     """Detect emotion from text to adjust voice style (simple version)"""
@@ -931,7 +1092,22 @@ def speak_response(text):
         # Final fallback to basic TTS
         speak_response_basic(text)
 
-def process_text_input(query):
+# Answers are queued here by the request that committed them and spoken one at a
+# time on the speech thread, so a long answer never counts against a request timeout
+speech_queue = queue.Queue()
+
+def speech_worker():
+    """Speak queued answers until None is queued"""
+    while True:
+        text = speech_queue.get()
+        if text is None:
+            break
+        try:
+            speak_response(text)
+        except Exception as e:
+            print(f"TTS error: {e}")
+
+def process_text_input(query, request=None):
     """Process text input from the chat box"""
     global processing, user_query
     
@@ -946,11 +1122,18 @@ def process_text_input(query):
     print(f"User (text): {query}")
     
     # Get response from Gemini
-    get_gemini_response(query)
+    get_gemini_response(query, request)
     
     user_query = ""
     processing = False
 
+def reset_request_state():
+    """Clear busy indicators once the request pipeline has nothing left to run"""
+    global processing, listening, streaming_exchange
+    processing = False
+    listening = False
+    streaming_exchange = None
+
 def list_available_voices():
     """Print all available voices on the system"""
     try:
@@ -973,8 +1156,6 @@ def voice_assistant_thread():
 def hand_tracking_thread():
     if not ENABLE_HAND_TRACKING:
         return
-    
-    global hand_landmarks_global, hand_closed_global, wrist_screen_pos
 
     try:
         # Try new mediapipe API first
@@ -989,7 +1170,8 @@ def hand_tracking_thread():
             try:
                 mp_hands = mp.solutions.hands
                 hands = mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.6, min_tracking_confidence=0.6)
-                cap = cv2.VideoCapture(0)  # Default Windows webcam
+                cap = CameraCapture(0, CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_FPS, CAMERA_FOURCC)  # Default Windows webcam
+                print(f"📷 Camera: {cap.settings()}")
             except AttributeError:
                 print("⚠️ Hand tracking disabled: MediaPipe version incompatible")
                 return
@@ -997,32 +1179,19 @@ def hand_tracking_thread():
         print(f"Hand tracking initialization failed: {e}")
         return
 
-    while True:
-        success, image = cap.read()
-        if not success:
-            continue
+    def publish(snapshot):
+        global hand_snapshot
+        hand_snapshot = snapshot
 
-        image = cv2.flip(image, 1)
-
-        if ENABLE_HAND_TRACKING:
-            results = hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-
-            if results.multi_hand_landmarks:
-                hand = results.multi_hand_landmarks[0]
-                hand_landmarks_global = hand
-
-                # Determine if hand is closed (fingertips below lower joints)
-                tips = [8, 12, 16, 20]
-                closed = all(hand.landmark[tip].y > hand.landmark[tip - 2].y for tip in tips)
-                hand_closed_global = closed
-
-                # Convert wrist landmark to screen coordinates
-                wrist = hand.landmark[0]
-                wrist_screen_pos = (int(wrist.x * screen.get_width()), int(wrist.y * screen.get_height()))
-            else:
-                results = None
-                hand_landmarks_global = None
-                hand_closed_global = False
+    scheduler = HandTrackingScheduler(
+        hands, cap, screen.get_size, publish,
+        max_fps=HAND_TRACKING_FPS,
+        inference_width=HAND_TRACKING_WIDTH,
+        motion_threshold=HAND_MOTION_THRESHOLD,
+        idle_inference_s=HAND_IDLE_INFERENCE_S,
+        latency_report_s=HAND_LATENCY_REPORT_S
+    )
+    scheduler.run()
 
 def main():
     global track_font, user_query, assistant_response, listening, processing, conversation_history, text_input, input_active  # So you can keep the correct font
@@ -1031,107 +1200,141 @@ def main():
     frame_idx = 0
     ludo_idx = 0
     gif_scale = 1.0
-    gif_width, gif_height = frame_surfaces[0].get_size()
+    face_bands = ()  # Smoothed band levels drawn around the face
     clock = pygame.time.Clock()
     track_font = pygame.font.Font(font_path, 26)  # Adjust size here
     assistant_font = pygame.font.Font(font_path, 18)  # For displaying conversation
     notepad_font = pygame.font.Font(None, 16)  # Font for notepad entries
     track_update_ms = 3000
     last_track_ms = 0
+    fonts = HUDFonts(clock_font, calendar_font, description_font, chat_font, assistant_font, notepad_font)
+    try:
+        hand_connections = mp.solutions.hands.HAND_CONNECTIONS
+    except AttributeError:
+        hand_connections = ()
+    profiler = FrameProfiler(window=PROFILER_WINDOW, jsonl_path=PROFILER_JSONL_FILE or None)
+    renderer = HUDRenderer(screen, fonts, face_atlas, discord_icon, hand_connections, TEXT_LAYOUT_CACHE_SIZE, profiler)
+    request_pipeline = RequestPipeline(max_pending=REQUEST_QUEUE_SIZE, timeout=REQUEST_TIMEOUT_S, on_idle=reset_request_state)
     threading.Thread(target=hand_tracking_thread, daemon=True).start()
+    threading.Thread(target=speech_worker, daemon=True).start()
     global ludo_x, ludo_y, grab_active
 
 
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    if input_active and text_input.strip():
-                        # Send text message
-                        query = text_input.strip()
-                        text_input = ""
-                        input_active = False
-                        # Process the query
-                        threading.Thread(target=lambda: process_text_input(query), daemon=True).start()
-                    else:
-                        fullscreen = toggle_fullscreen(screen, fullscreen)
-                elif event.key == pygame.K_ESCAPE:
-                    if input_active:
-                        input_active = False
-                        text_input = ""
-                    else:
-                        running = False
-                elif event.key == pygame.K_SPACE:
-                    if input_active:
-                        # Add space to text input when in typing mode
-                        text_input += " "
-                    elif not listening and not processing and ENABLE_VOICE_ASSISTANT:
-                        # Activate voice assistant with Space bar when not typing
-                        threading.Thread(target=listen_for_voice, daemon=True).start()
-                elif event.key == pygame.K_x:
-                    if not input_active:
-                        # Clear chat display only (keep memory) with 'X' key
-                        user_query = ""
-                        assistant_response = ""
-                        print("Chat display cleared (memory preserved)")
+        profiler.begin_frame()
+        with profiler.section('events'):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.VIDEORESIZE):
+                    # Window contents were lost or resized, repaint everything
+                    renderer.invalidate()
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_RETURN:
+                        if input_active and text_input.strip():
+                            # Send text message
+                            query = text_input.strip()
+                            text_input = ""
+                            input_active = False
+                            # Queue the query (supersedes any stale one still running)
+                            request_pipeline.submit(process_text_input, query, timeout=REQUEST_TIMEOUT_S, label=query)
+                        else:
+                            fullscreen = toggle_fullscreen(screen, fullscreen)
+                    elif event.key == pygame.K_ESCAPE:
+                        if input_active:
+                            input_active = False
+                            text_input = ""
+                        else:
+                            running = False
+                    elif event.key == pygame.K_SPACE:
+                        if input_active:
+                            # Add space to text input when in typing mode
+                            text_input += " "
+                        elif not listening and not processing and ENABLE_VOICE_ASSISTANT:
+                            # Activate voice assistant with Space bar when not typing
+                            request_pipeline.submit(listen_for_voice, timeout=VOICE_REQUEST_TIMEOUT_S, label="voice")
+                    elif event.key == pygame.K_x:
+                        if not input_active:
+                            # Clear chat display only (keep memory) with 'X' key
+                            user_query = ""
+                            assistant_response = ""
+                            print("Chat display cleared (memory preserved)")
+                        else:
+                            text_input += event.unicode
+                    elif event.key == pygame.K_c:
+                        if not input_active:
+                            # Clear conversation memory with 'C' key
+                            conversation_history.clear()
+                            clear_conversation_summary()
+                            if long_term_memory is not None:
+                                long_term_memory.clear()
+                            # Answers and the cached prompt prefix were built from the old memory
+                            if response_cache is not None:
+                                response_cache.clear()
+                            prompt_cache.invalidate()
+                            user_query = ""
+                            assistant_response = ""
+                            # Delete memory file
+                            try:
+                                if os.path.exists(MEMORY_FILE):
+                                    os.remove(MEMORY_FILE)
+                            except Exception as e:
+                                print(f"Failed to delete memory file: {e}")
+                            print("Conversation memory cleared!")
+                        else:
+                            text_input += event.unicode
+                    elif event.key == pygame.K_n:
+                        if not input_active:
+                            # Clear notepad with 'N' key
+                            notepad_entries.clear()
+                            # Delete notepad file
+                            try:
+                                if os.path.exists(NOTEPAD_FILE):
+                                    os.remove(NOTEPAD_FILE)
+                            except Exception as e:
+                                print(f"Failed to delete notepad file: {e}")
+                            print("📝 Notepad cleared!")
+                        else:
+                            text_input += event.unicode
+                    elif event.key == pygame.K_p:
+                        if not input_active:
+                            # Toggle the frame profiler overlay with 'P' key
+                            profiler.toggle()
+                            renderer.invalidate()
+                        else:
+                            text_input += event.unicode
+                    elif event.key == pygame.K_BACKSPACE:
+                        if input_active:
+                            text_input = text_input[:-1]
+                    elif event.key == pygame.K_TAB:
+                        # Toggle text input mode
+                        input_active = not input_active
+                        if not input_active:
+                            text_input = ""
                     else:
-                        text_input += event.unicode
-                elif event.key == pygame.K_c:
-                    if not input_active:
-                        # Clear conversation memory with 'C' key
-                        conversation_history.clear()
-                        user_query = ""
-                        assistant_response = ""
-                        # Delete memory file
-                        try:
-                            if os.path.exists(MEMORY_FILE):
-                                os.remove(MEMORY_FILE)
-                        except Exception as e:
-                            print(f"Failed to delete memory file: {e}")
-                        print("Conversation memory cleared!")
-                    else:
-                        text_input += event.unicode
-                elif event.key == pygame.K_n:
-                    if not input_active:
-                        # Clear notepad with 'N' key
-                        notepad_entries.clear()
-                        # Delete notepad file
-                        try:
-                            if os.path.exists(NOTEPAD_FILE):
-                                os.remove(NOTEPAD_FILE)
-                        except Exception as e:
-                            print(f"Failed to delete notepad file: {e}")
-                        print("📝 Notepad cleared!")
-                    else:
-                        text_input += event.unicode
-                elif event.key == pygame.K_BACKSPACE:
-                    if input_active:
-                        text_input = text_input[:-1]
-                elif event.key == pygame.K_TAB:
-                    # Toggle text input mode
-                    input_active = not input_active
-                    if not input_active:
-                        text_input = ""
-                else:
-                    # Add character to text input
-                    if input_active and event.unicode.isprintable():
-                        text_input += event.unicode
+                        # Add character to text input
+                        if input_active and event.unicode.isprintable():
+                            text_input += event.unicode
 
         try:
-            if audio_enabled and stream:
-                audio_data = stream.read(2048, exception_on_overflow=False)
-                volume = get_volume(audio_data)
-
-                scale_factor = 1 + min(volume / 1000, 1)
-                gif_scale = 0.9 * gif_scale + 0.1 * scale_factor
-            else:
-                # No audio, use default scale
-                gif_scale = 1.0
-
-            scaled_width = int(gif_width * gif_scale * 0.6)  # Reduced to 60% size
-            scaled_height = int(gif_height * gif_scale * 0.6)
+            with profiler.section('audio'):
+                # Latest rms / peak / band energies published by the meter thread
+                if audio_enabled and audio_meter:
+                    levels = audio_meter.levels
+
+                    # The face follows loudness; a sharp peak (plosive, clap) makes it jump
+                    scale_factor = 1 + min(levels.rms / 1000, 1)
+                    attack = 0.4 if levels.peak > FACE_PEAK_ATTACK else 0.1
+                    gif_scale = (1 - attack) * gif_scale + attack * scale_factor
+
+                    # The band ring rises at once and falls back smoothly
+                    pulse = band_pulse(levels)
+                    face_bands = (tuple(max(level, 0.85 * previous) for level, previous in zip(pulse, face_bands))
+                                  if face_bands else pulse)
+                else:
+                    # No audio, use default scale
+                    gif_scale = 1.0
+                    face_bands = ()
 
             now_ms = pygame.time.get_ticks()
             if now_ms - last_track_ms >= track_update_ms:
@@ -1140,271 +1343,47 @@ def main():
 
 
 
-            # LUDO main face frame
-            ludo_main_frame = frame_surfaces[frame_idx]
-            ludo_main_scaled = pygame.transform.scale(ludo_main_frame, (scaled_width, scaled_height)).convert_alpha()
-            ludo_main_tint = pygame.Surface((scaled_width, scaled_height), pygame.SRCALPHA)
-            ludo_main_tint.fill(CYAN + (255,))
-            ludo_main_scaled.blit(ludo_main_tint, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-
-            screen.fill((0, 0, 0))
-
-            # Overlay LUDO main face (center position)
-            ludo_main_rect = ludo_main_scaled.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
-            screen.blit(ludo_main_scaled, ludo_main_rect)
-
-            # Draw Discord icon (below LUDO face)
-            discord_x = screen.get_width() // 2 - discord_icon.get_width() // 2
-            discord_y = ludo_main_rect.bottom - 50
-            screen.blit(discord_icon, (discord_x, discord_y))
-
-            # Time
-            now = datetime.datetime.now()
-            current_time = now.strftime("%I:%M:%S %p")
-            time_surface = clock_font.render(current_time, True, CYAN)
-            time_rect = time_surface.get_rect(center=(screen.get_width() // 2, 100))
-            screen.blit(time_surface, time_rect)
-
-            # Calendar
-            calendar_margin_right = 40
-            calendar_cell_width = 35
-            calendar_margin_left = 10
-            days_in_week = 7
-            calendar_width = days_in_week * calendar_cell_width + (days_in_week - 1) * calendar_margin_left
-            calendar_x = screen.get_width() - calendar_width - calendar_margin_right
-            render_calendar(screen, calendar_x, 60)
-
-
-
-            # --- Chat Section (Left Side) ---
-            chat_x = 40
-            chat_y = 150
-            chat_width = screen.get_width() // 3 - 60
-            chat_height = screen.get_height() - 320
-            
-            # Draw chat box background
-            chat_bg = pygame.Surface((chat_width, chat_height), pygame.SRCALPHA)
-            chat_bg.fill((0, 20, 40, 180))  # Dark blue transparent
-            pygame.draw.rect(chat_bg, CYAN, chat_bg.get_rect(), 3)  # Border
-            screen.blit(chat_bg, (chat_x, chat_y))
-            
-            # Chat title
-            chat_title = assistant_font.render("LUDO Chat", True, CYAN)
-            screen.blit(chat_title, (chat_x + 15, chat_y + 15))
-            
-            # Display conversation history with text wrapping
-            chat_line_y = chat_y + 55
-            line_height = 22
-            max_text_width = chat_width - 40  # Padding on both sides
-            current_y = chat_line_y
-            max_y = chat_y + chat_height - 10  # Bottom boundary
-            
-            # Calculate which messages to show (work backwards from most recent)
-            visible_messages = []
-            total_height = 0
-            
-            for msg in reversed(conversation_history):
-                if msg.startswith("User:"):
-                    prefix = "User: "
-                    content = msg[6:]
-                    color = (120, 220, 255)
-                elif msg.startswith("LUDO:"):
-                    prefix = "LUDO: "
-                    content = msg[6:]
-                    color = CYAN
-                else:
-                    continue
-                
-                # Wrap the message text
-                wrapped_lines = wrap_text(content, chat_font, max_text_width - 50)
-                msg_height = (len(wrapped_lines) + 1) * line_height + 5 
-                
-                if total_height + msg_height > (max_y - chat_line_y):
-                    break
-                
-                visible_messages.insert(0, {
-                    'prefix': prefix,
-                    'lines': wrapped_lines,
-                    'color': color
-                })
-                total_height += msg_height
-            
-            # Draw messages
-            current_y = chat_line_y
-            for msg_data in visible_messages:
-                # Draw prefix (User: or LUDO:)
-                prefix_surface = chat_font.render(msg_data['prefix'], True, msg_data['color'])
-                screen.blit(prefix_surface, (chat_x + 20, current_y))
-                current_y += line_height
-                
-                # Draw wrapped lines with indentation
-                for line in msg_data['lines']:
-                    if current_y >= max_y:
-                        break
-                    line_surface = chat_font.render(line, True, msg_data['color'])
-                    screen.blit(line_surface, (chat_x + 35, current_y))
-                    current_y += line_height
-                
-                current_y += 5  # Add spacing between messages
-            
-            # --- Chat Input Box ---
-            input_box_height = 40
-            input_box_y = chat_y + chat_height + 10
-            input_box_rect = pygame.Rect(chat_x, input_box_y, chat_width, input_box_height)
-            
-            # Draw input box with different color when active
-            if input_active:
-                pygame.draw.rect(screen, (0, 40, 60), input_box_rect)
-                pygame.draw.rect(screen, CYAN, input_box_rect, 3)
-            else:
-                pygame.draw.rect(screen, (0, 30, 50), input_box_rect)
-                pygame.draw.rect(screen, CYAN, input_box_rect, 2)
-            
-            # Display typed text or hint
-            if input_active or text_input:
-                # Show typed text with cursor
-                display_text = text_input if len(text_input) < 35 else "..." + text_input[-32:]
-                cursor = "|" if (pygame.time.get_ticks() // 500) % 2 == 0 else ""
-                text_surface = chat_font.render(display_text + cursor, True, CYAN)
-                screen.blit(text_surface, (chat_x + 15, input_box_y + 12))
-            else:
-                # Show hint text
-                hint_text = "Press TAB to type or SPACE to talk..."
-                hint_surface = chat_font.render(hint_text, True, (100, 100, 100))
-                screen.blit(hint_surface, (chat_x + 15, input_box_y + 12))
-            
-            # --- Voice Assistant Status Display ---
-            status_y = screen.get_height() - 120
-            if listening:
-                status_text = "Listening..."
-                status_surface = assistant_font.render(status_text, True, CYAN)
-                status_rect = status_surface.get_rect(center=(screen.get_width() // 2, status_y))
-                
-                # Add pulsing effect
-                pulse_size = int(5 * (1 + 0.3 * abs((pygame.time.get_ticks() % 1000) / 500 - 1)))
-                pygame.draw.circle(screen, CYAN, (status_rect.left - 20, status_rect.centery), pulse_size)
-                
-                screen.blit(status_surface, status_rect)
-            elif processing:
-                status_text = "Processing..."
-                status_surface = assistant_font.render(status_text, True, CYAN)
-                status_rect = status_surface.get_rect(center=(screen.get_width() // 2, status_y))
-                screen.blit(status_surface, status_rect)
-            
-            # --- Display keyboard shortcuts ---
-            if not listening and not processing and ENABLE_VOICE_ASSISTANT and gemini_enabled:
-                if input_active:
-                    shortcut_text = "Press ENTER to send | ESC to cancel | TAB to exit typing mode"
-                else:
-                    shortcut_text = "TAB: type | SPACE: talk | X: clear chat | C: clear memory | N: clear notepad"
-                shortcut_surface = description_font.render(shortcut_text, True, (120, 120, 120))
-                shortcut_rect = shortcut_surface.get_rect(center=(screen.get_width() // 2, screen.get_height() - 30))
-                screen.blit(shortcut_surface, shortcut_rect)
-            
-            # --- Display conversation memory counter ---
-            if len(conversation_history) > 0:
-                memory_count = len(conversation_history) // 2
-                memory_text = f"Memory: {memory_count} conversation(s)"
-                memory_surface = description_font.render(memory_text, True, (100, 255, 100))
-                memory_rect = memory_surface.get_rect(topright=(screen.get_width() - 20, 20))
-                screen.blit(memory_surface, memory_rect)
-            
-            # --- Display Notepad (bottom-right) ---
-            notepad_x = screen.get_width() - 420
-            notepad_y = screen.get_height() - 400
-            notepad_width = 400
-            notepad_height = 380
-            
-            # Draw notepad container
-            notepad_rect = pygame.Rect(notepad_x, notepad_y, notepad_width, notepad_height)
-            pygame.draw.rect(screen, (0, 20, 40), notepad_rect)
-            pygame.draw.rect(screen, CYAN, notepad_rect, 2)
-            
-            # Draw notepad title
-            notepad_title = description_font.render("Quick Notes", True, CYAN)
-            screen.blit(notepad_title, (notepad_x + 10, notepad_y + 10))
-            
-            # Draw notepad entries
-            entry_y = notepad_y + 35
-            line_height = 18
-            max_chars = 48  # Characters per line
-            
-            for entry in notepad_entries:
-                if entry_y > notepad_y + notepad_height - 30:
-                    break  # Stop if we run out of space
-                
-                # Draw timestamp
-                timestamp_text = entry['timestamp'].split()[1][:5]  # Get HH:MM
-                timestamp_surface = notepad_font.render(timestamp_text, True, (100, 150, 200))
-                screen.blit(timestamp_surface, (notepad_x + 10, entry_y))
-                
-                # Wrap text if needed
-                text = entry['text']
-                words = text.split()
-                lines = []
-                current_line = []
-                current_length = 0
-                
-                for word in words:
-                    if current_length + len(word) + 1 <= max_chars:
-                        current_line.append(word)
-                        current_length += len(word) + 1
-                    else:
-                        if current_line:
-                            lines.append(' '.join(current_line))
-                        current_line = [word]
-                        current_length = len(word)
-                
-                if current_line:
-                    lines.append(' '.join(current_line))
-                
-                # Draw wrapped text lines
-                for i, line in enumerate(lines[:3]):  # Max 3 lines per entry
-                    if entry_y + (i + 1) * line_height > notepad_y + notepad_height - 30:
-                        break
-                    line_surface = notepad_font.render(line, True, (200, 220, 255))
-                    screen.blit(line_surface, (notepad_x + 60, entry_y + i * line_height))
-                
-                entry_y += max(len(lines[:3]), 1) * line_height + 10
+            # Show a streaming answer as a provisional exchange until it is committed to history
+            exchange = streaming_exchange
+            pending_messages = ()
+            if exchange is not None and exchange[0] == len(conversation_history):
+                pending_messages = (f"User: {exchange[1]}", f"LUDO: {exchange[2]}")
             
-            # Draw notepad hint at bottom
-            if len(notepad_entries) == 0:
-                hint_text = "Say 'note this' or 'idea:' to add notes"
-                hint_surface = notepad_font.render(hint_text, True, (100, 100, 100))
-                hint_rect = hint_surface.get_rect(center=(notepad_x + notepad_width // 2, notepad_y + notepad_height // 2))
-                screen.blit(hint_surface, hint_rect)
-
-            if hand_landmarks_global:
-                # Draw landmarks circles
-                for landmark in hand_landmarks_global.landmark:
-                    x = int(landmark.x * screen.get_width())
-                    y = int(landmark.y * screen.get_height())
-                    pygame.draw.circle(screen, CYAN, (x, y), 6)
-
-                # Draw connections
-                connections = mp.solutions.hands.HAND_CONNECTIONS
-                for connection in connections:
-                    start_idx, end_idx = connection
-                    start = hand_landmarks_global.landmark[start_idx]
-                    end = hand_landmarks_global.landmark[end_idx]
-                    start_pos = (int(start.x * screen.get_width()), int(start.y * screen.get_height()))
-                    end_pos = (int(end.x * screen.get_width()), int(end.y * screen.get_height()))
-                    pygame.draw.line(screen, CYAN, start_pos, end_pos, 3)
-
-
-
-            pygame.display.flip()
-            frame_idx = (frame_idx + 1) % len(frame_surfaces)
+            renderer.render(
+                frame_idx, gif_scale, conversation_history, notepad_entries,
+                text_input=text_input,
+                input_active=input_active,
+                listening=listening,
+                processing=processing,
+                show_shortcuts=not listening and not processing and ENABLE_VOICE_ASSISTANT and gemini_enabled,
+                hand=hand_snapshot,
+                pending_messages=pending_messages,
+                face_bands=face_bands
+            )
+            profiler.end_frame()
+            frame_idx = (frame_idx + 1) % len(face_atlas)
             clock.tick(30)
 
-        except IOError as e:
-            print(f"Audio buffer overflowed: {e}")
         except Exception as e:
             print(f"Unexpected error: {e}")
 
-    if audio_enabled and stream:
-        stream.stop_stream()
-        stream.close()
+    request_pipeline.stop()
+    speech_queue.put(None)
+    prompt_cache.close()
+    if long_term_memory is not None:
+        long_term_memory.close()
+    if response_cache is not None and response_cache.stats['lookups']:
+        print(f"⚡ Response cache: {response_cache.report()}")
+    if search_cache.stats['lookups']:
+        print(f"📦 Search cache: {search_cache.report()}")
+    if http_client.timings:
+        print(f"🌐 HTTP: {http_client.report()}")
+    page_enricher.close()
+    http_client.close()
+    profiler.close()
+    if audio_enabled and mic_capture:
+        audio_meter.stop()
+        mic_capture.stop()
     if p:
         p.terminate()
     pygame.quit()
@@ -1414,9 +1393,17 @@ if __name__ == '__main__':
     list_available_voices()
     # Load previous conversation memory from file
     load_conversation_memory()
+    # Archive the loaded history on the first run with long-term memory
+    if long_term_memory is not None:
+        seeded = long_term_memory.seed(conversation_history.to_list())
+        print(f"🗄️ Long-term memory: {len(long_term_memory)} archived exchanges" + (f" ({seeded} imported)" if seeded else ""))
     # Load project context and tracking data
     load_context()
     load_projects()
+    # Load cached answers and search results
+    if response_cache is not None:
+        response_cache.load()
+    search_cache.load()
     # Load notepad entries
     load_notepad()
     main()
\ No newline at end of file
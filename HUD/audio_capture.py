@@ -0,0 +1,165 @@
+"""
+Non-blocking Microphone Capture for LUDO
+Captures audio in PyAudio callback mode into a ring buffer and publishes
+the latest level from a background meter thread, so the render loop
+never waits on the microphone
+"""
+
+import threading
+import time
+
+import pyaudio
+
+from audio_meter import SILENCE
+
+
+class AudioRingBuffer:
+    """
+    Single-producer ring buffer of raw audio bytes.
+
+    The producer (the PyAudio callback) only advances `write_pos`; readers
+    never take a lock and simply retry if the producer lapped the region
+    they were copying.
+    """
+
+    def __init__(self, capacity_bytes):
+        """
+        Initialize the ring buffer
+
+        Args:
+            capacity_bytes: Size of the buffer in bytes
+        """
+        self.capacity = capacity_bytes
+        self._buffer = bytearray(capacity_bytes)
+        self.write_pos = 0  # Total bytes ever written (monotonic)
+
+    def write(self, data):
+        """Append bytes (producer side only)"""
+        size = len(data)
+        if size >= self.capacity:
+            data = data[-self.capacity:]
+            size = self.capacity
+        start = self.write_pos % self.capacity
+        first = min(size, self.capacity - start)
+        self._buffer[start:start + first] = data[:first]
+        if first < size:
+            self._buffer[:size - first] = data[first:]
+        self.write_pos += size
+
+    def latest(self, nbytes):
+        """
+        Copy the most recent bytes.
+
+        Args:
+            nbytes: Number of bytes wanted
+
+        Returns:
+            bytes: Up to nbytes of the newest audio (fewer right after start)
+        """
+        nbytes = min(nbytes, self.capacity)
+        for _ in range(3):
+            end = self.write_pos
+            size = min(nbytes, end)
+            start = (end - size) % self.capacity
+            if start + size <= self.capacity:
+                data = bytes(self._buffer[start:start + size])
+            else:
+                data = bytes(self._buffer[start:]) + bytes(self._buffer[:start + size - self.capacity])
+            # Accept the copy unless the producer overwrote part of it meanwhile
+            if self.write_pos - end <= self.capacity - size:
+                return data
+        return data
+
+
+class MicrophoneCapture:
+    """PyAudio input stream running in callback mode"""
+
+    def __init__(self, pyaudio_instance, rate=44100, channels=1, frames_per_buffer=512, buffer_seconds=1.0):
+        """
+        Initialize the capture
+
+        Args:
+            pyaudio_instance: An initialized pyaudio.PyAudio()
+            rate: Sample rate in Hz
+            channels: Number of input channels
+            frames_per_buffer: Frames delivered per callback
+            buffer_seconds: Ring buffer length in seconds
+        """
+        self.rate = rate
+        self.channels = channels
+        self.sample_width = 2  # paInt16
+        self.ring = AudioRingBuffer(int(rate * channels * self.sample_width * buffer_seconds))
+        self.stream = pyaudio_instance.open(
+            format=pyaudio.paInt16,
+            channels=channels,
+            rate=rate,
+            input=True,
+            frames_per_buffer=frames_per_buffer,
+            stream_callback=self._callback,
+            start=False
+        )
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        self.ring.write(in_data)
+        return (None, pyaudio.paContinue)
+
+    def start(self):
+        """Start delivering audio into the ring buffer"""
+        self.stream.start_stream()
+
+    def stop(self):
+        """Stop and close the stream"""
+        try:
+            self.stream.stop_stream()
+            self.stream.close()
+        except Exception as e:
+            print(f"Failed to close microphone stream: {e}")
+
+
+class LevelMeter:
+    """Background thread that publishes the latest audio levels"""
+
+    def __init__(self, ring, meter, window_bytes=4096, interval=1 / 60):
+        """
+        Initialize the meter
+
+        Args:
+            ring: AudioRingBuffer to read from
+            meter: Callable turning raw bytes into AudioLevels
+            window_bytes: Number of newest bytes measured per update
+            interval: Seconds between updates
+        """
+        self.ring = ring
+        self.meter = meter
+        self.window_bytes = window_bytes
+        self.interval = interval
+        self.levels = SILENCE  # Latest AudioLevels (rms, peak, bands)
+        self.level = 0.0  # Latest RMS, read by the render loop
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """Start the meter thread"""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the meter thread"""
+        self._running = False
+
+    def _run(self):
+        last_pos = -1
+        while self._running:
+            # Only re-measure when new audio arrived
+            if self.ring.write_pos != last_pos:
+                last_pos = self.ring.write_pos
+                data = self.ring.latest(self.window_bytes)
+                if data:
+                    try:
+                        levels = self.meter(data)
+                        self.levels = levels
+                        self.level = levels.rms
+                    except Exception as e:
+                        print(f"Audio meter error: {e}")
+            time.sleep(self.interval)
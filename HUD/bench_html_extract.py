@@ -0,0 +1,106 @@
+"""
+HTML Extraction Benchmark for LUDO
+Times every installed html_extract backend on the saved fixtures in
+fixtures/ (a DuckDuckGo results page and a long article) and checks that
+each backend extracts the same results and text as the reference.
+"stream-full" is the streaming parser without its early exit.
+
+Usage:
+    python bench_html_extract.py --rounds 50
+    python bench_html_extract.py --fixture saved_page.html --json results.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from html_extract import BACKENDS, StreamingResultsExtractor, StreamingTextExtractor, available_backends, collapse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SEARCH_FIXTURE = os.path.join(FIXTURE_DIR, "ddg_results.html")
+PAGE_FIXTURES = [os.path.join(FIXTURE_DIR, "article.html")]
+
+
+def _stream_full_results(html, limit):
+    extractor = StreamingResultsExtractor(limit=10 ** 9)
+    extractor.feed(html)
+    return extractor.results[:limit]
+
+
+def _stream_full_text(html, max_chars):
+    extractor = StreamingTextExtractor(max_chars=10 ** 9)
+    extractor.feed(html)
+    return extractor.text()[:max_chars]
+
+
+def timed(function, html, limit, rounds):
+    """Mean milliseconds per call and the last result"""
+    result = function(html, limit)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        function(html, limit)
+    return (time.perf_counter() - start) * 1000 / rounds, result
+
+
+def without_spaces(value):
+    """Whitespace-free form, used only to label spacing-only differences"""
+    if isinstance(value, list):
+        return [{key: "".join(str(field).split()) for key, field in item.items()} for item in value]
+    return "".join(value.split())
+
+
+def comparable(value):
+    """Form used to compare backends: runs of whitespace collapsed, but spacing differences still count"""
+    if isinstance(value, list):
+        return [{key: collapse(str(field)) for key, field in item.items()} for item in value]
+    return collapse(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTML extraction backend benchmark")
+    parser.add_argument("--rounds", type=int, default=30, help="Timed calls per backend and fixture")
+    parser.add_argument("--results", type=int, default=3, help="Search results to extract")
+    parser.add_argument("--chars", type=int, default=2000, help="Page characters to extract")
+    parser.add_argument("--fixture", action="append", help="Extra saved page to benchmark (repeatable)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    backends = {name: BACKENDS[name][:2] for name in available_backends()}
+    backends["stream-full"] = (_stream_full_results, _stream_full_text)
+    reference = 'bs4' if 'bs4' in backends else 'stream-full'
+    print(f"Backends: {', '.join(backends)} (reference: {reference})")
+    if reference == 'bs4':
+        print("Note: the bs4 reference uses get_text(strip=True), which joins text inside inline tags without "
+              "spaces (\"InstallPython\" vs \"Install Python\"), so other backends can differ from it in spacing only")
+
+    jobs = [("search", SEARCH_FIXTURE, 0, args.results)]
+    jobs += [("page", path, 1, args.chars) for path in PAGE_FIXTURES + (args.fixture or [])]
+    report = {}
+    for kind, path, which, limit in jobs:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        name = f"{os.path.basename(path)} ({kind}, {len(html) // 1024} KB)"
+        print(f"\n{name}")
+        timings = {backend: timed(functions[which], html, limit, args.rounds) for backend, functions in backends.items()}
+        expected = comparable(timings[reference][1])
+        expected_text = without_spaces(timings[reference][1])
+        report[name] = {}
+        for backend, (ms, result) in sorted(timings.items(), key=lambda item: item[1][0]):
+            matches = comparable(result) == expected
+            spacing_only = not matches and without_spaces(result) == expected_text
+            speedup = timings[reference][0] / ms if ms else float("inf")
+            report[name][backend] = {"ms": round(ms, 3), "speedup": round(speedup, 1), "matches_reference": matches,
+                                     "spacing_only_difference": spacing_only}
+            verdict = "same output" if matches else ("DIFFERENT spacing" if spacing_only else "DIFFERENT output")
+            print(f"  {backend:<12}{ms:9.2f} ms  {speedup:6.1f}x  {verdict}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+HTTP Client Benchmark for LUDO
+Serves a search-results-sized page from a local keep-alive HTTP server
+and compares one-off requests.get calls (a new connection per request,
+as search_web() used to do) with the pooled HTTPClient. The server can
+delay every new connection to stand in for DNS + TCP + TLS setup to a
+remote host.
+
+Usage:
+    python bench_http_client.py --requests 50 --handshake-ms 60
+    python bench_http_client.py --url https://html.duckduckgo.com/html/?q=python   # real host
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from http_client import DEFAULT_USER_AGENT, HTTPClient, percentile
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    disable_nagle_algorithm = True
+    wbufsize = -1  # Send headers and body together
+    body = b""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local HTTP/1.1 server that charges a fixed delay per new connection"""
+
+    daemon_threads = True
+
+    def __init__(self, handshake_ms=0, page_kb=30):
+        StandInHandler.body = (b"<html><body>" + b"<div class=\"result\">result text</div>" * (page_kb * 28)
+                               + b"</body></html>")
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.handshake_s = handshake_ms / 1000
+        self.connections = 0
+
+    def process_request_thread(self, request, client_address):
+        self.connections += 1
+        time.sleep(self.handshake_s)
+        super().process_request_thread(request, client_address)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/html/?q=test"
+
+
+def run_unpooled(url, count, timeout):
+    """requests.get per call: a new connection every time"""
+    totals = []
+    for _ in range(count):
+        started = time.perf_counter()
+        requests.get(url, headers={'User-Agent': DEFAULT_USER_AGENT}, timeout=timeout).content
+        totals.append((time.perf_counter() - started) * 1000)
+    return totals
+
+
+def run_pooled(client, url, count):
+    totals = []
+    for _ in range(count):
+        started = time.perf_counter()
+        client.get(url)
+        totals.append((time.perf_counter() - started) * 1000)
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pooled vs one-off HTTP request benchmark")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per client")
+    parser.add_argument("--handshake-ms", type=float, default=50, help="Simulated setup delay per new connection")
+    parser.add_argument("--page-kb", type=int, default=30, help="Size of the served page")
+    parser.add_argument("--url", help="Benchmark a real URL instead of the local server")
+    parser.add_argument("--http2", action="store_true", help="Pooled client uses httpx with HTTP/2")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if url is None:
+        server = StandInServer(args.handshake_ms, args.page_kb)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = server.url
+
+    client = HTTPClient(http2=args.http2)
+    results = {}
+    for name, run in (("requests.get", lambda: run_unpooled(url, args.requests, client.timeout)),
+                      (f"HTTPClient ({client.backend})", lambda: run_pooled(client, url, args.requests))):
+        before = server.connections if server else None
+        totals = run()
+        results[name] = {"p50_ms": round(percentile(totals, 0.5), 2), "p95_ms": round(percentile(totals, 0.95), 2),
+                         "connections": server.connections - before if server else None}
+        print(f"{name:<28} p50 {results[name]['p50_ms']:8.2f} ms   p95 {results[name]['p95_ms']:8.2f} ms"
+              + (f"   {results[name]['connections']} connections" if server else ""))
+    print(client.report())
+    client.close()
+    if server:
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Headless HUD Render Benchmark for LUDO
+Runs the HUD rendering path under SDL's dummy video driver with synthetic
+conversation history, notepad entries and hand landmarks, and reports
+per-frame p50/p95/p99 times and Python allocations per resolution.
+
+Usage:
+    python bench_hud_render.py
+    python bench_hud_render.py --frames 600 --messages 200 --notes 50 --resolutions 800x600,3840x2160
+    python bench_hud_render.py --max-p95 20   # exit 1 if any p95 exceeds 20 ms (for CI)
+
+Allocations are measured with tracemalloc in a separate pass, so they cover
+Python objects only; SDL pixel buffers are not included.
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import datetime
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+import pygame
+from PIL import Image, ImageSequence
+
+from face_atlas import FaceAtlas
+from frame_profiler import FrameProfiler
+from hand_tracking import HandSnapshot, landmarks_to_points
+from hud_renderer import HUDRenderer, HUDFonts, CYAN
+
+HUD_DIR = Path(__file__).parent
+RESOLUTIONS = {"800x600": (800, 600), "1080p": (1920, 1080), "4k": (3840, 2160)}
+
+# Same topology as mediapipe.solutions.hands.HAND_CONNECTIONS
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+WORDS = ("ludo", "python", "weather", "project", "deadline", "render", "frame", "token", "memory",
+         "search", "assistant", "calendar", "gesture", "the", "a", "and", "of", "to", "is", "with")
+
+
+def synthetic_sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def synthetic_history(rng, messages):
+    history = []
+    for i in range(messages):
+        speaker = "User" if i % 2 == 0 else "LUDO"
+        history.append(f"{speaker}: {synthetic_sentence(rng, rng.randint(4, 60))}")
+    return history
+
+
+def synthetic_notes(rng, notes):
+    base = datetime.datetime(2026, 1, 1, 9, 0)
+    return [{"timestamp": (base + datetime.timedelta(minutes=7 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+             "text": synthetic_sentence(rng, rng.randint(3, 30))} for i in range(notes)]
+
+
+def synthetic_hands(hands, frames, size, hold=1):
+    """
+    Precompute one HandSnapshot per frame, drifting over time, the way the
+    tracking thread publishes them. With hold > 1 each snapshot is repeated
+    for that many frames (tracking slower than rendering).
+    """
+    if hands <= 0:
+        return [None] * frames
+    snapshots = []
+    seq = 0
+    for f in range(frames):
+        if f % hold == 0:
+            cx = 0.5 + 0.05 * math.sin(f / 15)
+            cy = 0.5 + 0.05 * math.cos(f / 20)
+            landmarks = [SimpleNamespace(x=cx + 0.08 * math.cos(i / 21 * 2 * math.pi),
+                                         y=cy + 0.1 * math.sin(i / 21 * 2 * math.pi)) for i in range(21)]
+            seq += 1
+            snapshot = HandSnapshot(seq, landmarks_to_points(landmarks, *size))
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def load_face_frames():
+    gif = Image.open(HUD_DIR / "jarvis.gif")
+    frames = [frame.copy().convert("RGBA") for frame in ImageSequence.Iterator(gif)]
+    return [pygame.image.frombuffer(frame.tobytes(), frame.size, "RGBA") for frame in frames]
+
+
+def load_fonts():
+    font_path = str(HUD_DIR / "Orbitron-VariableFont_wght.ttf")
+    return HUDFonts(
+        clock=pygame.font.Font(font_path, 80),
+        calendar=pygame.font.Font(font_path, 20),
+        description=pygame.font.Font(None, 18),
+        chat=pygame.font.SysFont("Segoe UI Emoji", 20),
+        assistant=pygame.font.Font(font_path, 18),
+        notepad=pygame.font.Font(None, 16),
+    )
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(math.ceil(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def run_frames(renderer, frame_count, frame_total, history, notes, hand_sets, churn_every, track_alloc, rng):
+    """Render frames and return (per-frame seconds, per-frame allocated bytes)"""
+    times = []
+    allocs = []
+    start_time = datetime.datetime(2026, 1, 1, 12, 0, 0)
+    history = list(history)
+
+    for f in range(frame_count):
+        if churn_every and f and f % churn_every == 0:
+            history.append(f"{'User' if len(history) % 2 == 0 else 'LUDO'}: {synthetic_sentence(rng, 20)}")
+        gif_scale = 1.0 + 0.5 * (1 + math.sin(f / 5)) / 2
+        now = start_time + datetime.timedelta(seconds=f / 30)
+
+        if track_alloc:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        renderer.profiler.begin_frame()
+        renderer.render(f % frame_total, gif_scale, history, notes,
+                        text_input="benchmark input" if f % 60 < 30 else "",
+                        input_active=f % 60 < 30,
+                        hand=hand_sets[f % len(hand_sets)],
+                        now=now)
+        times.append(time.perf_counter() - t0)
+        renderer.profiler.end_frame()
+        if track_alloc:
+            allocs.append(tracemalloc.get_traced_memory()[1] - baseline)
+        pygame.event.pump()
+
+    return times, allocs
+
+
+def bench_resolution(name, size, args, face_frames):
+    rng = random.Random(args.seed)
+    screen = pygame.display.set_mode(size)
+    fonts = load_fonts()
+    atlas = FaceAtlas(face_frames, CYAN, base_scale=0.6, scale_steps=8, max_bytes=args.atlas_mb * 1024 * 1024)
+    discord_icon = pygame.transform.scale(pygame.image.load(str(HUD_DIR / "discord.png")).convert_alpha(), (0, 0))
+    profiler = FrameProfiler(window=args.frames)
+    renderer = HUDRenderer(screen, fonts, atlas, discord_icon, HAND_CONNECTIONS, profiler=profiler)
+
+    history = synthetic_history(rng, args.messages)
+    notes = synthetic_notes(rng, args.notes)
+    hand_sets = synthetic_hands(args.hands, min(args.frames, 300), size, args.hand_hold)
+
+    # Warm-up fills the layout cache, face atlas and static layer
+    run_frames(renderer, args.warmup, len(face_frames), history, notes, hand_sets, 0, False, rng)
+    times, _ = run_frames(renderer, args.frames, len(face_frames), history, notes, hand_sets, args.churn, False, rng)
+
+    sections = {}
+    if args.sections:
+        profiler.toggle()
+        run_frames(renderer, args.frames, len(face_frames), history, notes, hand_sets, args.churn, False, rng)
+        sections = {name: round(s['avg_ms'], 4) for name, s in profiler.summary().items()}
+        profiler.toggle()
+
+    tracemalloc.start()
+    _, allocs = run_frames(renderer, min(args.frames, 200), len(face_frames), history, notes, hand_sets, args.churn, True, rng)
+    tracemalloc.stop()
+
+    ms = sorted(t * 1000 for t in times)
+    return {
+        "resolution": name,
+        "size": list(size),
+        "frames": len(ms),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(ms[-1], 3),
+        "mean_alloc_kib": round(sum(allocs) / max(1, len(allocs)) / 1024, 2),
+        "max_alloc_kib": round(max(allocs, default=0) / 1024, 2),
+        "sections_avg_ms": sections,
+    }
+
+
+def parse_resolutions(text):
+    sizes = []
+    for item in text.split(","):
+        item = item.strip()
+        if item in RESOLUTIONS:
+            sizes.append((item, RESOLUTIONS[item]))
+        else:
+            width, height = item.lower().split("x")
+            sizes.append((item, (int(width), int(height))))
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless LUDO HUD render benchmark")
+    parser.add_argument("--frames", type=int, default=300, help="Measured frames per resolution")
+    parser.add_argument("--warmup", type=int, default=30, help="Unmeasured warm-up frames")
+    parser.add_argument("--messages", type=int, default=20, help="Synthetic conversation_history size")
+    parser.add_argument("--notes", type=int, default=20, help="Synthetic notepad_entries size")
+    parser.add_argument("--hands", type=int, default=1, choices=(0, 1), help="Synthetic hand (0 disables landmarks)")
+    parser.add_argument("--hand-hold", type=int, default=1, help="Frames each hand snapshot is held (tracking slower than rendering)")
+    parser.add_argument("--churn", type=int, default=0, help="Append a chat message every N frames (0 = steady state)")
+    parser.add_argument("--resolutions", default="800x600,1080p,4k", help="Comma list of names (800x600, 1080p, 4k) or WxH")
+    parser.add_argument("--atlas-mb", type=int, default=256, help="Face atlas memory ceiling")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sections", action="store_true", help="Also report per-section averages from FrameProfiler")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--max-p95", type=float, help="Exit with status 1 if any p95 (ms) exceeds this")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    face_frames = load_face_frames()
+
+    results = []
+    print(f"{'resolution':>12} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'alloc KiB/frame':>16}")
+    for name, size in parse_resolutions(args.resolutions):
+        result = bench_resolution(name, size, args, face_frames)
+        results.append(result)
+        print(f"{name:>12} {result['p50_ms']:8.2f} {result['p95_ms']:8.2f} {result['p99_ms']:8.2f} "
+              f"{result['max_ms']:8.2f} {result['mean_alloc_kib']:16.1f}")
+        for section, avg_ms in sorted(result["sections_avg_ms"].items(), key=lambda item: -item[1]):
+            print(f"{'':>12}   {section:<10}{avg_ms:8.3f} ms")
+
+    pygame.quit()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+    if args.max_p95 is not None and any(r["p95_ms"] > args.max_p95 for r in results):
+        print(f"❌ p95 frame time above {args.max_p95} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Token Counter Benchmark for LUDO
+Compares the 4 characters per token heuristic with a real tokenizer backend
+on English prose, code, URLs and non-English text, and measures counting
+throughput with and without per-message memoization.
+
+Usage:
+    python bench_token_counter.py --tokenizer sentencepiece:path/to/tokenizer.model
+    python bench_token_counter.py --tokenizer tiktoken:cl100k_base --rounds 2000
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from token_counter import (HeuristicTokenizer, TokenCountCache, estimate_conversation_tokens, heuristic_tokens,
+                           load_tokenizer, set_tokenizer)
+
+SAMPLES = {
+    "english": [
+        "Hello, this is a test message for token counting.",
+        "Can you remind me what we decided about the project deadline last week?",
+        "The quick brown fox jumps over the lazy dog while the assistant keeps track of the conversation.",
+        "Summarize the key points of our discussion about hand tracking and frame rates.",
+    ],
+    "code": [
+        "def estimate_tokens(text):\n    return int(len(text) / 4) + 1 if text else 0",
+        "for i, (a, b) in enumerate(zip(xs, ys)):\n    if a != b:\n        print(f'{i}: {a!r} != {b!r}')",
+        "const res = await fetch(`/api/v1/items?id=${id}`, {method: 'POST', body: JSON.stringify(obj)});",
+        "SELECT u.id, COUNT(*) FROM users u JOIN orders o ON o.user_id = u.id GROUP BY u.id HAVING COUNT(*) > 5;",
+    ],
+    "urls": [
+        "https://html.duckduckgo.com/html/?q=latest%20python%20release%20notes",
+        "https://github.com/rhasspy/piper/releases/download/v1.2.0/voice-en_US-lessac-medium.tar.gz",
+        "https://www.google.com/search?q=weather+in+chennai&oq=weather&sourceid=chrome&ie=UTF-8",
+        "E:\\brainstroming\\AI_Miles\\HUD\\.ludo_memory.json",
+    ],
+    "non_english": [
+        "¿Puedes decirme qué tiempo hará mañana en Madrid?",
+        "नमस्ते, आज मौसम कैसा है और कल की बैठक कब है?",
+        "今日の天気はどうですか？明日の会議は何時からですか？",
+        "வணக்கம், இன்றைய செய்திகள் என்ன? 🚀🎉",
+    ],
+}
+
+
+def accuracy(reference):
+    """Mean absolute percentage error of the heuristic per category"""
+    results = {}
+    for category, texts in SAMPLES.items():
+        errors = []
+        for text in texts:
+            actual = reference.count(text)
+            errors.append(abs(heuristic_tokens(text) - actual) / max(1, actual))
+        results[category] = round(100 * sum(errors) / len(errors), 1)
+    return results
+
+
+def throughput(backend, texts, rounds):
+    """Messages counted per second, uncached and memoized"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            backend.count(text)
+    uncached = rounds * len(texts) / (time.perf_counter() - start)
+
+    cache = TokenCountCache(backend)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            cache.count(text)
+    memoized = rounds * len(texts) / (time.perf_counter() - start)
+    return round(uncached), round(memoized)
+
+
+def history_recount(backend, history, rounds):
+    """Seconds per estimate_conversation_tokens() call on an unchanged history"""
+    set_tokenizer(backend)
+    estimate_conversation_tokens(history)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        estimate_conversation_tokens(history)
+    return (time.perf_counter() - start) / rounds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Token counter accuracy and throughput benchmark")
+    parser.add_argument("--tokenizer", default="auto", help="Reference backend (see token_counter.load_tokenizer)")
+    parser.add_argument("--rounds", type=int, default=500, help="Passes over the sample corpus")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    reference = load_tokenizer(args.tokenizer)
+    texts = [text for category in SAMPLES.values() for text in category]
+    history = [f"{'User' if i % 2 == 0 else 'LUDO'}: {texts[i % len(texts)]}" for i in range(20)]
+    results = {"reference": reference.name}
+
+    if isinstance(reference, HeuristicTokenizer):
+        print("⚠️ No tokenizer model available; only throughput is measured (pass --tokenizer)")
+    else:
+        results["heuristic_error_pct"] = accuracy(reference)
+        print(f"Heuristic error vs {reference.name}:")
+        for category, error in results["heuristic_error_pct"].items():
+            print(f"  {category:<12}{error:6.1f}%")
+
+    print(f"{'backend':<32}{'msgs/s':>12}{'memoized':>12}{'history µs':>12}")
+    results["throughput"] = {}
+    for backend in {reference.name: reference, "heuristic": HeuristicTokenizer()}.values():
+        uncached, memoized = throughput(backend, texts, args.rounds)
+        recount_us = history_recount(backend, history, args.rounds) * 1e6
+        results["throughput"][backend.name] = {"uncached_per_s": uncached, "memoized_per_s": memoized,
+                                               "history_recount_us": round(recount_us, 2)}
+        print(f"{backend.name:<32}{uncached:12,}{memoized:12,}{recount_us:12.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
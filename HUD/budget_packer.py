@@ -0,0 +1,139 @@
+"""
+Token Budget Packer for LUDO
+Fills one token budget from prioritized prompt segments (system prompt,
+web results, recent turns, summary, retrieved older turns) using prefix
+sums of per-item token counts, and reports how the budget was spent.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+
+from token_counter import count_tokens_uncached
+
+
+class Segment:
+    """One competing part of the prompt"""
+
+    __slots__ = ('name', 'items', 'priority', 'keep', 'min_items', 'count_tokens')
+
+    def __init__(self, name, items, priority, keep="first", min_items=0, count_tokens=None):
+        """
+        Args:
+            name: Key in the pack result
+            items: Strings in their natural order (oldest first for turns, best first for results)
+            priority: Lower numbers are filled first
+            keep: "first" keeps a prefix of items, "newest" keeps a suffix
+            min_items: Items reserved before any optional content is added
+                       (len(items) makes the segment mandatory)
+            count_tokens: Token counting function for this segment's items
+                          (None uses the packer's); pass the memoized
+                          estimate_tokens for items that recur every turn
+        """
+        self.name = name
+        self.items = list(items)
+        self.priority = priority
+        self.keep = keep
+        self.min_items = min(min_items, len(self.items))
+        self.count_tokens = count_tokens
+
+
+class PackResult:
+    """Packed segments and the budget breakdown"""
+
+    def __init__(self, budget, packed, allocation):
+        self.budget = budget
+        self.packed = packed  # name -> kept items in natural order
+        self.allocation = allocation  # name -> {'tokens', 'items', 'dropped'}
+        self.used = sum(entry['tokens'] for entry in allocation.values())
+
+    @property
+    def free(self):
+        return self.budget - self.used
+
+    def __getitem__(self, name):
+        return self.packed.get(name, [])
+
+    def breakdown(self):
+        """One-line summary such as 'system 31, web 212 (3/3), turns 640 (12/14), free 1117'"""
+        parts = []
+        for name, entry in self.allocation.items():
+            total = entry['items'] + entry['dropped']
+            count = f" ({entry['items']}/{total})" if total > 1 else ("" if entry['items'] else " (dropped)")
+            parts.append(f"{name} {entry['tokens']}{count}")
+        parts.append(f"free {self.free}")
+        return ", ".join(parts)
+
+
+def pack_segments(segments, budget, count_tokens=count_tokens_uncached):
+    """
+    Pack segments into a token budget.
+
+    Mandatory items (min_items) are reserved first in priority order; the
+    remaining budget is then filled segment by segment in priority order,
+    each taking the longest prefix (or newest suffix) of its items that
+    still fits. Every segment's cut point is a binary search over its
+    prefix sums, so packing is linear in the number of items.
+
+    Args:
+        segments: Iterable of Segment
+        budget: Total token budget
+        count_tokens: Default token counting function; unmemoized, since most
+                      segments (web results, extracts, summary) change every turn
+
+    Returns:
+        PackResult
+    """
+    ordered = sorted(segments, key=lambda segment: segment.priority)
+    sums = {}
+    taken = {}
+    remaining = budget
+
+    for segment in ordered:
+        items = segment.items if segment.keep == "first" else segment.items[::-1]
+        count = segment.count_tokens or count_tokens
+        sums[segment.name] = [0] + list(accumulate(count(item) for item in items))
+        taken[segment.name] = 0
+
+    # Phase 1: reserve mandatory items (they are kept even if they overrun the budget)
+    for segment in ordered:
+        if segment.min_items:
+            taken[segment.name] = segment.min_items
+            remaining -= sums[segment.name][segment.min_items]
+
+    # Phase 2: fill the rest by priority
+    for segment in ordered:
+        prefix = sums[segment.name]
+        already = taken[segment.name]
+        if remaining <= 0 or already == len(segment.items):
+            continue
+        # Largest n with prefix[n] - prefix[already] <= remaining
+        n = bisect_right(prefix, prefix[already] + remaining) - 1
+        if n > already:
+            remaining -= prefix[n] - prefix[already]
+            taken[segment.name] = n
+
+    packed = {}
+    allocation = {}
+    for segment in ordered:
+        n = taken[segment.name]
+        if segment.keep == "first":
+            kept = segment.items[:n]
+        else:
+            kept = segment.items[len(segment.items) - n:] if n else []
+        packed[segment.name] = kept
+        allocation[segment.name] = {'tokens': sums[segment.name][n], 'items': n, 'dropped': len(segment.items) - n}
+
+    return PackResult(budget, packed, allocation)
+
+
+if __name__ == "__main__":
+    history = [f"{'User' if i % 2 == 0 else 'LUDO'}: message {i} " + "word " * (i % 7 * 10) for i in range(40)]
+    result = pack_segments([
+        Segment("system", ["You are LUDO, a helpful AI assistant."], 0, min_items=1),
+        Segment("query", ["User: what did we decide about the deadline?"], 0, min_items=1),
+        Segment("web", ["1. Result one " + "x" * 400, "2. Result two " + "y" * 400], 1),
+        Segment("turns", history, 2, keep="newest", min_items=2),
+        Segment("summary", ["Q: earlier project talk | A: deadline moved."], 3),
+    ], budget=1000)
+    print(result.breakdown())
+    print(f"kept turns {result['turns'][0][:12]}... -> {result['turns'][-1][:12]}...")
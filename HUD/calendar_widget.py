@@ -0,0 +1,147 @@
+"""
+Calendar Widget for LUDO HUD
+Renders the month calendar to an offscreen surface that is rebuilt only
+when the date or the font changes
+"""
+
+import calendar as cal_module
+import datetime
+
+import pygame
+
+
+def get_calendar_data(today=None):
+    """
+    Get the current month as text lines (header, weekdays, weeks).
+
+    Args:
+        today (datetime.date): Date whose month is rendered (default: today)
+
+    Returns:
+        list: Lines of calendar.month() output, or [] on error
+    """
+    try:
+        today = today or datetime.date.today()
+        month_cal = cal_module.month(today.year, today.month)
+        return month_cal.strip().split('\n')
+    except Exception as e:
+        print(f"Calendar fetch error: {e}")
+        return []
+
+
+class CalendarWidget:
+    """Month calendar with today's date highlighted, cached per day"""
+
+    def __init__(self, font, color=(0, 255, 255), today_color=(0, 0, 0), highlight_alpha=80,
+                 background=(0, 0, 0), cell_width=35, margin_left=10):
+        """
+        Initialize the widget
+
+        Args:
+            font: pygame font for every calendar cell
+            color: Text and highlight color
+            today_color: Text color of today's date
+            highlight_alpha: Alpha of the ellipse behind today's date
+            background: Fill color of the offscreen surface
+            cell_width: Width of one day column in pixels
+            margin_left: Gap between day columns in pixels
+        """
+        self.font = font
+        self.color = color
+        self.today_color = today_color
+        self.highlight_alpha = highlight_alpha
+        self.background = background
+        self.cell_width = cell_width
+        self.margin_left = margin_left
+        self.surface = None
+        self._key = None
+
+    @property
+    def width(self):
+        """Pixel width of the 7-column calendar"""
+        return 7 * self.cell_width + 6 * self.margin_left
+
+    def set_font(self, font):
+        """Switch fonts; the widget is rebuilt on the next draw"""
+        self.font = font
+
+    def _build(self, today):
+        lines = get_calendar_data(today)
+        if not lines:
+            return None
+
+        font = self.font
+        cell_width = self.cell_width
+        margin_left = self.margin_left
+        cell_height = font.get_height() + 6
+        weekdays = lines[1].split()
+        header_surface = font.render(lines[0], True, self.color)
+
+        weeks = lines[2:]
+        height = header_surface.get_height() + 10 + cell_height + 10 + len(weeks) * (cell_height + 6)
+        surface = pygame.Surface((max(self.width, header_surface.get_width()), height))
+        surface.fill(self.background)
+
+        surface.blit(header_surface, (0, 0))
+        y_offset = header_surface.get_height() + 10
+
+        cur_x = 0
+        for idx, day in enumerate(weekdays):
+            day_surface = font.render(day, True, self.color)
+            if idx > 0:
+                cur_x += margin_left
+            surface.blit(day_surface, (cur_x, y_offset))
+            cur_x += cell_width
+
+        y_offset += cell_height + 10
+
+        for week_line in weeks:
+            cur_x = 0
+            for i in range(7):
+                start = i * 3
+                day_str = week_line[start:start+3].strip()
+                if day_str == '':
+                    day_str = ' '
+
+                if i > 0:
+                    cur_x += margin_left
+
+                if day_str.isdigit() and int(day_str) == today.day:
+                    highlight_surf = pygame.Surface((cell_width, cell_height), pygame.SRCALPHA)
+                    pygame.draw.ellipse(highlight_surf, tuple(self.color) + (self.highlight_alpha,), highlight_surf.get_rect())
+                    surface.blit(highlight_surf, (cur_x, y_offset))
+                    day_surface = font.render(day_str, True, self.today_color)
+                else:
+                    day_surface = font.render(day_str, True, self.color)
+
+                day_rect = day_surface.get_rect()
+                day_pos_x = cur_x + (cell_width - day_rect.width) // 2
+                day_pos_y = y_offset + (cell_height - day_rect.height) // 2
+                surface.blit(day_surface, (day_pos_x, day_pos_y))
+
+                cur_x += cell_width
+
+            y_offset += cell_height + 6
+
+        return surface
+
+    def draw(self, surface, x, y, today=None):
+        """
+        Blit the calendar, rebuilding it only if the date or font changed.
+
+        Args:
+            surface: Destination surface
+            x, y: Top-left position
+            today (datetime.date): Date to highlight (default: today)
+
+        Returns:
+            pygame.Rect or None: Area drawn
+        """
+        today = today or datetime.date.today()
+        key = (today, id(self.font), self.font.get_height())
+        if key != self._key:
+            self.surface = self._build(today)
+            self._key = key
+        if self.surface is None:
+            return None
+        return surface.blit(self.surface, (x, y))
@@ -0,0 +1,116 @@
+"""
+Low-latency Camera Capture for LUDO
+Opens the webcam with an explicit resolution, frame rate and FOURCC and
+keeps grabbing in the background so OpenCV's internal queue never holds
+stale frames; read() always decodes the newest one
+"""
+
+import threading
+import time
+
+import cv2
+
+
+class CameraCapture:
+    """Webcam reader that always serves the freshest frame"""
+
+    def __init__(self, index=0, width=640, height=480, fps=30, fourcc="MJPG", api=cv2.CAP_ANY):
+        """
+        Open the camera
+
+        Args:
+            index: Camera index
+            width, height: Requested capture resolution (0 keeps the driver default)
+            fps: Requested frame rate (0 keeps the driver default)
+            fourcc: Four-character pixel format, e.g. "MJPG" ("" keeps the driver default)
+            api: OpenCV capture backend (e.g. cv2.CAP_DSHOW on Windows)
+        """
+        self.capture = cv2.VideoCapture(index, api)
+        if fourcc:
+            self.capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if width and height:
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self.capture.set(cv2.CAP_PROP_FPS, fps)
+        # Ask the driver for the shortest queue it supports (not every backend honours it)
+        self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self.last_frame_time = None  # time.monotonic() when the served frame was grabbed
+        self.frames_grabbed = 0
+        self.frames_served = 0
+        self._condition = threading.Condition()
+        self._grab_seq = 0
+        self._retrieve_request = False
+        self._retrieved = None
+        self._running = True
+        self._thread = threading.Thread(target=self._grab_loop, daemon=True)
+        self._thread.start()
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def settings(self):
+        """Resolution, frame rate and FOURCC the driver actually granted"""
+        code = int(self.capture.get(cv2.CAP_PROP_FOURCC))
+        fourcc = "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)) if code else ""
+        return {
+            'width': int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': self.capture.get(cv2.CAP_PROP_FPS),
+            'fourcc': fourcc,
+        }
+
+    def _grab_loop(self):
+        # grab() and retrieve() both run here: OpenCV captures are not thread-safe
+        while self._running:
+            ok = self.capture.grab()
+            grabbed_at = time.monotonic()
+            with self._condition:
+                if ok:
+                    self._grab_seq += 1
+                    self.frames_grabbed += 1
+                    if self._retrieve_request:
+                        # Decode only frames somebody is waiting for
+                        success, image = self.capture.retrieve()
+                        self._retrieved = (success, image, self._grab_seq, grabbed_at)
+                        self._retrieve_request = False
+                self._condition.notify_all()
+            if not ok:
+                time.sleep(0.05)
+
+    def read(self, timeout=1.0):
+        """
+        Return the newest frame grabbed after the previous read.
+
+        Args:
+            timeout: Seconds to wait for a fresh frame
+
+        Returns:
+            tuple: (success, BGR image or None)
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._retrieved = None
+            self._retrieve_request = True
+            while self._retrieved is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    self._retrieve_request = False
+                    return False, None
+                self._condition.wait(remaining)
+            success, image, seq, grabbed_at = self._retrieved
+            self._retrieved = None
+
+        if success:
+            self.last_frame_time = grabbed_at
+            self.frames_served += 1
+        return success, image
+
+    def release(self):
+        """Stop grabbing and close the camera"""
+        self._running = False
+        with self._condition:
+            self._condition.notify_all()
+        self._thread.join(timeout=1.0)
+        self.capture.release()
@@ -0,0 +1,143 @@
+"""
+Dirty-Rectangle Compositor for LUDO HUD
+Keeps the rarely-changing parts of the HUD in a retained static layer and
+pushes only the regions that actually changed to the display
+"""
+
+import pygame
+
+
+class _Layer:
+    """A dynamic HUD element drawn on top of the static layer"""
+
+    __slots__ = ('name', 'rect', 'key', 'draw')
+
+    def __init__(self, name, rect, key, draw):
+        self.name = name
+        self.rect = rect
+        self.key = key
+        self.draw = draw
+
+
+class Compositor:
+    """Layered compositor with a retained static layer and dirty-rect updates"""
+
+    def __init__(self, screen):
+        """
+        Initialize the compositor
+
+        Args:
+            screen: The pygame display surface
+        """
+        self.screen = screen
+        self.static_surface = None
+        self.static_key = None
+        self.full_redraw = True
+        self._previous = {}   # name -> (rect, key) drawn last frame
+        self._layers = []
+        self.last_update_rects = []
+
+    def begin_frame(self, static_key):
+        """
+        Start a new frame.
+
+        Args:
+            static_key: Hashable description of everything drawn into the
+                        static layer (sizes, panel contents, mode flags).
+                        The static layer is rebuilt only when it changes.
+
+        Returns:
+            pygame.Surface or None: The static surface to redraw into when a
+            rebuild is needed, otherwise None
+        """
+        self._layers = []
+        size = self.screen.get_size()
+
+        if self.static_surface is None or self.static_surface.get_size() != size:
+            self.static_surface = pygame.Surface(size).convert()
+            self.static_key = None
+
+        if static_key != self.static_key:
+            self.static_key = static_key
+            self.full_redraw = True
+            self.static_surface.fill((0, 0, 0))
+            return self.static_surface
+        return None
+
+    def invalidate(self):
+        """Force the static layer to be rebuilt on the next frame"""
+        self.static_key = None
+
+    def layer(self, name, rect, draw, key=None):
+        """
+        Declare a dynamic element for this frame.
+
+        Args:
+            name: Stable identifier of the element across frames
+            rect: Screen-space bounding rect the element draws inside
+            draw: Callable drawing the element onto the screen
+            key: Hashable content key; when it and the rect match the previous
+                 frame the element is left untouched. None redraws every frame.
+        """
+        self._layers.append(_Layer(name, pygame.Rect(rect), key, draw))
+
+    def present(self):
+        """
+        Composite the dynamic layers and push the changed regions to the display.
+
+        Returns:
+            list: The rects that were updated (empty after a full flip)
+        """
+        screen = self.screen
+        layers = self._layers
+        current_names = {layer.name for layer in layers}
+
+        if self.full_redraw:
+            screen.blit(self.static_surface, (0, 0))
+            for layer in layers:
+                layer.draw()
+            pygame.display.flip()
+            self.full_redraw = False
+            self._remember(layers)
+            self.last_update_rects = []
+            return []
+
+        # Regions that must be restored from the static layer
+        damaged = [rect for name, (rect, _) in self._previous.items() if name not in current_names]
+        dirty = set()
+        for i, layer in enumerate(layers):
+            previous = self._previous.get(layer.name)
+            if layer.key is None or previous is None or previous != (layer.rect, layer.key):
+                dirty.add(i)
+                damaged.append(layer.rect)
+                if previous is not None:
+                    damaged.append(previous[0])
+
+        # Clean layers overlapping damaged regions have to be redrawn too
+        changed = True
+        while changed:
+            changed = False
+            for i, layer in enumerate(layers):
+                if i not in dirty and layer.rect.collidelist(damaged) != -1:
+                    dirty.add(i)
+                    damaged.append(layer.rect)
+                    changed = True
+
+        screen_rect = screen.get_rect()
+        damaged = [rect.clip(screen_rect) for rect in damaged]
+        damaged = [rect for rect in damaged if rect.width and rect.height]
+
+        for rect in damaged:
+            screen.blit(self.static_surface, rect, rect)
+        for i, layer in enumerate(layers):
+            if i in dirty:
+                layer.draw()
+
+        if damaged:
+            pygame.display.update(damaged)
+        self._remember(layers)
+        self.last_update_rects = damaged
+        return damaged
+
+    def _remember(self, layers):
+        self._previous = {layer.name: (layer.rect, layer.key) for layer in layers}
@@ -0,0 +1,179 @@
+"""
+Conversation Store for LUDO
+Holds the "User: ..." / "LUDO: ..." history with each message's token
+count and running totals, so appending, trimming, tail views and
+statistics cost O(1) or O(k) instead of rescanning the whole history.
+"""
+
+import threading
+from bisect import bisect_left
+
+from token_counter import estimate_tokens
+
+
+class ConversationStore:
+    """
+    Append-mostly message history with cached token counts.
+
+    Messages live in one list with a moving head, and a parallel list of
+    cumulative token counts gives the tokens of any range in O(1).
+    Dropping old messages only advances the head; the lists are compacted
+    once the dead prefix outgrows the live part.
+    """
+
+    def __init__(self, messages=(), count_tokens=estimate_tokens):
+        """
+        Args:
+            messages: Initial messages, oldest first
+            count_tokens: Token counting function (memoized by token_counter)
+        """
+        self.count_tokens = count_tokens
+        self.version = 0  # Increases on every change; cheap cache key for views
+        self._lock = threading.RLock()
+        self._reset(messages)
+
+    def _reset(self, messages):
+        self._messages = []
+        self._cumulative = [0]  # _cumulative[i] = tokens of _messages[:i]
+        self._head = 0
+        self.total_tokens = 0
+        self.total_chars = 0
+        self.user_messages = 0
+        for message in messages:
+            self._append(message)
+
+    def _append(self, message):
+        tokens = self.count_tokens(message)
+        self._messages.append(message)
+        self._cumulative.append(self._cumulative[-1] + tokens)
+        self.total_tokens += tokens
+        self.total_chars += len(message)
+        if message.startswith("User: "):
+            self.user_messages += 1
+
+    # --- Mutation ---
+
+    def append(self, message):
+        """Add a message at the end (O(1) plus tokenizing the new message)"""
+        with self._lock:
+            self._append(message)
+            self.version += 1
+
+    def extend(self, messages):
+        with self._lock:
+            for message in messages:
+                self._append(message)
+            self.version += 1
+
+    def drop_oldest(self, count):
+        """
+        Remove the `count` oldest messages.
+
+        Returns:
+            list: The removed messages, oldest first
+        """
+        with self._lock:
+            count = max(0, min(count, len(self)))
+            start, end = self._head, self._head + count
+            removed = self._messages[start:end]
+            self.total_tokens -= self._cumulative[end] - self._cumulative[start]
+            self.total_chars -= sum(len(message) for message in removed)
+            self.user_messages -= sum(1 for message in removed if message.startswith("User: "))
+            self._head = end
+            if self._head > len(self._messages) - self._head:
+                self._compact()
+            self.version += 1
+            return removed
+
+    def _compact(self):
+        base = self._cumulative[self._head]
+        self._messages = self._messages[self._head:]
+        self._cumulative = [total - base for total in self._cumulative[self._head:]]
+        self._head = 0
+
+    def clear(self):
+        with self._lock:
+            self._reset(())
+            self.version += 1
+
+    def replace(self, messages):
+        """Replace the whole history (e.g. after loading from disk)"""
+        with self._lock:
+            self._reset(messages)
+            self.version += 1
+
+    # --- Views ---
+
+    def __len__(self):
+        return len(self._messages) - self._head
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __reversed__(self):
+        return reversed(self.to_list())
+
+    def __getitem__(self, index):
+        with self._lock:
+            if isinstance(index, slice):
+                start, stop, step = index.indices(len(self))
+                return self._messages[self._head + start:self._head + stop:step]
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("conversation index out of range")
+            return self._messages[self._head + index]
+
+    def to_list(self):
+        """Copy of all messages, oldest first"""
+        with self._lock:
+            return self._messages[self._head:]
+
+    def tail(self, count):
+        """The `count` most recent messages, oldest first (O(count))"""
+        if count <= 0:
+            return []
+        with self._lock:
+            return self._messages[max(self._head, len(self._messages) - count):]
+
+    def message_tokens(self, index):
+        """Cached token count of one message"""
+        with self._lock:
+            if index < 0:
+                index += len(self)
+            i = self._head + index
+            return self._cumulative[i + 1] - self._cumulative[i]
+
+    def tokens_between(self, start, end=None):
+        """Tokens of messages[start:end] in O(1)"""
+        with self._lock:
+            start, end, _ = slice(start, end).indices(len(self))
+            if end <= start:
+                return 0
+            return self._cumulative[self._head + end] - self._cumulative[self._head + start]
+
+    def tail_within_budget(self, max_tokens):
+        """
+        Start index of the longest suffix of the history that fits in max_tokens.
+
+        Found by binary search over the cumulative counts, O(log n).
+        """
+        with self._lock:
+            end_total = self._cumulative[-1]
+            # First absolute index i with end_total - cumulative[i] <= max_tokens
+            i = bisect_left(self._cumulative, end_total - max_tokens, lo=self._head)
+            return i - self._head
+
+    def stats(self):
+        """Same fields as token_counter.get_context_stats(), from the running totals"""
+        message_count = len(self)
+        return {
+            'total_tokens': self.total_tokens,
+            'message_count': message_count,
+            'user_messages': self.user_messages,
+            'total_characters': self.total_chars,
+            'avg_tokens_per_message': self.total_tokens // message_count if message_count > 0 else 0
+        }
@@ -0,0 +1,144 @@
+"""
+Face Frame Atlas for LUDO HUD
+Tints the animated face frames once at load time and caches them at a
+small set of quantized scale steps, so drawing a frame is a single blit
+"""
+
+import pygame
+
+
+def tint_surface(surface, color):
+    """
+    Return a tinted copy of a surface (RGBA multiply).
+
+    Args:
+        surface (pygame.Surface): Source image with per-pixel alpha
+        color (tuple): RGB tint color
+
+    Returns:
+        pygame.Surface: Tinted copy
+    """
+    tinted = surface.convert_alpha()
+    tint = pygame.Surface(tinted.get_size(), pygame.SRCALPHA)
+    tint.fill(tuple(color) + (255,))
+    tinted.blit(tint, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    return tinted
+
+
+class FaceAtlas:
+    """Pre-tinted face frames cached by whole scale steps under a memory ceiling"""
+
+    def __init__(self, frame_surfaces, tint, base_scale=0.6, min_scale=1.0, max_scale=2.0,
+                 scale_steps=8, max_bytes=64 * 1024 * 1024):
+        """
+        Initialize the atlas
+
+        Args:
+            frame_surfaces: Iterable of untinted GIF frame surfaces; only the
+                            tinted copies are kept, so a generator lets the
+                            caller's decoded frames be freed as they are tinted
+            tint: RGB tint color applied once to every frame
+            base_scale: Size multiplier applied on top of the audio scale
+            min_scale: Smallest audio-driven scale (silence)
+            max_scale: Largest audio-driven scale (loud input)
+            scale_steps: Number of quantized scales between min and max
+            max_bytes: Memory ceiling for the scaled-frame cache
+        """
+        self.frames = [tint_surface(frame, tint) for frame in frame_surfaces]
+        self.base_scale = base_scale
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.scale_steps = max(1, scale_steps)
+        self.max_bytes = max_bytes
+        # A step is admitted only if all of its frames fit, and admitted steps are
+        # never evicted: the animation cycles through every frame, so evicting
+        # single frames would miss on every one of them
+        self._steps = set()
+        self._reserved_bytes = 0
+        self._cache = {}  # (frame_idx, step) -> surface
+        self._cache_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'uncached': 0}
+
+    def __len__(self):
+        return len(self.frames)
+
+    def quantize(self, scale):
+        """Map a continuous scale onto the nearest step index"""
+        if self.scale_steps == 1:
+            return 0
+        span = self.max_scale - self.min_scale
+        position = (min(max(scale, self.min_scale), self.max_scale) - self.min_scale) / span
+        return int(round(position * (self.scale_steps - 1)))
+
+    def step_size(self, step):
+        """Pixel size of a frame at a given step"""
+        if self.scale_steps == 1:
+            scale = self.min_scale
+        else:
+            scale = self.min_scale + (self.max_scale - self.min_scale) * step / (self.scale_steps - 1)
+        width, height = self.frames[0].get_size()
+        return (int(width * scale * self.base_scale), int(height * scale * self.base_scale))
+
+    def step_bytes(self, step):
+        """Memory needed to cache every frame at a given step"""
+        width, height = self.step_size(step)
+        return width * height * self.frames[0].get_bytesize() * len(self.frames)
+
+    def _admit(self, step):
+        if step in self._steps:
+            return True
+        needed = self.step_bytes(step)
+        if self._reserved_bytes + needed > self.max_bytes:
+            return False
+        self._steps.add(step)
+        self._reserved_bytes += needed
+        return True
+
+    def get(self, frame_idx, scale):
+        """
+        Get a tinted frame at the step nearest to the requested scale.
+
+        Frames of steps that do not fit the memory ceiling are scaled on
+        every call rather than cached.
+
+        Args:
+            frame_idx: Index of the GIF frame
+            scale: Smoothed audio-driven scale
+
+        Returns:
+            pygame.Surface: Ready-to-blit frame
+        """
+        step = self.quantize(scale)
+        key = (frame_idx, step)
+        surface = self._cache.get(key)
+        if surface is not None:
+            self.stats['hits'] += 1
+            return surface
+
+        surface = pygame.transform.scale(self.frames[frame_idx], self.step_size(step))
+        if self._admit(step):
+            self.stats['misses'] += 1
+            self._cache[key] = surface
+            self._cache_bytes += surface.get_bytesize() * surface.get_width() * surface.get_height()
+        else:
+            self.stats['uncached'] += 1
+        return surface
+
+    def prewarm(self):
+        """Cache whole steps, smallest (silence) first, while they fit the memory ceiling"""
+        for step in range(self.scale_steps):
+            if not self._admit(step):
+                return
+            scale = self.min_scale + (self.max_scale - self.min_scale) * step / max(1, self.scale_steps - 1)
+            for frame_idx in range(len(self.frames)):
+                self.get(frame_idx, scale)
+
+    @property
+    def cached_steps(self):
+        """Steps admitted to the cache, in ascending order"""
+        return sorted(self._steps)
+
+    @property
+    def memory_bytes(self):
+        """Bytes currently held by the scaled-frame cache"""
+        return self._cache_bytes
@@ -0,0 +1,194 @@
+"""
+Frame Profiler for LUDO HUD
+Toggleable per-section timing of the main loop with a rolling on-screen
+summary and optional per-frame JSONL export. When disabled every hook is a
+single attribute check.
+"""
+
+import json
+import time
+from collections import deque
+
+_perf_counter = time.perf_counter
+
+
+class _NullSection:
+    """Context manager used while profiling is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    """Timed section; time spent in nested sections is excluded (exclusive timing)"""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        now = _perf_counter()
+        stack = self.profiler._stack
+        if stack:
+            parent = stack[-1]
+            self.profiler._add(parent.name, now - parent.start)
+        self.start = now
+        stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        now = _perf_counter()
+        profiler = self.profiler
+        profiler._stack.pop()
+        profiler._add(self.name, now - self.start)
+        if profiler._stack:
+            profiler._stack[-1].start = now
+        return False
+
+
+class FrameProfiler:
+    """Per-section frame timings with a rolling window"""
+
+    def __init__(self, window=90, jsonl_path=None, refresh_frames=15):
+        """
+        Initialize the profiler
+
+        Args:
+            window: Number of frames kept for the rolling averages
+            jsonl_path: File to append one JSON line per frame to (None disables export)
+            refresh_frames: Frames between overlay text refreshes
+        """
+        self.enabled = False
+        self.window = window
+        self.jsonl_path = jsonl_path
+        self.refresh_frames = refresh_frames
+        self.frame = 0
+        self.history = {}  # section -> deque of ms
+        self.overlay_lines = ()
+        self._sections = {}
+        self._current = {}
+        self._stack = []
+        self._frame_start = 0.0
+        self._in_frame = False  # begin_frame() ran while enabled and end_frame() has not yet
+        self._jsonl = None
+
+    def toggle(self):
+        """Switch profiling on/off"""
+        self.enabled = not self.enabled
+        if self.enabled:
+            # Usually toggled mid-frame: record nothing until the next begin_frame()
+            self.history = {}
+            self._current = {}
+            self._stack = []
+            self._in_frame = False
+            self.overlay_lines = ("Profiling...",)
+            if self.jsonl_path:
+                try:
+                    self._jsonl = open(self.jsonl_path, 'a', encoding='utf-8')
+                except Exception as e:
+                    print(f"Failed to open profiler log: {e}")
+            print("⏱️ Frame profiler enabled")
+        else:
+            self.close()
+            print("⏱️ Frame profiler disabled")
+        return self.enabled
+
+    def close(self):
+        """Flush and close the JSONL export"""
+        if self._jsonl:
+            try:
+                self._jsonl.close()
+            except Exception as e:
+                print(f"Failed to close profiler log: {e}")
+            self._jsonl = None
+
+    def section(self, name):
+        """
+        Time a block of the frame.
+
+        Args:
+            name: Section label (e.g. 'audio', 'chat', 'hand')
+
+        Returns:
+            Context manager recording the block's exclusive time
+        """
+        if not self.enabled:
+            return _NULL_SECTION
+        section = self._sections.get(name)
+        if section is None:
+            section = self._sections[name] = _Section(self, name)
+        return section
+
+    def _add(self, name, seconds):
+        self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def begin_frame(self):
+        """Mark the start of a frame"""
+        if not self.enabled:
+            return
+        self._current = {}
+        self._stack = []
+        self._in_frame = True
+        self._frame_start = _perf_counter()
+
+    def end_frame(self):
+        """Mark the end of a frame and record its timings"""
+        if not self.enabled or not self._in_frame:
+            return
+        self._in_frame = False
+        total = _perf_counter() - self._frame_start
+        sections_ms = {name: seconds * 1000 for name, seconds in self._current.items()}
+        sections_ms['other'] = max(0.0, total * 1000 - sum(sections_ms.values()))
+        sections_ms['total'] = total * 1000
+
+        for name, ms in sections_ms.items():
+            samples = self.history.get(name)
+            if samples is None:
+                samples = self.history[name] = deque(maxlen=self.window)
+            samples.append(ms)
+
+        if self._jsonl:
+            try:
+                self._jsonl.write(json.dumps({
+                    'frame': self.frame,
+                    'time': time.time(),
+                    'sections_ms': {name: round(ms, 4) for name, ms in sections_ms.items()}
+                }) + "\n")
+            except Exception as e:
+                print(f"Failed to write profiler log: {e}")
+                self.close()
+
+        self.frame += 1
+        if self.frame % self.refresh_frames == 0:
+            self.overlay_lines = self.summary_lines()
+
+    def summary(self):
+        """
+        Rolling statistics per section.
+
+        Returns:
+            dict: section -> {'avg_ms', 'max_ms'}
+        """
+        return {name: {'avg_ms': sum(samples) / len(samples), 'max_ms': max(samples)}
+                for name, samples in self.history.items() if samples}
+
+    def summary_lines(self):
+        """Overlay text, slowest sections first, total last"""
+        stats = self.summary()
+        total = stats.pop('total', None)
+        lines = [f"{name:<10}{s['avg_ms']:6.2f} ms  max {s['max_ms']:6.2f}"
+                 for name, s in sorted(stats.items(), key=lambda item: -item[1]['avg_ms'])]
+        if total:
+            lines.append(f"{'total':<10}{total['avg_ms']:6.2f} ms  max {total['max_ms']:6.2f}")
+        return tuple(lines)
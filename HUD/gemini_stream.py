@@ -0,0 +1,184 @@
+"""
+Streaming Gemini Responses for LUDO
+Consumes generate_content_stream chunk by chunk so the chat panel can show
+the answer while it is still being generated, and times each request
+(time to first token and total latency) along with the input tokens the
+API reports. FakeStreamingClient mimics the google.genai client so
+streaming can be exercised offline.
+
+Usage:
+    python gemini_stream.py   # stream a canned answer through the fake client
+"""
+
+import time
+from types import SimpleNamespace
+
+
+class StreamTimings:
+    """Latency of one streamed request"""
+
+    __slots__ = ('started', 'first_token', 'finished', 'chunks', 'chars', 'prompt_tokens', 'cached_tokens')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token = None
+        self.finished = None
+        self.chunks = 0
+        self.chars = 0
+        self.prompt_tokens = None  # Input tokens billed, from usage_metadata when the API reports it
+        self.cached_tokens = None  # Of those, tokens served from a context cache
+
+    @property
+    def ttft_ms(self):
+        """Milliseconds until the first non-empty chunk (None if nothing arrived)"""
+        if self.first_token is None:
+            return None
+        return (self.first_token - self.started) * 1000
+
+    @property
+    def total_ms(self):
+        """Milliseconds until the stream ended"""
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return (end - self.started) * 1000
+
+    def as_dict(self):
+        return {'ttft_ms': self.ttft_ms, 'total_ms': self.total_ms, 'chunks': self.chunks, 'chars': self.chars,
+                'prompt_tokens': self.prompt_tokens, 'cached_tokens': self.cached_tokens}
+
+    def record_usage(self, usage):
+        if usage is None:
+            return
+        if getattr(usage, 'prompt_token_count', None) is not None:
+            self.prompt_tokens = usage.prompt_token_count
+        if getattr(usage, 'cached_content_token_count', None) is not None:
+            self.cached_tokens = usage.cached_content_token_count
+
+
+def stream_response(client, model, contents, on_text=None, stream=True, config=None):
+    """
+    Generate a response, reporting the text accumulated so far after every chunk.
+
+    Args:
+        client: google.genai Client (or FakeStreamingClient)
+        model: Model name, e.g. 'gemini-2.5-flash'
+        contents: Prompt passed to the model
+        on_text: Callable receiving the full text received so far
+        stream: Use generate_content_stream; False waits for the whole answer
+        config: Optional GenerateContentConfig (or dict), e.g. {'cached_content': name}
+
+    Returns:
+        tuple: (full response text, StreamTimings)
+    """
+    timings = StreamTimings()
+    kwargs = {'config': config} if config is not None else {}
+
+    if not stream:
+        response = client.models.generate_content(model=model, contents=contents, **kwargs)
+        text = response.text or ""
+        timings.first_token = timings.finished = time.perf_counter()
+        timings.record_usage(getattr(response, 'usage_metadata', None))
+        timings.chunks = 1
+        timings.chars = len(text)
+        if on_text:
+            on_text(text)
+        return text, timings
+
+    parts = []
+    try:
+        for chunk in client.models.generate_content_stream(model=model, contents=contents, **kwargs):
+            timings.record_usage(getattr(chunk, 'usage_metadata', None))
+            piece = chunk.text
+            if not piece:
+                continue  # Safety or metadata-only chunks carry no text
+            if timings.first_token is None:
+                timings.first_token = time.perf_counter()
+            parts.append(piece)
+            timings.chunks += 1
+            timings.chars += len(piece)
+            if on_text:
+                on_text("".join(parts))
+    finally:
+        timings.finished = time.perf_counter()
+
+    return "".join(parts), timings
+
+
+class FakeStreamingClient:
+    """
+    Offline stand-in for google.genai.Client.
+
+    Exposes models.generate_content, models.generate_content_stream and
+    caches.create/update/delete, and replays a canned answer in word-sized chunks
+    with configurable delays. Usage metadata counts ~4 characters per token.
+    """
+
+    def __init__(self, response="This is an offline test response from LUDO. Streaming shows each word as soon as it arrives.",
+                 first_token_delay=0.4, chunk_delay=0.05, words_per_chunk=3):
+        """
+        Args:
+            response: Text to return, or a callable taking the prompt and returning text
+            first_token_delay: Seconds before the first chunk
+            chunk_delay: Seconds between later chunks
+            words_per_chunk: Words per streamed chunk
+        """
+        self.response = response
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self.words_per_chunk = words_per_chunk
+        self.models = SimpleNamespace(generate_content=self._generate_content,
+                                      generate_content_stream=self._generate_content_stream)
+        self.caches = SimpleNamespace(create=self._create_cache, update=self._update_cache, delete=self._delete_cache)
+        self._cached = {}  # cache name -> cached prefix text
+        self._cache_count = 0
+
+    def _create_cache(self, model, config):
+        self._cache_count += 1
+        name = f"cachedContents/fake-{self._cache_count}"
+        self._cached[name] = "".join(config['contents'])
+        return SimpleNamespace(name=name)
+
+    def _update_cache(self, name, config):
+        if name not in self._cached:
+            raise KeyError(f"{name} not found")
+        return SimpleNamespace(name=name)
+
+    def _delete_cache(self, name):
+        self._cached.pop(name, None)
+
+    def _usage(self, contents, config):
+        cached_name = config.get('cached_content') if isinstance(config, dict) else getattr(config, 'cached_content', None)
+        cached = len(self._cached.get(cached_name, "")) // 4
+        return SimpleNamespace(prompt_token_count=len(contents) // 4 + cached, cached_content_token_count=cached or None)
+
+    def _text_for(self, contents):
+        return self.response(contents) if callable(self.response) else self.response
+
+    def _chunks(self, text):
+        words = text.split(" ")
+        for i in range(0, len(words), self.words_per_chunk):
+            piece = " ".join(words[i:i + self.words_per_chunk])
+            yield piece if i == 0 else " " + piece
+
+    def _generate_content(self, model, contents, config=None):
+        text = self._text_for(contents)
+        time.sleep(self.first_token_delay + self.chunk_delay * max(0, len(list(self._chunks(text))) - 1))
+        return SimpleNamespace(text=text, usage_metadata=self._usage(contents, config))
+
+    def _generate_content_stream(self, model, contents, config=None):
+        text = self._text_for(contents)
+        pieces = list(self._chunks(text))
+        for i, piece in enumerate(pieces):
+            time.sleep(self.first_token_delay if i == 0 else self.chunk_delay)
+            usage = self._usage(contents, config) if i == len(pieces) - 1 else None
+            yield SimpleNamespace(text=piece, usage_metadata=usage)
+
+
+if __name__ == "__main__":
+    client = FakeStreamingClient()
+    for stream in (False, True):
+        text, timings = stream_response(client, "fake", "User: hello\nLUDO:",
+                                        on_text=lambda partial: print(f"\r  {partial}", end="", flush=True),
+                                        stream=stream)
+        print()
+        print(f"{'stream' if stream else 'blocking'}: first text after {timings.ttft_ms:.0f} ms, "
+              f"done after {timings.total_ms:.0f} ms ({timings.chunks} chunks)")
@@ -0,0 +1,78 @@
+"""
+Hand Tracking Helpers for LUDO
+Compact hand snapshots published by the tracking thread and the skeleton
+geometry used to draw them with a handful of batched pygame calls
+"""
+
+import numpy as np
+
+
+class HandSnapshot:
+    """
+    Immutable result of one tracking pass.
+
+    The tracking thread builds a new snapshot and publishes it with a single
+    assignment, so readers always see a consistent set of fields.
+    """
+
+    __slots__ = ('seq', 'points', 'closed', 'wrist')
+
+    def __init__(self, seq, points=None, closed=False, wrist=(0, 0)):
+        """
+        Args:
+            seq: Frame sequence number (increases with every published result)
+            points: (21, 2) int32 array of screen-space landmarks, or None when no hand
+            closed: Whether the hand is a fist
+            wrist: Wrist position in screen coordinates
+        """
+        self.seq = seq
+        self.points = points
+        self.closed = closed
+        self.wrist = wrist
+
+
+NO_HAND = HandSnapshot(0)
+
+
+def landmarks_to_points(landmarks, width, height):
+    """
+    Convert normalized landmarks to screen-space pixel coordinates.
+
+    Args:
+        landmarks: Sequence of objects with normalized .x/.y
+        width, height: Screen size in pixels
+
+    Returns:
+        np.ndarray: (N, 2) int32 array
+    """
+    normalized = np.array([(landmark.x, landmark.y) for landmark in landmarks], dtype=np.float32)
+    return (normalized * np.array((width, height), dtype=np.float32)).astype(np.int32)
+
+
+def connections_to_paths(connections):
+    """
+    Chain (start, end) connections into as few polylines as possible, so
+    the skeleton can be drawn with one pygame.draw.lines call per path.
+
+    Args:
+        connections: Iterable of (start, end) landmark index pairs
+
+    Returns:
+        tuple: Tuples of landmark indices, each a connected polyline
+    """
+    remaining = sorted(tuple(sorted(pair)) for pair in connections)
+    paths = []
+    while remaining:
+        start, end = remaining.pop(0)
+        path = [start, end]
+        extended = True
+        while extended:
+            extended = False
+            for i, (a, b) in enumerate(remaining):
+                if a == path[-1] or b == path[-1]:
+                    path.append(b if a == path[-1] else a)
+                    remaining.pop(i)
+                    extended = True
+                    break
+        paths.append(tuple(path))
+    return tuple(paths)
@@ -0,0 +1,292 @@
+"""
+HTML Extraction for LUDO
+Pulls search results out of DuckDuckGo's HTML page and readable text out
+of web pages with a pluggable backend:
+
+    stream      - stdlib HTMLParser that stops as soon as it has enough
+                  results or text (always available; accepts chunks)
+    selectolax  - Lexbor-based parser, fastest full parse (optional)
+    lxml        - libxml2 parser (optional)
+    bs4         - BeautifulSoup html.parser tree (the original path)
+
+"auto" uses selectolax for search results when it is installed and the
+streaming parser otherwise; page text always goes through the streaming
+parser, whose early exit beats any full parse on long pages.
+"""
+
+import re
+from html.parser import HTMLParser
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as LexborParser
+except ImportError:
+    LexborParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+# Elements whose text is never page content
+SKIPPED_TAGS = ('script', 'style', 'nav', 'footer', 'header')
+
+_SPACES = re.compile(r"\s+")
+
+
+def collapse(text):
+    return _SPACES.sub(" ", text).strip()
+
+
+def _classes(attrs):
+    for name, value in attrs:
+        if name == 'class' and value:
+            return value.split()
+    return ()
+
+
+class _EnoughParsed(Exception):
+    """Stops HTMLParser.feed() once the extractor has what it needs"""
+
+
+# --- Streaming backend ---
+
+class StreamingResultsExtractor(HTMLParser):
+    """Collects div.result entries (title link + snippet) and stops after `limit`"""
+
+    def __init__(self, limit=3):
+        super().__init__()
+        self.limit = limit
+        self.results = []
+        self.done = False
+        self._depth = 0  # <div> nesting inside the current result, 0 outside
+        self._current = None
+        self._field = None  # 'title' or 'snippet' while inside that element
+        self._field_tag = None
+        self._field_depth = 0
+        self._text = []
+
+    def feed(self, data):
+        """Parse another chunk; returns True once enough results were found"""
+        if not self.done:
+            try:
+                super().feed(data)
+            except _EnoughParsed:
+                self.done = True
+        return self.done
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'div':
+            if self._depth:
+                self._depth += 1
+            elif 'result' in _classes(attrs):
+                self._depth = 1
+                self._current = {'title': "", 'url': "", 'snippet': ""}
+            return
+        if not self._depth:
+            return
+        if self._field:
+            if tag == self._field_tag:
+                self._field_depth += 1
+            return
+        classes = _classes(attrs)
+        if 'result__a' in classes:
+            self._start_field('title', tag)
+            self._current['url'] = dict(attrs).get('href') or ""
+        elif 'result__snippet' in classes:
+            self._start_field('snippet', tag)
+
+    def _start_field(self, field, tag):
+        self._field = field
+        self._field_tag = tag
+        self._field_depth = 1
+        self._text = []
+
+    def handle_endtag(self, tag):
+        if self._field and tag == self._field_tag:
+            self._field_depth -= 1
+            if not self._field_depth:
+                self._current[self._field] = collapse("".join(self._text))
+                self._field = None
+        if tag == 'div' and self._depth:
+            self._depth -= 1
+            if not self._depth:
+                if self._current['title'] and self._current['snippet']:
+                    self.results.append(self._current)
+                self._current = None
+                if len(self.results) >= self.limit:
+                    raise _EnoughParsed()
+
+    def handle_data(self, data):
+        if self._field:
+            self._text.append(data)
+
+
+class StreamingTextExtractor(HTMLParser):
+    """Collects visible text outside SKIPPED_TAGS and stops after `max_chars`"""
+
+    def __init__(self, max_chars=2000):
+        super().__init__()
+        self.max_chars = max_chars
+        self.done = False
+        self._skip = 0
+        self._pieces = []
+        self._estimate = 0  # Upper bound on the collapsed length so far
+
+    def feed(self, data):
+        """Parse another chunk; returns True once max_chars of text were collected"""
+        if not self.done:
+            try:
+                super().feed(data)
+            except _EnoughParsed:
+                self.done = True
+        return self.done
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        self._pieces.append(data)
+        self._estimate += len(data)
+        if self._estimate >= self.max_chars:
+            self._estimate = len(collapse("".join(self._pieces)))
+            if self._estimate >= self.max_chars:
+                raise _EnoughParsed()
+
+    def text(self):
+        return collapse("".join(self._pieces))[:self.max_chars]
+
+
+def _stream_results(html, limit):
+    extractor = StreamingResultsExtractor(limit)
+    extractor.feed(html)
+    return extractor.results
+
+
+def _stream_text(html, max_chars):
+    extractor = StreamingTextExtractor(max_chars)
+    extractor.feed(html)
+    return extractor.text()
+
+
+# --- selectolax backend ---
+
+def _lexbor_results(html, limit):
+    results = []
+    for node in LexborParser(html).css('div.result'):
+        title = node.css_first('.result__a')
+        snippet = node.css_first('.result__snippet')
+        if title is not None and snippet is not None:
+            results.append({'title': collapse(title.text()), 'url': title.attributes.get('href') or "",
+                            'snippet': collapse(snippet.text())})
+            if len(results) >= limit:
+                break
+    return results
+
+
+def _lexbor_text(html, max_chars):
+    tree = LexborParser(html)
+    tree.strip_tags(list(SKIPPED_TAGS))
+    root = tree.root
+    return collapse(root.text(separator=""))[:max_chars] if root is not None else ""
+
+
+# --- lxml backend ---
+
+_LXML_RESULT = "//div[contains(concat(' ', normalize-space(@class), ' '), ' result ')]"
+_LXML_CLASS = ".//*[contains(concat(' ', normalize-space(@class), ' '), ' {} ')]"
+
+
+def _lxml_results(html, limit):
+    results = []
+    for node in lxml.html.fromstring(html).xpath(_LXML_RESULT):
+        title = node.xpath(_LXML_CLASS.format('result__a'))
+        snippet = node.xpath(_LXML_CLASS.format('result__snippet'))
+        if title and snippet:
+            results.append({'title': collapse(title[0].text_content()), 'url': title[0].get('href') or "",
+                            'snippet': collapse(snippet[0].text_content())})
+            if len(results) >= limit:
+                break
+    return results
+
+
+def _lxml_text(html, max_chars):
+    root = lxml.html.fromstring(html)
+    for element in list(root.iter(*SKIPPED_TAGS)):
+        element.drop_tree()
+    return collapse(root.text_content())[:max_chars]
+
+
+# --- BeautifulSoup backend (the original implementation) ---
+
+def _bs4_results(html, limit):
+    soup = BeautifulSoup(html, 'html.parser')
+    results = []
+    for result in soup.find_all('div', class_='result')[:limit]:
+        title_tag = result.find('a', class_='result__a')
+        snippet_tag = result.find('a', class_='result__snippet')
+        if title_tag and snippet_tag:
+            results.append({'title': title_tag.get_text(strip=True), 'url': title_tag.get('href', ''),
+                            'snippet': snippet_tag.get_text(strip=True)})
+    return results
+
+
+def _bs4_text(html, max_chars):
+    soup = BeautifulSoup(html, 'html.parser')
+    for element in soup(list(SKIPPED_TAGS)):
+        element.decompose()
+    return collapse(soup.get_text())[:max_chars]
+
+
+BACKENDS = {
+    'stream': (_stream_results, _stream_text, True),
+    'selectolax': (_lexbor_results, _lexbor_text, LexborParser is not None),
+    'lxml': (_lxml_results, _lxml_text, lxml is not None),
+    'bs4': (_bs4_results, _bs4_text, BeautifulSoup is not None),
+}
+
+
+def available_backends():
+    return [name for name, (_, _, available) in BACKENDS.items() if available]
+
+
+def resolve_backend(name="auto"):
+    """Validate a backend name ('auto' or one of BACKENDS), falling back to the streaming parser"""
+    if name == "auto":
+        return name
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML backend: {name}")
+    if not BACKENDS[name][2]:
+        print(f"⚠️ HTML backend {name} is not installed; using the streaming parser")
+        return 'stream'
+    return name
+
+
+def extract_results(html, limit=3, backend="auto"):
+    """
+    Search results from a DuckDuckGo HTML page.
+
+    Returns:
+        list: {'title', 'url', 'snippet'} dicts, at most `limit`
+    """
+    if backend == "auto":
+        backend = 'selectolax' if LexborParser is not None else 'stream'
+    return BACKENDS[backend][0](html, limit)
+
+
+def extract_text(html, max_chars=2000, backend="auto"):
+    """Visible page text (scripts, styles, navigation, headers and footers removed), at most max_chars"""
+    if backend == "auto":
+        backend = 'stream'
+    return BACKENDS[backend][1](html, max_chars)
@@ -0,0 +1,344 @@
+"""
+Pooled HTTP Client for LUDO
+One shared client for web searches and page fetches: keep-alive
+connection pooling (requests.Session, or httpx with HTTP/2 when enabled
+and available), a per-host connection limit, one timeout policy and
+default headers. Every request records its connect, time-to-headers and
+transfer time so connection reuse can be checked. Pages can be streamed
+with a byte cap, a Content-Type filter and incremental decoding, so a
+huge page or a binary download costs no more than the cap.
+"""
+
+import codecs
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Media types worth extracting text from
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+
+
+class ContentRejected(Exception):
+    """Raised by HTTPClient.stream_text() when the Content-Type is not wanted"""
+
+_connect_times = threading.local()
+
+
+def parse_content_type(value):
+    """
+    Split a Content-Type header.
+
+    Returns:
+        tuple: (lowercase media type or "", charset or None)
+    """
+    parts = [part.strip() for part in (value or "").split(";")]
+    charset = None
+    for param in parts[1:]:
+        name, _, val = param.partition("=")
+        if name.strip().lower() == "charset" and val:
+            charset = val.strip().strip('"\'')
+    return parts[0].lower(), charset
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+# --- Connection timing for the requests backend ---
+
+class _TimedConnectMixin:
+    """Adds the TCP (+ TLS) setup time of new connections to a thread-local counter"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_times.ms = getattr(_connect_times, 'ms', 0.0) + (time.perf_counter() - started) * 1000
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _TimedHTTPPool, 'https': _TimedHTTPSPool}
+
+
+class RequestTiming:
+    """Timing of one HTTP request"""
+
+    __slots__ = ('url', 'host', 'status', 'connect_ms', 'headers_ms', 'transfer_ms', 'bytes', 'protocol', 'stopped')
+
+    def __init__(self, url, host):
+        self.url = url
+        self.host = host
+        self.status = None
+        self.connect_ms = 0.0  # DNS + TCP + TLS; 0 when a pooled connection was reused
+        self.headers_ms = 0.0  # Request start until response headers (includes connect)
+        self.transfer_ms = 0.0  # Reading the body
+        self.bytes = 0
+        self.protocol = None
+        self.stopped = None  # stream_text(): complete, enough, cap, cancelled or rejected
+
+    @property
+    def total_ms(self):
+        return self.headers_ms + self.transfer_ms
+
+    @property
+    def reused(self):
+        return self.connect_ms == 0.0
+
+    def as_dict(self):
+        return {'url': self.url, 'status': self.status, 'connect_ms': round(self.connect_ms, 1),
+                'headers_ms': round(self.headers_ms, 1), 'transfer_ms': round(self.transfer_ms, 1),
+                'total_ms': round(self.total_ms, 1), 'bytes': self.bytes, 'protocol': self.protocol,
+                'stopped': self.stopped}
+
+
+class HTTPClient:
+    """Shared keep-alive HTTP client with per-host limits and request timings"""
+
+    def __init__(self, connect_timeout=5.0, read_timeout=10.0, per_host=4, hosts=16, http2=False,
+                 user_agent=DEFAULT_USER_AGENT, history=200):
+        """
+        Args:
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for data once connected
+            per_host: Concurrent (and kept-alive) connections per host
+            hosts: Hosts whose connection pools are kept
+            http2: Use httpx with HTTP/2 if httpx and h2 are installed
+            user_agent: Default User-Agent header
+            history: Request timings kept for report()
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.per_host = per_host
+        self.timings = deque(maxlen=history)
+        self._host_slots = {}
+        self._lock = threading.Lock()
+        headers = {'User-Agent': user_agent, 'Accept-Language': 'en-US,en;q=0.8'}
+
+        if http2 and HTTP2_AVAILABLE:
+            self.backend = 'httpx-h2'
+            self._client = httpx.Client(
+                http2=True, headers=headers, follow_redirects=True,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(max_connections=per_host * hosts, max_keepalive_connections=per_host * hosts),
+            )
+        else:
+            if http2:
+                print("⚠️ HTTP/2 needs httpx and h2; using requests keep-alive pooling")
+            self.backend = 'requests'
+            self._client = requests.Session()
+            self._client.headers.update(headers)
+            adapter = _TimedAdapter(pool_connections=hosts, pool_maxsize=per_host, pool_block=True)
+            self._client.mount('http://', adapter)
+            self._client.mount('https://', adapter)
+
+    def _slot(self, host):
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    def get(self, url, headers=None, timeout=None):
+        """
+        GET a URL and read the whole body.
+
+        Args:
+            url: Absolute URL
+            headers: Extra headers for this request
+            timeout: (connect, read) override of the shared policy
+
+        Returns:
+            Response object with .status_code, .headers, .text, .content and
+            .raise_for_status() (requests.Response or httpx.Response), plus
+            .timing with its RequestTiming
+
+        Raises:
+            requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+            whichever backend is in use
+        """
+        response, timing = self._request(url, headers, timeout, None)
+        response.timing = timing
+        return response
+
+    def stream_text(self, url, on_text, max_bytes=512 * 1024, content_types=HTML_CONTENT_TYPES, cancel=None,
+                    chunk_size=16 * 1024, headers=None, timeout=None):
+        """
+        Stream a text page to a consumer without holding the whole body.
+
+        The Content-Type is checked before any of the body is read, the
+        body is decoded incrementally (charset from the header, UTF-8
+        otherwise) and reading stops at max_bytes, when the consumer has
+        enough, or when cancel is set. The connection is dropped rather
+        than drained when reading stops early.
+
+        Args:
+            url: Absolute URL
+            on_text: Callable receiving each decoded piece of text; returning
+                     True stops the download (e.g. StreamingTextExtractor.feed)
+            max_bytes: Most body bytes read (after content decoding)
+            content_types: Accepted media types (None accepts anything);
+                           a missing Content-Type header is accepted
+            cancel: Optional threading.Event checked between chunks
+            chunk_size: Bytes per read
+            headers: Extra headers for this request
+            timeout: (connect, read) override of the shared policy
+
+        Returns:
+            RequestTiming: with .bytes read and .stopped set
+
+        Raises:
+            ContentRejected: The Content-Type is not in content_types
+            requests.exceptions.HTTPError, ConnectionError or Timeout
+        """
+        def read(response, iter_chunks, timing):
+            media_type, charset = parse_content_type(response.headers.get('Content-Type'))
+            if content_types and media_type and media_type not in content_types:
+                timing.stopped = 'rejected'
+                raise ContentRejected(f"{media_type} from {url}")
+            response.raise_for_status()
+            try:
+                decoder = codecs.getincrementaldecoder(charset or 'utf-8')(errors='replace')
+            except LookupError:
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            timing.stopped = 'complete'
+            for chunk in iter_chunks(chunk_size):
+                if cancel is not None and cancel.is_set():
+                    timing.stopped = 'cancelled'
+                    return
+                chunk = chunk[:max_bytes - timing.bytes]
+                timing.bytes += len(chunk)
+                if on_text(decoder.decode(chunk)):
+                    timing.stopped = 'enough'
+                    return
+                if timing.bytes >= max_bytes:
+                    timing.stopped = 'cap'
+                    return
+            on_text(decoder.decode(b"", final=True))
+
+        return self._request(url, headers, timeout, read)[1]
+
+    def _request(self, url, headers, timeout, read):
+        timing = RequestTiming(url, urlsplit(url).netloc)
+        timeout = timeout or self.timeout
+        with self._slot(timing.host):
+            try:
+                if self.backend == 'requests':
+                    response = self._get_requests(url, headers, timeout, timing, read)
+                else:
+                    response = self._get_httpx(url, headers, timeout, timing, read)
+            finally:
+                self.timings.append(timing)
+        return response, timing
+
+    def _get_requests(self, url, headers, timeout, timing, read):
+        _connect_times.ms = 0.0
+        started = time.perf_counter()
+        response = self._client.get(url, headers=headers, timeout=timeout, stream=True)
+        headers_done = time.perf_counter()
+        timing.headers_ms = (headers_done - started) * 1000
+        timing.connect_ms = _connect_times.ms
+        timing.status = response.status_code
+        timing.protocol = 'HTTP/1.1'
+        try:
+            if read is None:
+                timing.bytes = len(response.content)
+            else:
+                read(response, response.iter_content, timing)
+        finally:
+            response.close()  # Returns a drained connection to the pool, drops an unfinished one
+            timing.transfer_ms = (time.perf_counter() - headers_done) * 1000
+        return response
+
+    def _get_httpx(self, url, headers, timeout, timing, read):
+        connect = {}
+
+        def trace(event, info):
+            if event in ('connection.connect_tcp.started', 'connection.start_tls.complete',
+                         'connection.connect_tcp.complete'):
+                connect[event] = time.perf_counter()
+
+        started = time.perf_counter()
+        try:
+            with self._client.stream('GET', url, headers=headers, extensions={'trace': trace},
+                                     timeout=httpx.Timeout(timeout[1], connect=timeout[0])) as response:
+                headers_done = time.perf_counter()
+                timing.headers_ms = (headers_done - started) * 1000
+                timing.status = response.status_code
+                timing.protocol = response.http_version
+                if 'connection.connect_tcp.started' in connect:
+                    end = connect.get('connection.start_tls.complete', connect.get('connection.connect_tcp.complete'))
+                    timing.connect_ms = (end - connect['connection.connect_tcp.started']) * 1000
+                try:
+                    if read is None:
+                        timing.bytes = len(response.read())
+                    else:
+                        read(response, response.iter_bytes, timing)
+                finally:
+                    timing.transfer_ms = (time.perf_counter() - headers_done) * 1000
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.HTTPStatusError as e:
+            raise requests.exceptions.HTTPError(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+        return response
+
+    def stats(self):
+        """Connection reuse and latency percentiles over the recorded requests"""
+        timings = [t for t in self.timings if t.status is not None]  # Failed connections have no timing
+        if not timings:
+            return {'requests': 0}
+        fresh = [t.connect_ms for t in timings if not t.reused]
+        return {
+            'requests': len(timings),
+            'reused': sum(1 for t in timings if t.reused),
+            'connect_ms_p50': percentile(fresh, 0.5),
+            'total_ms_p50': percentile([t.total_ms for t in timings], 0.5),
+            'total_ms_p95': percentile([t.total_ms for t in timings], 0.95),
+        }
+
+    def report(self):
+        """One-line summary of connection reuse and latency"""
+        s = self.stats()
+        if not s['requests']:
+            return f"{self.backend}: no requests"
+        return (f"{self.backend}: {s['requests']} requests, {s['reused']} on reused connections, "
+                f"connect p50 {s['connect_ms_p50']:.0f} ms, total p50 {s['total_ms_p50']:.0f} ms / "
+                f"p95 {s['total_ms_p95']:.0f} ms")
+
+    def close(self):
+        self._client.close()
@@ -0,0 +1,435 @@
+"""
+HUD Renderer for LUDO
+Draws one frame of the HUD (face, clock, calendar, chat, notepad, status
+and hand skeleton) through the dirty-rect compositor. Kept free of camera,
+microphone and API dependencies so it can run headless.
+"""
+
+import datetime
+import math
+
+import pygame
+
+from calendar_widget import CalendarWidget
+from compositor import Compositor
+from frame_profiler import FrameProfiler
+from hand_tracking import connections_to_paths
+from text_layout import TextLayoutCache
+
+CYAN = (0, 255, 255)
+BLACK = (0, 0, 0)
+HIGHLIGHT_ALPHA = 80
+
+
+class HUDFonts:
+    """Fonts used by the HUD renderer"""
+
+    def __init__(self, clock, calendar, description, chat, assistant, notepad):
+        self.clock = clock
+        self.calendar = calendar
+        self.description = description
+        self.chat = chat
+        self.assistant = assistant
+        self.notepad = notepad
+
+
+class HUDRenderer:
+    """Renders HUD frames onto the display surface"""
+
+    def __init__(self, screen, fonts, face_atlas, discord_icon, hand_connections=(), text_cache_size=256,
+                 profiler=None):
+        """
+        Initialize the renderer
+
+        Args:
+            screen: The pygame display surface
+            fonts: HUDFonts instance
+            face_atlas: FaceAtlas with the pre-tinted face frames
+            discord_icon: Surface drawn below the face
+            hand_connections: (start, end) landmark index pairs of the hand skeleton
+                              (chained into polylines once, here)
+            text_cache_size: Max cached chat/notepad text layouts
+            profiler: FrameProfiler timing the render sections (disabled one if None)
+        """
+        self.screen = screen
+        self.fonts = fonts
+        self.face_atlas = face_atlas
+        self.discord_icon = discord_icon
+        self.hand_paths = connections_to_paths(hand_connections)
+        # One pre-rendered landmark dot, blitted in a single batched call
+        self.hand_dot = pygame.Surface((13, 13), pygame.SRCALPHA)
+        pygame.draw.circle(self.hand_dot, CYAN, (6, 6), 6)
+        self.text_layout_cache = TextLayoutCache(text_cache_size)
+        self.calendar_widget = CalendarWidget(fonts.calendar, CYAN, BLACK, HIGHLIGHT_ALPHA)
+        self.compositor = Compositor(screen)
+        self.profiler = profiler or FrameProfiler()
+
+        self._layout_width = screen.get_width()
+        self._chat_layout_key = None
+        self._visible_messages = []
+        self._chat_bottom = 0  # y just below the last visible history message
+        self._notepad_layout_key = None
+        self._notepad_layout = []
+
+    def invalidate(self):
+        """Force a full repaint on the next frame"""
+        self.compositor.invalidate()
+
+    def layout_chat_messages(self, history, max_text_width, available_height, line_height=22, pending=()):
+        """Pick the most recent messages that fit the chat panel, using cached layouts"""
+        cache = self.text_layout_cache
+        chat_font = self.fonts.chat
+        visible_messages = []
+        total_height = 0
+
+        # Every message takes at least two lines, so only a bounded tail can ever be visible
+        max_messages = available_height // (2 * line_height + 5) + 1
+        recent = list(history[-max_messages:]) + list(pending)
+
+        for msg in reversed(recent):
+            if msg.startswith("User:"):
+                prefix = "User: "
+                color = (120, 220, 255)
+            elif msg.startswith("LUDO:"):
+                prefix = "LUDO: "
+                color = CYAN
+            else:
+                continue
+
+            layout = cache.layout(msg[6:], chat_font, max_text_width - 50, color)
+            msg_height = (len(layout.lines) + 1) * line_height + 5
+
+            if total_height + msg_height > available_height:
+                break
+
+            visible_messages.append({
+                'prefix': cache.render(prefix, chat_font, color),
+                'lines': layout.surfaces
+            })
+            total_height += msg_height
+
+        visible_messages.reverse()
+        return visible_messages
+
+    def layout_notepad_entries(self, entries, max_chars=48, max_lines=3):
+        """Build (timestamp surface, line surfaces) pairs for notepad entries, using cached layouts"""
+        cache = self.text_layout_cache
+        font = self.fonts.notepad
+        laid_out = []
+        for entry in entries:
+            timestamp_text = entry['timestamp'].split()[1][:5]  # Get HH:MM
+            timestamp_surface = cache.render(timestamp_text, font, (100, 150, 200))
+            layout = cache.layout_chars(entry['text'], font, max_chars, (200, 220, 255), max_lines)
+            laid_out.append((timestamp_surface, layout.surfaces))
+        return laid_out
+
+    def render(self, frame_idx, gif_scale, conversation_history, notepad_entries, text_input="",
+               input_active=False, listening=False, processing=False, show_shortcuts=True,
+               hand=None, now=None, pending_messages=(), face_bands=()):
+        """
+        Draw one frame and push the changed regions to the display.
+
+        Args:
+            frame_idx: Index of the face GIF frame
+            gif_scale: Smoothed audio-driven face scale
+            conversation_history: ConversationStore or list of "User: ..." / "LUDO: ..." strings
+            notepad_entries: List of {'timestamp', 'text'} dicts
+            text_input: Current typed text
+            input_active: Whether text input mode is on
+            listening: Voice input in progress
+            processing: Waiting for a response
+            show_shortcuts: Draw the keyboard shortcut bar
+            hand: HandSnapshot with screen-space points, or None
+            now: datetime to display (default: now)
+            pending_messages: Messages shown after the history but not yet part of it
+                              (a response that is still streaming in)
+            face_bands: Audio band levels in [0, 1] (low to high), drawn as a
+                        pulsing ring of arcs around the face
+
+        Returns:
+            list: Rects pushed to the display (empty after a full flip)
+        """
+        screen = self.screen
+        fonts = self.fonts
+        compositor = self.compositor
+        discord_icon = self.discord_icon
+        profiler = self.profiler
+        now = now or datetime.datetime.now()
+
+        # LUDO main face frame (pre-tinted, 60% size, nearest cached scale)
+        with profiler.section('face'):
+            ludo_main_scaled = self.face_atlas.get(frame_idx, gif_scale)
+
+        # --- Layout (shared by the static layer and the dynamic layers) ---
+        calendar_margin_right = 40
+        calendar_x = screen.get_width() - self.calendar_widget.width - calendar_margin_right
+
+        chat_x = 40
+        chat_y = 150
+        chat_width = screen.get_width() // 3 - 60
+        chat_height = screen.get_height() - 320
+        chat_line_y = chat_y + 55
+        line_height = 22
+        max_text_width = chat_width - 40  # Padding on both sides
+        max_y = chat_y + chat_height - 10  # Bottom boundary
+
+        notepad_x = screen.get_width() - 420
+        notepad_y = screen.get_height() - 400
+        notepad_width = 400
+        notepad_height = 380
+        notepad_line_height = 18
+        max_chars = 48  # Characters per line
+
+        # Re-layout only when the history or the panel size changed;
+        # steady-state frames just blit the cached line surfaces
+        if screen.get_width() != self._layout_width:
+            self.text_layout_cache.clear()
+            self._layout_width = screen.get_width()
+        # A streaming exchange gets the lower half of the panel as a dynamic layer,
+        # so its chunks never rebuild the static layer
+        streaming = bool(pending_messages)
+        history_height = max_y - chat_line_y
+        if streaming:
+            history_height -= history_height // 2
+        with profiler.section('chat'):
+            # A ConversationStore's version stands in for its contents
+            history_key = getattr(conversation_history, 'version', None)
+            if history_key is None:
+                history_key = tuple(conversation_history)
+            chat_layout_key = (history_key, streaming, max_text_width, history_height)
+            if chat_layout_key != self._chat_layout_key:
+                self._visible_messages = self.layout_chat_messages(conversation_history, max_text_width, history_height,
+                                                                   line_height)
+                self._chat_bottom = chat_line_y + sum((len(msg_data['lines']) + 1) * line_height + 5
+                                                      for msg_data in self._visible_messages)
+                self._chat_layout_key = chat_layout_key
+        with profiler.section('notepad'):
+            notepad_layout_key = tuple((entry['timestamp'], entry['text']) for entry in notepad_entries)
+            if notepad_layout_key != self._notepad_layout_key:
+                self._notepad_layout = self.layout_notepad_entries(notepad_entries, max_chars)
+                self._notepad_layout_key = notepad_layout_key
+
+        # --- Static layer: rebuilt only when one of its inputs changes ---
+        static_key = (screen.get_size(), now.date(), chat_layout_key, notepad_layout_key,
+                      show_shortcuts, input_active, len(conversation_history) // 2)
+        with profiler.section('static'):
+            static = compositor.begin_frame(static_key)
+            if static is not None:
+                # Calendar
+                self.calendar_widget.draw(static, calendar_x, 60, now.date())
+
+                # --- Chat Section (Left Side) ---
+                # Draw chat box background
+                chat_bg = pygame.Surface((chat_width, chat_height), pygame.SRCALPHA)
+                chat_bg.fill((0, 20, 40, 180))  # Dark blue transparent
+                pygame.draw.rect(chat_bg, CYAN, chat_bg.get_rect(), 3)  # Border
+                static.blit(chat_bg, (chat_x, chat_y))
+
+                # Chat title
+                chat_title = fonts.assistant.render("LUDO Chat", True, CYAN)
+                static.blit(chat_title, (chat_x + 15, chat_y + 15))
+
+                # Draw messages
+                current_y = chat_line_y
+                for msg_data in self._visible_messages:
+                    # Draw prefix (User: or LUDO:)
+                    static.blit(msg_data['prefix'], (chat_x + 20, current_y))
+                    current_y += line_height
+
+                    # Draw wrapped lines with indentation
+                    for line_surface in msg_data['lines']:
+                        if current_y >= max_y:
+                            break
+                        static.blit(line_surface, (chat_x + 35, current_y))
+                        current_y += line_height
+
+                    current_y += 5  # Add spacing between messages
+
+                # --- Display keyboard shortcuts ---
+                if show_shortcuts:
+                    if input_active:
+                        shortcut_text = "Press ENTER to send | ESC to cancel | TAB to exit typing mode"
+                    else:
+                        shortcut_text = "TAB: type | SPACE: talk | X: clear chat | C: clear memory | N: clear notepad | P: profiler"
+                    shortcut_surface = fonts.description.render(shortcut_text, True, (120, 120, 120))
+                    shortcut_rect = shortcut_surface.get_rect(center=(screen.get_width() // 2, screen.get_height() - 30))
+                    static.blit(shortcut_surface, shortcut_rect)
+
+                # --- Display conversation memory counter ---
+                if len(conversation_history) > 0:
+                    memory_count = len(conversation_history) // 2
+                    memory_text = f"Memory: {memory_count} conversation(s)"
+                    memory_surface = fonts.description.render(memory_text, True, (100, 255, 100))
+                    memory_rect = memory_surface.get_rect(topright=(screen.get_width() - 20, 20))
+                    static.blit(memory_surface, memory_rect)
+
+                # --- Display Notepad (bottom-right) ---
+                # Draw notepad container
+                notepad_rect = pygame.Rect(notepad_x, notepad_y, notepad_width, notepad_height)
+                pygame.draw.rect(static, (0, 20, 40), notepad_rect)
+                pygame.draw.rect(static, CYAN, notepad_rect, 2)
+
+                # Draw notepad title
+                notepad_title = fonts.description.render("Quick Notes", True, CYAN)
+                static.blit(notepad_title, (notepad_x + 10, notepad_y + 10))
+
+                # Draw notepad entries
+                entry_y = notepad_y + 35
+                for timestamp_surface, line_surfaces in self._notepad_layout:
+                    if entry_y > notepad_y + notepad_height - 30:
+                        break  # Stop if we run out of space
+
+                    # Draw timestamp
+                    static.blit(timestamp_surface, (notepad_x + 10, entry_y))
+
+                    # Draw wrapped text lines
+                    for i, line_surface in enumerate(line_surfaces):  # Max 3 lines per entry
+                        if entry_y + (i + 1) * notepad_line_height > notepad_y + notepad_height - 30:
+                            break
+                        static.blit(line_surface, (notepad_x + 60, entry_y + i * notepad_line_height))
+
+                    entry_y += max(len(line_surfaces), 1) * notepad_line_height + 10
+
+                # Draw notepad hint at bottom
+                if len(notepad_entries) == 0:
+                    hint_text = "Say 'note this' or 'idea:' to add notes"
+                    hint_surface = fonts.notepad.render(hint_text, True, (100, 100, 100))
+                    hint_rect = hint_surface.get_rect(center=(notepad_x + notepad_width // 2, notepad_y + notepad_height // 2))
+                    static.blit(hint_surface, hint_rect)
+
+        # --- Dynamic layers: only changed regions reach the display ---
+        # Overlay LUDO main face (center position)
+        ludo_main_rect = ludo_main_scaled.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
+        compositor.layer('face', ludo_main_rect, lambda: screen.blit(ludo_main_scaled, ludo_main_rect))
+
+        # Audio band ring: one arc per band, thicker and brighter as the band gets louder
+        if any(face_bands):
+            ring_radius = min(ludo_main_rect.size) // 2 + 12
+            ring_rect = pygame.Rect(0, 0, 2 * ring_radius, 2 * ring_radius)
+            ring_rect.center = ludo_main_rect.center
+            band_span = 2 * math.pi / len(face_bands)
+
+            def draw_band_ring():
+                for i, level in enumerate(face_bands):
+                    if level > 0.02:
+                        start = math.pi / 2 + i * band_span + 0.06
+                        color = tuple(int(c * (0.35 + 0.65 * level)) for c in CYAN)
+                        pygame.draw.arc(screen, color, ring_rect, start, start + band_span - 0.12, 1 + int(7 * level))
+
+            compositor.layer('face_bands', ring_rect.inflate(2, 2), draw_band_ring,
+                             key=(ring_rect.topleft, ring_rect.size, tuple(round(level, 2) for level in face_bands)))
+
+        # Draw Discord icon (below LUDO face)
+        discord_rect = discord_icon.get_rect(topleft=(screen.get_width() // 2 - discord_icon.get_width() // 2, ludo_main_rect.bottom - 50))
+        compositor.layer('discord', discord_rect, lambda: screen.blit(discord_icon, discord_rect), key='discord')
+
+        # Time (re-rendered only when the digits change)
+        current_time = now.strftime("%I:%M:%S %p")
+        time_rect = pygame.Rect((0, 0), fonts.clock.size(current_time))
+        time_rect.center = (screen.get_width() // 2, 100)
+        compositor.layer('clock', time_rect, lambda: screen.blit(fonts.clock.render(current_time, True, CYAN), time_rect), key=current_time)
+
+        # Streaming answer below the history, clipped to the reserved area (newest lines kept)
+        if streaming:
+            stream_rect = pygame.Rect(chat_x + 3, self._chat_bottom, chat_width - 6, max_y - self._chat_bottom)
+            with profiler.section('chat'):
+                stream_messages = self.layout_chat_messages((), max_text_width, 1 << 30, line_height,
+                                                            pending_messages)
+            stream_height = sum((len(msg_data['lines']) + 1) * line_height + 5 for msg_data in stream_messages)
+
+            def draw_stream():
+                screen.set_clip(stream_rect)
+                current_y = stream_rect.top + min(0, stream_rect.height - stream_height)
+                for msg_data in stream_messages:
+                    screen.blit(msg_data['prefix'], (chat_x + 20, current_y))
+                    current_y += line_height
+                    for line_surface in msg_data['lines']:
+                        screen.blit(line_surface, (chat_x + 35, current_y))
+                        current_y += line_height
+                    current_y += 5
+                screen.set_clip(None)
+
+            compositor.layer('stream', stream_rect, draw_stream, key=tuple(pending_messages))
+
+        # --- Chat Input Box ---
+        input_box_height = 40
+        input_box_y = chat_y + chat_height + 10
+        input_box_rect = pygame.Rect(chat_x, input_box_y, chat_width, input_box_height)
+
+        if input_active or text_input:
+            # Show typed text with cursor
+            display_text = text_input if len(text_input) < 35 else "..." + text_input[-32:]
+            cursor = "|" if (pygame.time.get_ticks() // 500) % 2 == 0 else ""
+            input_text, input_color = display_text + cursor, CYAN
+        else:
+            # Show hint text
+            input_text, input_color = "Press TAB to type or SPACE to talk...", (100, 100, 100)
+
+        def draw_input_box():
+            # Draw input box with different color when active
+            if input_active:
+                pygame.draw.rect(screen, (0, 40, 60), input_box_rect)
+                pygame.draw.rect(screen, CYAN, input_box_rect, 3)
+            else:
+                pygame.draw.rect(screen, (0, 30, 50), input_box_rect)
+                pygame.draw.rect(screen, CYAN, input_box_rect, 2)
+            screen.blit(fonts.chat.render(input_text, True, input_color), (chat_x + 15, input_box_y + 12))
+
+        compositor.layer('input', input_box_rect, draw_input_box, key=(input_active, input_text))
+
+        # --- Voice Assistant Status Display ---
+        status_y = screen.get_height() - 120
+        if listening or processing:
+            status_text = "Listening..." if listening else "Processing..."
+            status_surface = self.text_layout_cache.render(status_text, fonts.assistant, CYAN)
+            status_rect = status_surface.get_rect(center=(screen.get_width() // 2, status_y))
+            # Leave room for the pulsing dot on the left
+            status_area = status_rect.inflate(64, 0).move(-32, 0)
+
+            def draw_status():
+                if listening:
+                    # Add pulsing effect
+                    pulse_size = int(5 * (1 + 0.3 * abs((pygame.time.get_ticks() % 1000) / 500 - 1)))
+                    pygame.draw.circle(screen, CYAN, (status_rect.left - 20, status_rect.centery), pulse_size)
+                screen.blit(status_surface, status_rect)
+
+            compositor.layer('status', status_area, draw_status, key=None if listening else status_text)
+
+        if hand is not None and hand.points is not None:
+            hand_points = hand.points.tolist()
+            hand_paths = self.hand_paths
+            hand_dot = self.hand_dot
+
+            def draw_hand():
+                with profiler.section('hand'):
+                    # Draw landmarks circles
+                    screen.blits([(hand_dot, (x - 6, y - 6)) for x, y in hand_points], False)
+
+                    # Draw connections, one polyline per finger / palm edge
+                    for path in hand_paths:
+                        pygame.draw.lines(screen, CYAN, False, [hand_points[i] for i in path], 3)
+
+            (min_x, min_y), (max_x, max_y) = hand.points.min(axis=0), hand.points.max(axis=0)
+            hand_rect = pygame.Rect(int(min_x), int(min_y), int(max_x - min_x), int(max_y - min_y)).inflate(14, 14)
+            # Keyed by sequence number: an unchanged hand is not redrawn
+            compositor.layer('hand', hand_rect, draw_hand, key=hand.seq)
+
+        # --- Profiler overlay (text refreshed a few times per second) ---
+        if profiler.enabled and profiler.overlay_lines:
+            overlay_lines = profiler.overlay_lines
+            overlay_font = fonts.description
+            overlay_line_height = overlay_font.get_linesize()
+            overlay_rect = pygame.Rect(10, 10, 260, len(overlay_lines) * overlay_line_height + 12)
+
+            def draw_overlay():
+                overlay_bg = pygame.Surface(overlay_rect.size, pygame.SRCALPHA)
+                overlay_bg.fill((0, 20, 40, 200))
+                pygame.draw.rect(overlay_bg, CYAN, overlay_bg.get_rect(), 1)
+                for i, line in enumerate(overlay_lines):
+                    overlay_bg.blit(overlay_font.render(line, True, CYAN), (8, 6 + i * overlay_line_height))
+                screen.blit(overlay_bg, overlay_rect)
+
+            compositor.layer('profiler', overlay_rect, draw_overlay, key=overlay_lines)
+
+        with profiler.section('present'):
+            return compositor.present()
@@ -0,0 +1,209 @@
+"""
+Long-term Memory for LUDO
+Append-only SQLite archive of every exchange with a BM25-ranked inverted
+index (SQLite FTS5), so old conversations that have left the prompt
+window can be recalled by relevance instead of living only in the
+summary string.
+
+Usage:
+    python long_term_memory.py --messages 100000   # build a synthetic archive and time queries
+"""
+
+import re
+import sqlite3
+import threading
+import time
+
+from token_counter import count_tokens_uncached
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Words too common to say anything about relevance
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'can', 'could', 'did', 'do', 'does', 'for',
+    'from', 'had', 'has', 'have', 'how', 'i', 'if', 'in', 'is', 'it', 'its', 'me', 'my', 'of', 'on', 'or',
+    'please', 'so', 'tell', 'that', 'the', 'this', 'to', 'was', 'we', 'what', 'when', 'where', 'which',
+    'who', 'why', 'will', 'with', 'would', 'you', 'your', 'about', 'ludo',
+}
+
+
+def query_terms(text, max_terms=12):
+    """Distinct lowercase content words of a query, in order"""
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        if word not in STOPWORDS and len(word) > 1 and word not in terms:
+            terms.append(word)
+    return terms[:max_terms]
+
+
+class LongTermMemory:
+    """SQLite-backed exchange archive with BM25 retrieval"""
+
+    def __init__(self, path, user_weight=2.0, reply_weight=1.0):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a throwaway index)
+            user_weight, reply_weight: BM25 column weights; questions usually
+                                       describe the topic better than answers
+        """
+        self.path = path
+        self.weights = (user_weight, reply_weight)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS exchanges ("
+            "id INTEGER PRIMARY KEY, created REAL NOT NULL, user TEXT NOT NULL, reply TEXT NOT NULL)"
+        )
+        # External-content FTS5 table: the inverted index stores postings only
+        self._db.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS exchange_index USING fts5("
+            "user, reply, content='exchanges', content_rowid='id', tokenize='porter unicode61')"
+        )
+        self._db.commit()
+        self.stats = {'queries': 0, 'query_ms': 0.0}
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM exchanges").fetchone()[0]
+
+    @property
+    def last_id(self):
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(MAX(id), 0) FROM exchanges").fetchone()[0]
+
+    def add(self, user, reply, created=None):
+        """
+        Archive one exchange and index it.
+
+        Returns:
+            int: Exchange id
+        """
+        with self._lock:
+            cursor = self._db.execute("INSERT INTO exchanges (created, user, reply) VALUES (?, ?, ?)",
+                                      (created or time.time(), user, reply))
+            exchange_id = cursor.lastrowid
+            self._db.execute("INSERT INTO exchange_index (rowid, user, reply) VALUES (?, ?, ?)",
+                             (exchange_id, user, reply))
+            self._db.commit()
+            return exchange_id
+
+    def add_many(self, exchanges):
+        """Archive (user, reply) pairs in one transaction"""
+        with self._lock:
+            now = time.time()
+            for user, reply in exchanges:
+                cursor = self._db.execute("INSERT INTO exchanges (created, user, reply) VALUES (?, ?, ?)",
+                                          (now, user, reply))
+                self._db.execute("INSERT INTO exchange_index (rowid, user, reply) VALUES (?, ?, ?)",
+                                 (cursor.lastrowid, user, reply))
+            self._db.commit()
+
+    def seed(self, messages):
+        """
+        Archive an existing "User: ..." / "LUDO: ..." history if the archive is empty.
+
+        Returns:
+            int: Exchanges archived
+        """
+        if len(self):
+            return 0
+        pairs = [(user[len("User: "):], reply[len("LUDO: "):])
+                 for user, reply in zip(messages[::2], messages[1::2])
+                 if user.startswith("User: ") and reply.startswith("LUDO: ")]
+        self.add_many(pairs)
+        return len(pairs)
+
+    def clear(self):
+        """Forget every archived exchange"""
+        with self._lock:
+            self._db.execute("DELETE FROM exchanges")
+            self._db.execute("INSERT INTO exchange_index (exchange_index) VALUES ('delete-all')")
+            self._db.commit()
+
+    def search(self, query, limit=5, before_id=None):
+        """
+        Rank archived exchanges against a query with BM25.
+
+        Args:
+            query: Free text
+            limit: Maximum results
+            before_id: Only consider exchanges with a smaller id (excludes turns
+                       that are still in the prompt window)
+
+        Returns:
+            list: (id, score, user, reply) tuples, best first
+        """
+        terms = query_terms(query)
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in terms)
+        started = time.perf_counter()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT exchange_index.rowid, bm25(exchange_index, ?, ?) AS score, e.user, e.reply "
+                "FROM exchange_index JOIN exchanges e ON e.id = exchange_index.rowid "
+                "WHERE exchange_index MATCH ? AND exchange_index.rowid < ? "
+                "ORDER BY score LIMIT ?",
+                (*self.weights, match, before_id if before_id is not None else 1 << 62, limit)
+            ).fetchall()
+        self.stats['queries'] += 1
+        self.stats['query_ms'] += (time.perf_counter() - started) * 1000
+        return rows
+
+    def recall(self, query, max_tokens=300, limit=5, before_id=None, count_tokens=count_tokens_uncached):
+        """
+        Most relevant old exchanges as prompt lines, best first, within a token budget.
+
+        Returns:
+            list: "User: ... / LUDO: ..." strings
+        """
+        recalled = []
+        used = 0
+        for _, _, user, reply in self.search(query, limit, before_id):
+            text = f"User: {user}\nLUDO: {reply}"
+            tokens = count_tokens(text)
+            if used + tokens > max_tokens:
+                continue  # A shorter, lower-ranked exchange may still fit
+            recalled.append(text)
+            used += tokens
+        return recalled
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import random
+
+    parser = argparse.ArgumentParser(description="Long-term memory BM25 benchmark")
+    parser.add_argument("--messages", type=int, default=100000, help="Synthetic archive size in messages")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--db", default=":memory:")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = [f"topic{i}" for i in range(5000)] + ["python", "weather", "deadline", "project", "memory",
+                                                       "render", "camera", "music", "gemini", "calendar"]
+    filler = ["the", "a", "we", "talked", "about", "and", "then", "it", "was", "really", "good"]
+
+    def sentence(words):
+        return " ".join(rng.choice(vocabulary) if rng.random() < 0.4 else rng.choice(filler) for _ in range(words))
+
+    memory = LongTermMemory(args.db)
+    start = time.perf_counter()
+    memory.add_many((sentence(rng.randint(5, 20)), sentence(rng.randint(10, 60))) for _ in range(args.messages // 2))
+    print(f"Indexed {len(memory)} exchanges in {time.perf_counter() - start:.1f}s")
+
+    timings = []
+    for _ in range(args.queries):
+        query = f"what did we say about {rng.choice(vocabulary)} and {rng.choice(vocabulary)}"
+        t0 = time.perf_counter()
+        memory.recall(query, max_tokens=300)
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+    print(f"recall p50 {timings[len(timings) // 2]:.2f} ms, p95 {timings[int(len(timings) * 0.95)]:.2f} ms, "
+          f"max {timings[-1]:.2f} ms")
@@ -0,0 +1,166 @@
+"""
+Page Enrichment for LUDO
+Fetches the pages behind the top search results concurrently under one
+global deadline, keeps whichever extracts arrive in time and cancels the
+rest, so enriching the prompt with page text costs at most the deadline
+rather than the slowest site.
+
+Usage:
+    python page_enrichment.py   # fake fetches with random delays against a 1 s deadline
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import parse_qs, urlsplit
+
+from token_counter import count_tokens_uncached, estimate_tokens
+
+
+def result_url(href):
+    """Target URL of a search result link (unwraps DuckDuckGo's /l/?uddg= redirects)"""
+    if href.startswith("//"):
+        href = "https:" + href
+    parts = urlsplit(href)
+    if parts.path.startswith("/l/") and "duckduckgo" in parts.netloc:
+        target = parse_qs(parts.query).get("uddg")
+        if target:
+            return target[0]
+    return href if parts.scheme in ("http", "https") else None
+
+
+def clip_to_tokens(text, max_tokens, count_tokens=count_tokens_uncached):
+    """Longest prefix of text within max_tokens, cut at a sentence or word boundary"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:  # Binary search on the character length
+        mid = (low + high + 1) // 2
+        if count_tokens(text[:mid] + "...") <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    clipped = text[:low]
+    cut = clipped.rfind(". ")
+    if cut < len(clipped) // 2:
+        cut = clipped.rfind(" ")
+    return (clipped[:cut + 1] if cut > 0 else clipped).rstrip() + "..."
+
+
+class EnrichmentStats:
+    """Outcome of one enrichment round"""
+
+    __slots__ = ('requested', 'arrived', 'failed', 'late', 'elapsed_ms')
+
+    def __init__(self, requested):
+        self.requested = requested
+        self.arrived = 0
+        self.failed = 0
+        self.late = 0
+        self.elapsed_ms = 0.0
+
+    def __str__(self):
+        return (f"{self.arrived}/{self.requested} pages in {self.elapsed_ms:.0f} ms"
+                f" ({self.late} late, {self.failed} failed)")
+
+
+class PageEnricher:
+    """Concurrent page fetching with a deadline"""
+
+    def __init__(self, fetch, workers=8):
+        """
+        Args:
+            fetch: Callable(url, cancel) returning extracted page text or None;
+                   cancel is a threading.Event set once the result is no longer
+                   wanted, so the fetch can stop early
+            workers: Threads shared by all rounds (late fetches keep a thread
+                     until they notice the cancel event)
+        """
+        self.fetch = fetch
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="page-fetch")
+
+    def _fetch(self, url, cancel):
+        if cancel.is_set():
+            return None
+        return self.fetch(url, cancel)
+
+    def enrich(self, urls, deadline_s=2.5, max_tokens=600, should_stop=None, count_tokens=count_tokens_uncached):
+        """
+        Fetch pages concurrently and keep what arrives before the deadline.
+
+        Args:
+            urls: Page URLs, best result first (None entries are skipped)
+            deadline_s: Wall-clock budget for the whole round
+            max_tokens: Budget for all extracts together, shared by the pages
+                        that arrived (each is clipped to its share)
+            should_stop: Optional callable; True abandons the round early
+                         (e.g. the request was superseded)
+            count_tokens: Token counting function
+
+        Returns:
+            tuple: ({index in urls: extract}, EnrichmentStats)
+        """
+        started = time.perf_counter()
+        jobs = {index: url for index, url in enumerate(urls) if url}
+        stats = EnrichmentStats(len(jobs))
+        cancel = threading.Event()
+        futures = {self._executor.submit(self._fetch, url, cancel): index for index, url in jobs.items()}
+        pending = set(futures)
+        texts = {}
+        deadline = started + deadline_s
+        try:
+            while pending:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or (should_stop is not None and should_stop()):
+                    break
+                done, pending = wait(pending, timeout=min(remaining, 0.1), return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        text = future.result()
+                    except Exception:
+                        text = None
+                    if text:
+                        texts[futures[future]] = text
+                        stats.arrived += 1
+                    else:
+                        stats.failed += 1
+        finally:
+            # Late fetches are cancelled; ones already running see the event and stop
+            cancel.set()
+            for future in pending:
+                future.cancel()
+            stats.late = len(pending)
+
+        # Split the budget evenly; budget a short page leaves unused goes to the next ones
+        extracts = {}
+        used = 0
+        ranked = sorted(texts)
+        for position, index in enumerate(ranked):
+            share = (max_tokens - used) // (len(ranked) - position)
+            text = clip_to_tokens(texts[index], share, count_tokens)
+            tokens = count_tokens(text)
+            if tokens <= share and text.strip(".").strip():
+                extracts[index] = text
+                used += tokens
+        stats.elapsed_ms = (time.perf_counter() - started) * 1000
+        return extracts, stats
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    import random
+
+    def fake_fetch(url, cancel):
+        delay = random.uniform(0.1, 3.0)
+        if cancel.wait(delay):
+            return None
+        return f"Page {url} answered after {delay:.2f}s. " + "Some useful sentence. " * 100
+
+    enricher = PageEnricher(fake_fetch)
+    for round_number in range(3):
+        extracts, stats = enricher.enrich([f"https://example.com/{i}" for i in range(4)], deadline_s=1.0, max_tokens=300)
+        print(f"round {round_number}: {stats}; kept {sorted(extracts)} "
+              f"({sum(estimate_tokens(text) for text in extracts.values())} tokens)")
+    enricher.close()
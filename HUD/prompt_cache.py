@@ -0,0 +1,182 @@
+"""
+Prompt Prefix Caching for LUDO
+Splits each Gemini prompt into a stable prefix (system prompt, summary and
+older turns) that only changes every few messages, and a small per-turn
+suffix. A large enough prefix is stored with Gemini context caching and
+referenced by name; otherwise it is sent verbatim, byte-identical, at the
+start of the prompt so the provider's implicit prefix cache can reuse it.
+The provider cache is extended (or recreated) shortly before its TTL runs
+out, and dropped in favour of the inline prefix if a request using it fails.
+"""
+
+import time
+
+from token_counter import count_tokens_uncached
+
+
+def split_turns(history, block=6):
+    """
+    Split history at a block boundary so the older part stays identical
+    for several turns.
+
+    Args:
+        history: List of "User: ..." / "LUDO: ..." strings
+        block: Messages per block; the split only moves every `block` messages
+
+    Returns:
+        tuple: (stable turns, recent turns)
+    """
+    pivot = (len(history) // block) * block if block > 0 else 0
+    return history[:pivot], history[pivot:]
+
+
+def build_prefix(system_prompt, summary, stable_turns):
+    """Stable part of the prompt; must not contain anything that changes per turn"""
+    parts = [system_prompt]
+    if summary:
+        parts.append(f"[Previous context summary: {summary}]")
+    if stable_turns:
+        parts.append("\n".join(stable_turns))
+    return "\n\n".join(parts) + "\n"
+
+
+def build_suffix(recent_turns, web_context, query):
+    """Per-turn part of the prompt"""
+    recent = "\n".join(recent_turns)
+    return f"{recent}\n{web_context}\nUser: {query}\nLUDO:" if recent else f"{web_context}\nUser: {query}\nLUDO:"
+
+
+class PromptCache:
+    """Keeps the current prompt prefix and its provider-side cache, if any"""
+
+    def __init__(self, client, model, ttl_s=900, min_tokens=1024, provider_cache=True,
+                 count_tokens=count_tokens_uncached, refresh_margin_s=60):
+        """
+        Args:
+            client: google.genai Client (or FakeStreamingClient)
+            model: Model the cache is created for
+            ttl_s: Lifetime of a provider cache entry
+            refresh_margin_s: Extend the provider cache when less than this is left
+                              of its TTL (at most half the TTL)
+            min_tokens: Smallest prefix worth caching (the API rejects smaller ones)
+            provider_cache: Try Gemini context caching; False always sends the prefix inline
+            count_tokens: Token counting function for the local estimates
+        """
+        self.client = client
+        self.model = model
+        self.ttl_s = ttl_s
+        self.min_tokens = min_tokens
+        self.provider_cache = provider_cache and hasattr(client, 'caches')
+        self.count_tokens = count_tokens
+        self.refresh_margin_s = min(refresh_margin_s, ttl_s / 2)
+
+        self.prefix = None
+        self.prefix_tokens = 0
+        self.cache_name = None
+        self.cache_expires = 0.0  # time.monotonic() deadline of the provider cache
+        self.stats = {'turns': 0, 'prefix_builds': 0, 'provider_caches': 0, 'cache_extensions': 0,
+                      'cache_failures': 0, 'sent_tokens': 0, 'prefix_tokens_cached': 0}
+
+    def _drop_provider_cache(self):
+        if self.cache_name:
+            try:
+                self.client.caches.delete(name=self.cache_name)
+            except Exception as e:
+                print(f"⚠️ Could not delete prompt cache: {e}")
+            self.cache_name = None
+            self.cache_expires = 0.0
+
+    def _create_provider_cache(self):
+        try:
+            cache = self.client.caches.create(
+                model=self.model,
+                config={'contents': [self.prefix], 'ttl': f"{int(self.ttl_s)}s", 'display_name': 'ludo-prompt-prefix'}
+            )
+            self.cache_name = cache.name
+            self.cache_expires = time.monotonic() + self.ttl_s
+            self.stats['provider_caches'] += 1
+            print(f"🗃️ Cached prompt prefix ({self.prefix_tokens} tokens)")
+        except Exception as e:
+            # Model or key without context caching: keep sending the prefix inline
+            print(f"⚠️ Context caching unavailable, sending prefix inline: {e}")
+            self.provider_cache = False
+
+    def _extend_provider_cache(self):
+        """Push the TTL out again, or recreate the cache if it cannot be updated"""
+        update = getattr(self.client.caches, 'update', None)
+        if update is not None:
+            try:
+                update(name=self.cache_name, config={'ttl': f"{int(self.ttl_s)}s"})
+                self.cache_expires = time.monotonic() + self.ttl_s
+                self.stats['cache_extensions'] += 1
+                return
+            except Exception as e:
+                print(f"⚠️ Could not extend prompt cache, recreating it: {e}")
+        self._drop_provider_cache()
+        self._create_provider_cache()
+
+    def _set_prefix(self, prefix):
+        if prefix == self.prefix:
+            if self.cache_name and time.monotonic() >= self.cache_expires - self.refresh_margin_s:
+                self._extend_provider_cache()
+            return
+        self._drop_provider_cache()
+        self.prefix = prefix
+        self.prefix_tokens = self.count_tokens(prefix)
+        self.stats['prefix_builds'] += 1
+
+        if self.provider_cache and self.prefix_tokens >= self.min_tokens:
+            self._create_provider_cache()
+
+    def request(self, prefix, suffix):
+        """
+        Build the contents and config for one generate call.
+
+        Args:
+            prefix: build_prefix() output
+            suffix: build_suffix() output
+
+        Returns:
+            tuple: (contents, config or None, estimated input tokens sent this turn)
+        """
+        self._set_prefix(prefix)
+        suffix_tokens = self.count_tokens(suffix)
+        self.stats['turns'] += 1
+
+        if self.cache_name:
+            sent = suffix_tokens
+            self.stats['prefix_tokens_cached'] += self.prefix_tokens
+            contents, config = suffix, {'cached_content': self.cache_name}
+        else:
+            sent = self.prefix_tokens + suffix_tokens
+            contents, config = prefix + suffix, None
+
+        self.stats['sent_tokens'] += sent
+        return contents, config, sent
+
+    def cache_failed(self, prefix, suffix):
+        """
+        Recover from a generate call that failed while using the provider cache.
+
+        The cache is invalidated (it may have expired or been evicted early)
+        and the same turn is rebuilt with the prefix inline; the next turn
+        creates a fresh cache.
+
+        Returns:
+            tuple: (contents, None, estimated input tokens sent) for the retry
+        """
+        self.stats['cache_failures'] += 1
+        self.stats['prefix_tokens_cached'] -= self.prefix_tokens
+        self.invalidate()
+        sent = self.count_tokens(prefix) + self.count_tokens(suffix)
+        self.stats['sent_tokens'] += sent
+        return prefix + suffix, None, sent
+
+    def invalidate(self):
+        """Forget the current prefix (e.g. after memory is cleared)"""
+        self._drop_provider_cache()
+        self.prefix = None
+        self.prefix_tokens = 0
+
+    def close(self):
+        self._drop_provider_cache()
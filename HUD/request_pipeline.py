@@ -0,0 +1,257 @@
+"""
+Request Pipeline for LUDO
+One long-lived asyncio worker that runs voice and text queries one at a
+time from a bounded queue. A new query supersedes stale ones, every
+request has a timeout, and results are committed in submission order
+only by requests that are still current.
+
+Usage:
+    python request_pipeline.py   # self-test with fake slow requests
+"""
+
+import asyncio
+import functools
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RequestCancelled(Exception):
+    """Raised inside a handler whose request was superseded or timed out"""
+
+
+class Request:
+    """Handle for one queued query"""
+
+    __slots__ = ('id', 'label', 'timeout', 'submitted', 'started', 'finished', 'status',
+                 '_cancelled', '_cancel_event', '_pipeline')
+
+    def __init__(self, request_id, label, timeout, pipeline):
+        self.id = request_id
+        self.label = label
+        self.timeout = timeout
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.status = 'queued'  # queued, running, done, cancelled, timeout, dropped, error
+        self._cancelled = threading.Event()
+        self._cancel_event = None  # asyncio.Event, created on the worker loop when the request starts
+        self._pipeline = pipeline
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Mark the request stale; safe to call from any thread"""
+        with self._pipeline._commit_lock:
+            self._cancelled.set()
+        event = self._cancel_event
+        if event is not None:
+            self._pipeline._loop.call_soon_threadsafe(event.set)
+
+    def check(self):
+        """Raise RequestCancelled if the request went stale (call between slow steps)"""
+        if self._cancelled.is_set():
+            raise RequestCancelled(self.label)
+
+    def commit(self, apply):
+        """
+        Apply shared-state changes unless the request went stale.
+
+        Commits are serialized with cancellation, so a superseded request
+        can never write after the request that replaced it.
+
+        Args:
+            apply: Callable performing the commit
+
+        Returns:
+            bool: True if apply() ran
+        """
+        with self._pipeline._commit_lock:
+            if self._cancelled.is_set():
+                return False
+            apply()
+            return True
+
+
+class RequestPipeline:
+    """Single asyncio worker thread with a bounded request queue"""
+
+    def __init__(self, max_pending=4, timeout=60.0, supersede=True, workers=2, on_idle=None):
+        """
+        Args:
+            max_pending: Queued requests kept; the oldest is dropped when full
+            timeout: Default seconds before a running request is abandoned
+            supersede: Cancel running and queued requests when a new one arrives
+            workers: Threads for blocking handlers (stale handlers may still be
+                     finishing in one while the next request runs)
+            on_idle: Callable run on the worker thread whenever the queue drains
+        """
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.supersede = supersede
+        self.on_idle = on_idle
+        self.stats = {'submitted': 0, 'completed': 0, 'cancelled': 0, 'timed_out': 0, 'dropped': 0, 'errors': 0}
+        self.current = None
+
+        self._ids = itertools.count(1)
+        self._commit_lock = threading.Lock()
+        self._pending = []  # Requests submitted but not yet started, oldest first
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ludo-request")
+        self._loop = asyncio.new_event_loop()
+        self._queue = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    @property
+    def busy(self):
+        """True while a request is running or queued"""
+        return self.current is not None or bool(self._pending)
+
+    def submit(self, handler, *args, timeout=None, label=""):
+        """
+        Queue handler(*args, request=request) to run on the worker.
+
+        Args:
+            handler: Blocking callable; receives the Request as the `request`
+                     keyword argument
+            timeout: Seconds before the request is abandoned (None uses the default)
+            label: Name used in logs
+
+        Returns:
+            Request: Handle that can be cancelled
+        """
+        request = Request(next(self._ids), label or getattr(handler, '__name__', 'request'),
+                          self.timeout if timeout is None else timeout, self)
+        self.stats['submitted'] += 1
+        if self.supersede:
+            self.cancel_all()
+        self._loop.call_soon_threadsafe(self._enqueue, request, handler, args)
+        return request
+
+    def cancel_all(self):
+        """Cancel the running request and everything queued"""
+        current = self.current
+        if current is not None:
+            current.cancel()
+        for request in list(self._pending):
+            request.cancel()
+
+    def _enqueue(self, request, handler, args):
+        if self._queue.full():
+            stale, _, _ = self._queue.get_nowait()
+            stale.cancel()
+            stale.status = 'dropped'
+            self.stats['dropped'] += 1
+            self._pending.remove(stale)
+            print(f"⚠️ Request queue full, dropped '{stale.label}'")
+        self._pending.append(request)
+        self._queue.put_nowait((request, handler, args))
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._ready.set()
+        self._loop.run_until_complete(self._worker())
+
+    async def _worker(self):
+        while True:
+            request, handler, args = await self._queue.get()
+            if request is None:
+                break
+            self._pending.remove(request)
+            if request.cancelled:
+                if request.status == 'queued':
+                    request.status = 'cancelled'
+                    self.stats['cancelled'] += 1
+            else:
+                await self._execute(request, handler, args)
+            if self._queue.empty() and self.on_idle:
+                try:
+                    self.on_idle()
+                except Exception as e:
+                    print(f"Request pipeline idle callback error: {e}")
+
+    async def _execute(self, request, handler, args):
+        self.current = request
+        request.started = time.monotonic()
+        request.status = 'running'
+        request._cancel_event = asyncio.Event()
+        if request.cancelled:
+            request._cancel_event.set()
+
+        work = self._loop.run_in_executor(self._executor, functools.partial(handler, *args, request=request))
+        work.add_done_callback(_consume_exception)
+        cancelled = asyncio.ensure_future(request._cancel_event.wait())
+        try:
+            done, _ = await asyncio.wait({work, cancelled}, timeout=request.timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if work in done:
+                error = work.exception()
+                if error is None:
+                    request.status = 'done'
+                    self.stats['completed'] += 1
+                elif isinstance(error, RequestCancelled):
+                    request.status = 'cancelled'
+                    self.stats['cancelled'] += 1
+                else:
+                    request.status = 'error'
+                    self.stats['errors'] += 1
+                    print(f"Request '{request.label}' failed: {error}")
+            elif cancelled in done:
+                # Superseded: leave the handler to notice and stop on its own
+                request.status = 'cancelled'
+                self.stats['cancelled'] += 1
+            else:
+                request.cancel()
+                request.status = 'timeout'
+                self.stats['timed_out'] += 1
+                print(f"⏱️ Request '{request.label}' timed out after {request.timeout:.0f}s")
+        finally:
+            cancelled.cancel()
+            request.finished = time.monotonic()
+            self.current = None
+
+    def stop(self):
+        """Cancel outstanding work and stop the worker"""
+        self.cancel_all()
+
+        def shutdown():
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait((None, None, None))
+
+        self._loop.call_soon_threadsafe(shutdown)
+        self._thread.join(timeout=2.0)
+        self._executor.shutdown(wait=False)
+
+
+def _consume_exception(future):
+    # Stale handlers may finish after the worker moved on; mark their errors as seen
+    if not future.cancelled():
+        future.exception()
+
+
+if __name__ == "__main__":
+    committed = []
+
+    def slow_query(text, seconds, request=None):
+        for _ in range(int(seconds / 0.05)):
+            time.sleep(0.05)
+            request.check()
+        request.commit(lambda: committed.append(text))
+
+    pipeline = RequestPipeline(max_pending=2, timeout=1.0)
+    pipeline.submit(slow_query, "stale question", 0.5, label="stale")
+    time.sleep(0.1)
+    pipeline.submit(slow_query, "latest question", 0.2, label="latest")
+    time.sleep(0.5)
+    pipeline.submit(slow_query, "hung question", 5.0, label="hung")
+    time.sleep(1.5)
+    pipeline.stop()
+    print(f"committed: {committed}")
+    print(f"stats: {pipeline.stats}")
@@ -0,0 +1,200 @@
+"""
+Response Cache for LUDO
+Persists Gemini answers on disk, keyed by the normalized question plus a
+fingerprint of the context the answer depended on, with per-entry TTL and
+size-bounded LRU eviction. Reports hit rate and the API latency saved.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+
+# Questions whose answer changes with the clock; never cached
+TIME_SENSITIVE_WORDS = {
+    'today', "today's", 'tonight', 'now', 'current', 'currently', 'latest', 'recent', 'news',
+    'weather', 'time', 'date', 'day', 'yesterday', 'tomorrow', 'week', 'price', 'score', 'stock',
+}
+
+# Questions that refer back to the conversation ("tell me more about it",
+# "what's my name?", "what did I ask first?"); their answers are keyed on
+# the conversation too
+CONTEXT_WORDS = {
+    'it', 'its', "it's", 'that', "that's", 'this', 'those', 'these', 'they', 'them', 'their',
+    'he', 'she', 'him', 'her', 'his', 'i', "i'm", "i've", "i'd", 'me', 'my', 'mine', 'myself',
+    'we', 'us', 'our', 'ours', 'you', 'your', 'yours', 'more', 'again', 'also', 'else', 'above',
+    'previous', 'previously', 'earlier', 'before', 'first', 'last', 'continue', 'remember',
+    'said', 'say', 'told', 'tell', 'mentioned', 'asked',
+}
+
+_PUNCTUATION = re.compile(r"[^\w\s']")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return _SPACES.sub(" ", _PUNCTUATION.sub(" ", query.lower())).strip()
+
+
+def _words(query):
+    return set(normalize_query(query).split())
+
+
+def is_time_sensitive(query):
+    """True if the answer depends on when the question is asked"""
+    return bool(_words(query) & TIME_SENSITIVE_WORDS)
+
+
+def is_context_dependent(query):
+    """True if the question may refer back to earlier turns"""
+    return bool(_words(query) & CONTEXT_WORDS)
+
+
+def response_fingerprint(query, context=(), conversation=()):
+    """
+    Fingerprint of what a cached answer depends on.
+
+    Self-contained questions are keyed on the context alone (system prompt,
+    web results), so asking the same question again hits even though the
+    conversation grew in between. Questions that refer back are also keyed
+    on the conversation.
+
+    Args:
+        query: User question
+        context: Strings every answer depends on
+        conversation: Summary, turns and recalled exchanges
+
+    Returns:
+        str: context_fingerprint() of the relevant parts
+    """
+    if is_context_dependent(query):
+        return context_fingerprint(*context, *conversation)
+    return context_fingerprint(*context)
+
+
+def context_fingerprint(*parts):
+    """Short stable hash of the context strings an answer was generated from"""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update((part or "").encode('utf-8'))
+        digest.update(b"\x1f")
+    return digest.hexdigest()[:16]
+
+
+class ResponseCache:
+    """On-disk TTL + LRU cache of model answers"""
+
+    def __init__(self, path, max_entries=200, ttl_s=7 * 24 * 3600):
+        """
+        Args:
+            path: JSON file the cache is persisted to
+            max_entries: Least recently used entries beyond this are evicted
+            ttl_s: Default lifetime of an entry in seconds
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.entries = OrderedDict()  # key -> entry dict, least recently used first
+        self.stats = {'lookups': 0, 'hits': 0, 'expired': 0, 'stores': 0, 'saved_ms': 0.0}
+
+    @staticmethod
+    def make_key(query, fingerprint):
+        return f"{normalize_query(query)}|{fingerprint}"
+
+    def load(self):
+        """Load entries from disk, skipping expired ones"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+                now = time.time()
+                for key, entry in stored:
+                    if entry['expires'] > now:
+                        self.entries[key] = entry
+                print(f"⚡ Loaded {len(self.entries)} cached response(s)")
+        except Exception as e:
+            print(f"Failed to load response cache: {e}")
+            self.entries.clear()
+
+    def save(self):
+        """Write entries to disk (least recently used first)"""
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self.entries.items()), f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Failed to save response cache: {e}")
+
+    def get(self, query, fingerprint):
+        """
+        Look up a cached answer.
+
+        Args:
+            query: User question
+            fingerprint: context_fingerprint() of the context used for the answer
+
+        Returns:
+            str or None: Cached answer if present and fresh
+        """
+        self.stats['lookups'] += 1
+        key = self.make_key(query, fingerprint)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry['expires'] <= time.time():
+            del self.entries[key]
+            self.stats['expired'] += 1
+            return None
+        self.entries.move_to_end(key)
+        entry['hits'] += 1
+        self.stats['hits'] += 1
+        self.stats['saved_ms'] += entry['latency_ms']
+        return entry['answer']
+
+    def put(self, query, fingerprint, answer, latency_ms, ttl_s=None):
+        """
+        Store an answer and persist the cache.
+
+        Args:
+            query: User question
+            fingerprint: context_fingerprint() of the context used for the answer
+            answer: Model response text
+            latency_ms: How long the API call took (credited as saved on each hit)
+            ttl_s: Lifetime override in seconds
+        """
+        if not answer or not answer.strip():
+            return
+        key = self.make_key(query, fingerprint)
+        self.entries[key] = {
+            'answer': answer,
+            'expires': time.time() + (self.ttl_s if ttl_s is None else ttl_s),
+            'latency_ms': round(latency_ms, 1),
+            'hits': 0,
+        }
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self.stats['stores'] += 1
+        self.save()
+
+    def clear(self):
+        """Drop all entries and delete the cache file"""
+        self.entries.clear()
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except Exception as e:
+            print(f"Failed to delete response cache: {e}")
+
+    @property
+    def hit_rate(self):
+        lookups = self.stats['lookups']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def report(self):
+        """One-line summary of cache effectiveness"""
+        return (f"{self.stats['hits']}/{self.stats['lookups']} hits ({self.hit_rate:.0%}), "
+                f"{self.stats['saved_ms'] / 1000:.1f}s of API latency saved, {len(self.entries)} entries")
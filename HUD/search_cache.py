@@ -0,0 +1,203 @@
+"""
+Web Search Cache for LUDO
+Persists search results on disk under normalized query keys, with a
+lifetime chosen per query class (weather and prices expire in minutes,
+reference lookups in days), LRU eviction by total size, and
+stale-while-revalidate: an expired entry is still returned at once while
+a background refresh replaces it.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from response_cache import normalize_query
+
+# Query class -> (fresh lifetime, extra seconds a stale entry may still be served)
+SEARCH_CACHE_POLICY = {
+    'price': (300, 900),
+    'weather': (1800, 3600),
+    'news': (1800, 6 * 3600),
+    'reference': (7 * 24 * 3600, 30 * 24 * 3600),
+}
+
+QUERY_CLASS_WORDS = {
+    'price': {'price', 'prices', 'stock', 'stocks', 'score', 'scores', 'rate', 'exchange', 'bitcoin', 'crypto'},
+    'weather': {'weather', 'forecast', 'temperature', 'rain', 'humidity'},
+    'news': {'news', 'latest', 'today', "today's", 'current', 'recent', 'now', 'tonight', 'yesterday', 'update'},
+}
+
+# Phrasing that does not change the results
+FILLER_PREFIXES = ('search for ', 'look up ', 'google ', 'find information about ', 'find information on ')
+FILLER_WORDS = {'please', 'can', 'you', 'could', 'tell', 'me'}
+
+
+def search_key(query):
+    """Normalized cache key: lowercase, no punctuation, filler phrasing removed"""
+    key = normalize_query(query)
+    for prefix in FILLER_PREFIXES:
+        if key.startswith(prefix):
+            key = key[len(prefix):]
+            break
+    words = [word for word in key.split() if word not in FILLER_WORDS]
+    return " ".join(words) or key
+
+
+def query_class(query):
+    """Class of a query for SEARCH_CACHE_POLICY ('price', 'weather', 'news' or 'reference')"""
+    words = set(normalize_query(query).split())
+    for name, class_words in QUERY_CLASS_WORDS.items():
+        if words & class_words:
+            return name
+    return 'reference'
+
+
+class SearchCache:
+    """On-disk TTL + size-bounded LRU cache of search results"""
+
+    def __init__(self, path, max_bytes=512 * 1024, policy=None):
+        """
+        Args:
+            path: JSON file the cache is persisted to
+            max_bytes: Least recently used entries are evicted beyond this total size
+            policy: Overrides for SEARCH_CACHE_POLICY
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.policy = dict(SEARCH_CACHE_POLICY, **(policy or {}))
+        self.entries = OrderedDict()  # key -> entry dict, least recently used first
+        self.size = 0
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()  # One writer of the temp file at a time, snapshots in order
+        self._refreshing = set()
+        self.stats = {'lookups': 0, 'fresh': 0, 'stale': 0, 'misses': 0, 'refreshes': 0, 'evicted': 0}
+
+    def load(self):
+        """Load entries from disk, skipping ones past their stale window"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+                now = time.time()
+                with self._lock:
+                    for key, entry in stored:
+                        if entry['stale_until'] > now:
+                            self.entries[key] = entry
+                            self.size += entry['size']
+                print(f"📦 Loaded {len(self.entries)} cached search(es)")
+        except Exception as e:
+            print(f"Failed to load search cache: {e}")
+            self.entries.clear()
+            self.size = 0
+
+    def save(self):
+        """Write entries to disk (least recently used first)"""
+        try:
+            # The refresh thread and foreground put() both save; the snapshot is taken
+            # under the save lock too, so an older one can never replace a newer file
+            with self._save_lock:
+                with self._lock:
+                    data = json.dumps(list(self.entries.items()), ensure_ascii=False)
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Failed to save search cache: {e}")
+
+    def get(self, query):
+        """
+        Look up cached results.
+
+        Returns:
+            tuple: (results or None, fresh) - fresh is False for a stale entry
+                   that should be revalidated
+        """
+        key = search_key(query)
+        now = time.time()
+        with self._lock:
+            self.stats['lookups'] += 1
+            entry = self.entries.get(key)
+            if entry is None or entry['stale_until'] <= now:
+                if entry is not None:
+                    self._remove(key)
+                self.stats['misses'] += 1
+                return None, False
+            self.entries.move_to_end(key)
+            fresh = entry['expires'] > now
+            self.stats['fresh' if fresh else 'stale'] += 1
+            return entry['results'], fresh
+
+    def put(self, query, results):
+        """Store results for a query and persist the cache"""
+        key = search_key(query)
+        ttl_s, stale_s = self.policy[query_class(query)]
+        now = time.time()
+        entry = {
+            'results': results,
+            'class': query_class(query),
+            'fetched': now,
+            'expires': now + ttl_s,
+            'stale_until': now + ttl_s + stale_s,
+        }
+        entry['size'] = len(json.dumps(results, ensure_ascii=False))
+        with self._lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = entry
+            self.size += entry['size']
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                self._remove(next(iter(self.entries)))
+                self.stats['evicted'] += 1
+        self.save()
+
+    def _remove(self, key):
+        self.size -= self.entries.pop(key)['size']
+
+    def refresh_async(self, query, fetch):
+        """
+        Re-run a search in the background and replace the cached results.
+
+        Args:
+            query: Query whose entry is stale
+            fetch: Callable returning fresh results, or None on failure
+                   (the stale entry is then kept)
+        """
+        key = search_key(query)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                results = fetch()
+                if results is not None:
+                    self.put(query, results)
+                    self.stats['refreshes'] += 1
+            except Exception as e:
+                print(f"Search refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def clear(self):
+        """Drop all entries and delete the cache file"""
+        with self._lock:
+            self.entries.clear()
+            self.size = 0
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        except Exception as e:
+            print(f"Failed to delete search cache: {e}")
+
+    def report(self):
+        """One-line summary of cache effectiveness"""
+        s = self.stats
+        return (f"{s['fresh']} fresh + {s['stale']} stale hits / {s['lookups']} lookups, "
+                f"{s['refreshes']} background refreshes, {len(self.entries)} entries ({self.size // 1024} KB)")
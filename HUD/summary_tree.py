@@ -0,0 +1,139 @@
+"""
+Hierarchical Conversation Summary for LUDO
+Summarizes each block of messages once as it leaves the prompt window and
+merges summaries level by level (like a binary counter), so the cost of a
+turn depends only on the newly evicted messages and the summary handed to
+the prompt stays bounded while still covering the whole conversation.
+
+Usage:
+    python summary_tree.py   # fold a long synthetic conversation and print the summary
+"""
+
+from token_counter import extract_key_points
+
+POINT_SEPARATOR = " | "
+
+
+def clip_point(point, max_chars):
+    """Shorten a key point at a word boundary"""
+    if len(point) <= max_chars:
+        return point
+    return point[:max_chars].rsplit(" ", 1)[0] + "..."
+
+
+def select_points(groups, max_chars):
+    """
+    Pick key points from several groups so the joined text fits in max_chars.
+
+    Points are taken round-robin (every group's first point, then every
+    group's second, ...), newest group first within a round, so old and new
+    parts of the conversation stay represented instead of one end being cut.
+
+    Args:
+        groups: Lists of points, oldest group first
+        max_chars: Budget for the points joined with POINT_SEPARATOR
+
+    Returns:
+        list: Selected points in conversation order
+    """
+    chosen = [[] for _ in groups]
+    used = 0
+    depth = 0
+    while any(depth < len(group) for group in groups):
+        for g in range(len(groups) - 1, -1, -1):
+            if depth >= len(groups[g]):
+                continue
+            point = groups[g][depth]
+            cost = len(point) + (len(POINT_SEPARATOR) if used else 0)
+            if used + cost <= max_chars:
+                chosen[g].append(point)
+                used += cost
+        depth += 1
+    return [point for group in chosen for point in group]
+
+
+class SummaryTree:
+    """
+    Incremental summary of messages that have left the prompt window.
+
+    Level 0 holds one node per summarized block of messages; whenever a
+    level collects `fanout` nodes they are merged into one node on the next
+    level. Each node is a list of key points capped at node_chars, so a
+    merge costs O(fanout * node_chars) no matter how much conversation the
+    node covers.
+    """
+
+    def __init__(self, fanout=4, node_chars=300, max_chars=500, point_chars=120):
+        """
+        Args:
+            fanout: Nodes per level before they are merged upwards
+            node_chars: Character budget of one node
+            max_chars: Character budget of the rendered summary
+            point_chars: Longest single key point
+        """
+        self.fanout = fanout
+        self.node_chars = node_chars
+        self.max_chars = max_chars
+        self.point_chars = point_chars
+        self.clear()
+
+    def clear(self):
+        self.levels = [[]]  # levels[k] = nodes (point lists), oldest first
+        self.messages = 0  # Messages summarized so far
+        self.version = 0
+        self._text = ""
+
+    def add(self, messages):
+        """
+        Summarize a block of messages that just left the window.
+
+        Args:
+            messages: "User: ..." / "LUDO: ..." strings, oldest first
+        """
+        if not messages:
+            return
+        points = [clip_point(point, self.point_chars) for point in extract_key_points(messages)]
+        self.messages += len(messages)
+        self.levels[0].append(select_points([points], self.node_chars))
+        level = 0
+        while len(self.levels[level]) >= self.fanout:
+            merged = select_points(self.levels[level], self.node_chars)
+            self.levels[level] = []
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+            self.levels[level + 1].append(merged)
+            level += 1
+        self._text = POINT_SEPARATOR.join(select_points(self.nodes(), self.max_chars))
+        self.version += 1
+
+    def nodes(self):
+        """All nodes in conversation order (higher levels cover older messages)"""
+        return [node for level in reversed(self.levels) for node in level]
+
+    @property
+    def text(self):
+        """Summary for the prompt, at most max_chars characters"""
+        return self._text
+
+    def __len__(self):
+        return len(self._text)
+
+    def __bool__(self):
+        return bool(self._text)
+
+
+if __name__ == "__main__":
+    import time
+
+    tree = SummaryTree()
+    block = 6
+    start = time.perf_counter()
+    for turn in range(0, 2000, block // 2):
+        messages = []
+        for i in range(turn, turn + block // 2):
+            messages += [f"User: tell me about topic number {i} please", f"LUDO: Topic {i} is about item {i * 7}. More detail."]
+        tree.add(messages)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{tree.messages} messages in {sum(len(level) for level in tree.levels)} nodes over {len(tree.levels)} levels, "
+          f"{elapsed / (2000 // (block // 2)):.3f} ms per block")
+    print(f"{len(tree)} chars: {tree.text}")
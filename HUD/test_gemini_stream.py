@@ -0,0 +1,74 @@
+"""
+Streaming Gemini Response Tests for LUDO
+
+Usage:
+    python -m unittest test_gemini_stream
+"""
+
+import unittest
+
+from gemini_stream import FakeStreamingClient, stream_response
+
+ANSWER = "one two three four five six seven"
+
+
+class StreamResponseTest(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeStreamingClient(ANSWER, first_token_delay=0.05, chunk_delay=0.01, words_per_chunk=3)
+
+    def test_partials_arrive_in_order(self):
+        partials = []
+        text, timings = stream_response(self.client, "fake", "User: count\nLUDO:", on_text=partials.append)
+        self.assertEqual(text, ANSWER)
+        self.assertEqual(partials, ["one two three", "one two three four five six", ANSWER])
+        for shorter, longer in zip(partials, partials[1:]):
+            self.assertTrue(longer.startswith(shorter))
+
+    def test_timings(self):
+        text, timings = stream_response(self.client, "fake", "User: count\nLUDO:")
+        self.assertEqual(timings.chunks, 3)
+        self.assertEqual(timings.chars, len(text))
+        self.assertGreaterEqual(timings.ttft_ms, 50)
+        self.assertLess(timings.ttft_ms, timings.total_ms)
+        self.assertGreaterEqual(timings.total_ms - timings.ttft_ms, 2 * 10 * 0.9)
+        self.assertIsNotNone(timings.prompt_tokens)
+
+    def test_non_streaming_call(self):
+        partials = []
+        text, timings = stream_response(self.client, "fake", "User: count\nLUDO:", on_text=partials.append,
+                                        stream=False)
+        self.assertEqual(text, ANSWER)
+        self.assertEqual(partials, [ANSWER])
+        self.assertEqual(timings.chunks, 1)
+        self.assertEqual(timings.ttft_ms, timings.total_ms)
+
+    def test_empty_chunks_are_skipped(self):
+        client = FakeStreamingClient(ANSWER, first_token_delay=0, chunk_delay=0)
+        chunks = list(client.models.generate_content_stream(model="fake", contents="x"))
+        client.models.generate_content_stream = lambda model, contents: iter(
+            [type(chunks[0])(text="", usage_metadata=None)] + chunks)
+        partials = []
+        text, timings = stream_response(client, "fake", "x", on_text=partials.append)
+        self.assertEqual(text, ANSWER)
+        self.assertEqual(timings.chunks, len(chunks))
+        self.assertEqual(partials[0], chunks[0].text)
+
+    def test_cached_prefix_tokens_reported(self):
+        cache = self.client.caches.create(model="fake", config={'contents': ["x" * 400]})
+        _, timings = stream_response(self.client, "fake", "User: count\nLUDO:", config={'cached_content': cache.name})
+        self.assertEqual(timings.cached_tokens, 100)
+        self.assertGreater(timings.prompt_tokens, timings.cached_tokens)
+
+    def test_stop_from_on_text_ends_stream(self):
+        class Stop(Exception):
+            pass
+
+        def on_text(partial):
+            raise Stop()
+
+        with self.assertRaises(Stop):
+            stream_response(self.client, "fake", "x", on_text=on_text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Request Pipeline Tests for LUDO
+
+Usage:
+    python -m unittest test_request_pipeline
+"""
+
+import threading
+import time
+import unittest
+
+from request_pipeline import Request, RequestCancelled, RequestPipeline
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class RequestPipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = RequestPipeline(max_pending=2, timeout=2.0)
+
+    def tearDown(self):
+        self.pipeline.stop()
+
+    def test_text_query_reaches_handler(self):
+        received = {}
+        finished = threading.Event()
+
+        # Same shape as JarvisHUD.process_text_input(query, request=None)
+        def process_text_input(query, request=None):
+            received['query'] = query
+            received['request'] = request
+            finished.set()
+
+        request = self.pipeline.submit(process_text_input, "what time is it", label="text")
+        self.assertTrue(finished.wait(2.0))
+        self.assertEqual(received['query'], "what time is it")
+        self.assertIs(received['request'], request)
+        self.assertIsInstance(received['request'], Request)
+        self.assertTrue(wait_until(lambda: request.finished is not None))
+        self.assertEqual(request.status, 'done')
+        self.assertEqual(self.pipeline.stats['errors'], 0)
+        self.assertEqual(self.pipeline.stats['completed'], 1)
+
+    def test_handler_without_arguments_gets_request(self):
+        # Same shape as JarvisHUD.listen_for_voice(request=None)
+        received = []
+        finished = threading.Event()
+
+        def listen_for_voice(request=None):
+            received.append(request)
+            finished.set()
+
+        request = self.pipeline.submit(listen_for_voice, label="voice")
+        self.assertTrue(finished.wait(2.0))
+        self.assertEqual(received, [request])
+
+    def test_superseded_query_does_not_commit(self):
+        committed = []
+        started = threading.Event()
+
+        def slow_query(text, request=None):
+            started.set()
+            while True:
+                request.check()
+                time.sleep(0.02)
+
+        def fast_query(text, request=None):
+            request.commit(lambda: committed.append(text))
+
+        stale = self.pipeline.submit(slow_query, "stale", label="stale")
+        self.assertTrue(started.wait(2.0))
+        self.pipeline.submit(fast_query, "latest", label="latest")
+        self.pipeline.stop()
+        self.assertTrue(stale.cancelled)
+        self.assertFalse(stale.commit(lambda: committed.append("stale")))
+        self.assertNotIn("stale", committed)
+        self.assertRaises(RequestCancelled, stale.check)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Response Cache Tests for LUDO
+
+Usage:
+    python -m unittest test_response_cache
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from response_cache import ResponseCache, is_context_dependent, response_fingerprint
+
+SYSTEM_PROMPT = "You are LUDO, a helpful AI assistant."
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = ResponseCache(os.path.join(self.directory, "responses.json"))
+        self.history = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def ask(self, query, web_results=""):
+        """One turn the way get_gemini_response runs it: look up, answer on a miss, append to history"""
+        fingerprint = response_fingerprint(query, (SYSTEM_PROMPT, "", web_results), ("", "\n".join(self.history), ""))
+        answer = self.cache.get(query, fingerprint)
+        hit = answer is not None
+        if not hit:
+            answer = f"answer {len(self.history) // 2}"
+            self.cache.put(query, fingerprint, answer, latency_ms=800)
+        self.history += [f"User: {query}", f"LUDO: {answer}"]
+        return answer, hit
+
+    def test_same_question_twice_in_a_row_hits(self):
+        first, hit = self.ask("How far is the moon from earth?")
+        self.assertFalse(hit)
+        second, hit = self.ask("how far is the moon from Earth")
+        self.assertTrue(hit)
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.stats['hits'], 1)
+
+    def test_different_web_results_miss(self):
+        self.ask("Who wrote Dune?", web_results="1. Frank Herbert")
+        _, hit = self.ask("Who wrote Dune?", web_results="1. Dune (novel)")
+        self.assertFalse(hit)
+
+    def test_question_about_the_conversation_misses_after_it_changed(self):
+        self.ask("What did I ask first?")
+        _, hit = self.ask("What did I ask first?")
+        self.assertFalse(hit)
+
+    def test_context_dependent_words(self):
+        for query in ("what's my name", "Tell me more about it", "what did I ask first?",
+                      "remember our plan", "what did you say earlier"):
+            self.assertTrue(is_context_dependent(query), query)
+        for query in ("How far is the moon from earth?", "Explain binary search"):
+            self.assertFalse(is_context_dependent(query), query)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+Text Layout Cache for LUDO
+Wraps and pre-renders chat and notepad text once, so steady-state frames
+only blit surfaces instead of shaping text again
+"""
+
+from collections import OrderedDict
+
+
+def wrap_text(text, font, max_width):
+    """
+    Wrap text to fit within a maximum pixel width.
+    Uses font.size() for measurement, which shapes the text without
+    allocating a surface.
+
+    Args:
+        text (str): The text to wrap
+        font (pygame.font.Font): Font used for measuring
+        max_width (int): Maximum line width in pixels
+
+    Returns:
+        list: Wrapped lines
+    """
+    words = text.split(' ')
+    lines = []
+    current_line = []
+
+    for word in words:
+        test_line = ' '.join(current_line + [word])
+
+        if font.size(test_line)[0] <= max_width:
+            current_line.append(word)
+        else:
+            if current_line:
+                lines.append(' '.join(current_line))
+                current_line = [word]
+            else:
+                # Word is too long, split it
+                lines.append(word)
+
+    if current_line:
+        lines.append(' '.join(current_line))
+
+    return lines
+
+
+def wrap_text_chars(text, max_chars):
+    """
+    Wrap text to a maximum number of characters per line.
+
+    Args:
+        text (str): The text to wrap
+        max_chars (int): Maximum characters per line
+
+    Returns:
+        list: Wrapped lines
+    """
+    lines = []
+    current_line = []
+    current_length = 0
+
+    for word in text.split():
+        if current_length + len(word) + 1 <= max_chars:
+            current_line.append(word)
+            current_length += len(word) + 1
+        else:
+            if current_line:
+                lines.append(' '.join(current_line))
+            current_line = [word]
+            current_length = len(word)
+
+    if current_line:
+        lines.append(' '.join(current_line))
+
+    return lines
+
+
+class TextLayout:
+    """Wrapped lines of a single text together with their rendered surfaces"""
+
+    __slots__ = ('lines', 'surfaces')
+
+    def __init__(self, lines, surfaces):
+        self.lines = lines
+        self.surfaces = surfaces
+
+
+class TextLayoutCache:
+    """LRU cache of wrapped and pre-rendered text, keyed by (text, font, width)"""
+
+    def __init__(self, max_entries=256):
+        """
+        Initialize the layout cache
+
+        Args:
+            max_entries: Maximum number of layouts kept before the least
+                         recently used one is evicted
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key):
+        layout = self._entries.get(key)
+        if layout is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return layout
+
+    def _store(self, key, layout):
+        self.misses += 1
+        self._entries[key] = layout
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return layout
+
+    def layout(self, text, font, max_width, color):
+        """
+        Get the layout of text wrapped to a pixel width
+
+        Args:
+            text: Text to lay out
+            font: pygame font to measure and render with
+            max_width: Maximum line width in pixels
+            color: RGB color of the rendered lines
+
+        Returns:
+            TextLayout: Cached or freshly built layout
+        """
+        key = ('px', text, font, max_width, color)
+        layout = self._lookup(key)
+        if layout is None:
+            lines = wrap_text(text, font, max_width)
+            surfaces = [font.render(line, True, color) for line in lines]
+            layout = self._store(key, TextLayout(lines, surfaces))
+        return layout
+
+    def layout_chars(self, text, font, max_chars, color, max_lines=None):
+        """
+        Get the layout of text wrapped to a character count
+
+        Args:
+            text: Text to lay out
+            font: pygame font to render with
+            max_chars: Maximum characters per line
+            color: RGB color of the rendered lines
+            max_lines: Only keep the first N lines (None keeps all)
+
+        Returns:
+            TextLayout: Cached or freshly built layout
+        """
+        key = ('chars', text, font, max_chars, color, max_lines)
+        layout = self._lookup(key)
+        if layout is None:
+            lines = wrap_text_chars(text, max_chars)[:max_lines]
+            surfaces = [font.render(line, True, color) for line in lines]
+            layout = self._store(key, TextLayout(lines, surfaces))
+        return layout
+
+    def render(self, text, font, color):
+        """
+        Get a single pre-rendered line of text (no wrapping)
+
+        Args:
+            text: Text to render
+            font: pygame font to render with
+            color: RGB color
+
+        Returns:
+            pygame.Surface: Cached or freshly rendered surface
+        """
+        key = ('line', text, font, color)
+        layout = self._lookup(key)
+        if layout is None:
+            layout = self._store(key, TextLayout([text], [font.render(text, True, color)]))
+        return layout.surfaces[0]
+
+    def clear(self):
+        """Drop every cached layout (e.g. after the window width changed)"""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,9 +1,18 @@
 """
 Token Counter Utility for LUDO
-Provides token estimation and context management for efficient API usage
+Provides token estimation and context management for efficient API usage.
+Counts come from a pluggable tokenizer backend (SentencePiece model or
+tiktoken BPE vocabulary, both optional and offline) with the 4 characters
+per token heuristic as fallback, memoized per message.
 """
 
-def estimate_tokens(text):
+import os
+from collections import OrderedDict
+
+DEFAULT_SENTENCEPIECE_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tokenizer.model")
+
+
+def heuristic_tokens(text):
     """
     Estimate the number of tokens in a text string.
     Uses approximation: 1 token ≈ 4 characters for English text.
@@ -26,6 +35,153 @@ def estimate_tokens(text):
     return int(token_estimate) + 1
 
 
+class HeuristicTokenizer:
+    """Fallback backend: 4 characters per token"""
+
+    name = "heuristic"
+
+    def count(self, text):
+        return heuristic_tokens(text)
+
+
+class SentencePieceTokenizer:
+    """SentencePiece model file (e.g. the Gemma tokenizer.model, closest to Gemini's own)"""
+
+    def __init__(self, model_path):
+        import sentencepiece
+        self.processor = sentencepiece.SentencePieceProcessor(model_file=model_path)
+        self.name = f"sentencepiece:{os.path.basename(model_path)}"
+
+    def count(self, text):
+        return len(self.processor.encode(text)) if text else 0
+
+
+class TiktokenTokenizer:
+    """tiktoken BPE vocabulary (loaded from tiktoken's local cache when offline)"""
+
+    def __init__(self, encoding_name="cl100k_base"):
+        import tiktoken
+        self.encoding = tiktoken.get_encoding(encoding_name)
+        self.name = f"tiktoken:{encoding_name}"
+
+    def count(self, text):
+        return len(self.encoding.encode(text, disallowed_special=())) if text else 0
+
+
+def load_tokenizer(spec="auto"):
+    """
+    Create a tokenizer backend, falling back to the heuristic if it cannot load.
+
+    Args:
+        spec (str): "heuristic", "sentencepiece[:model path]", "tiktoken[:encoding]"
+                    or "auto" (tokenizer.model next to this file if present, else heuristic;
+                    tiktoken is opt-in because it downloads its vocabulary on first use)
+        
+    Returns:
+        Tokenizer backend with .name and .count(text)
+    """
+    kind, _, arg = (spec or "auto").partition(":")
+    candidates = []
+    if kind == "auto":
+        if os.path.exists(DEFAULT_SENTENCEPIECE_MODEL):
+            candidates.append(("sentencepiece", DEFAULT_SENTENCEPIECE_MODEL))
+    elif kind == "sentencepiece":
+        candidates.append((kind, arg or DEFAULT_SENTENCEPIECE_MODEL))
+    elif kind == "tiktoken":
+        candidates.append((kind, arg or "cl100k_base"))
+    elif kind != "heuristic":
+        print(f"⚠️ Unknown tokenizer '{spec}', using heuristic")
+    
+    for kind, arg in candidates:
+        try:
+            if kind == "sentencepiece":
+                return SentencePieceTokenizer(arg)
+            return TiktokenTokenizer(arg)
+        except Exception as e:
+            print(f"⚠️ Tokenizer {kind} unavailable ({type(e).__name__}: {str(e)[:60]}), using heuristic")
+    return HeuristicTokenizer()
+
+
+class TokenCountCache:
+    """Per-message token counts (LRU), so unchanged history is never re-tokenized"""
+
+    def __init__(self, tokenizer, max_entries=4096):
+        self.tokenizer = tokenizer
+        self.max_entries = max_entries
+        self.counts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def count(self, text):
+        if not text:
+            return 0
+        count = self.counts.get(text)
+        if count is not None:
+            self.counts.move_to_end(text)
+            self.hits += 1
+            return count
+        self.misses += 1
+        count = self.tokenizer.count(text)
+        self.counts[text] = count
+        if len(self.counts) > self.max_entries:
+            self.counts.popitem(last=False)
+        return count
+
+
+_token_cache = TokenCountCache(HeuristicTokenizer())
+
+
+def set_tokenizer(tokenizer):
+    """
+    Switch the backend used by estimate_tokens() and clear memoized counts.
+
+    Args:
+        tokenizer: Backend object, or a load_tokenizer() spec string
+        
+    Returns:
+        The active backend
+    """
+    global _token_cache
+    if isinstance(tokenizer, str):
+        tokenizer = load_tokenizer(tokenizer)
+    _token_cache = TokenCountCache(tokenizer, _token_cache.max_entries)
+    return tokenizer
+
+
+def get_tokenizer():
+    """Return the active tokenizer backend"""
+    return _token_cache.tokenizer
+
+
+def estimate_tokens(text):
+    """
+    Count the tokens in a message with the active backend.
+    Results are memoized per string; use count_tokens_uncached() for
+    one-off texts such as whole prompts.
+    
+    Args:
+        text (str): The text to count tokens for
+        
+    Returns:
+        int: Number of tokens
+    """
+    return _token_cache.count(text)
+
+
+def count_tokens_uncached(text):
+    """
+    Count the tokens in a one-off text (a whole prompt, a clipping probe)
+    without memoizing it, so it cannot evict per-message counts.
+
+    Args:
+        text (str): The text to count tokens for
+
+    Returns:
+        int: Number of tokens
+    """
+    return _token_cache.tokenizer.count(text) if text else 0
+
+
 def estimate_conversation_tokens(conversation_history):
     """
     Estimate total tokens in a conversation history.
@@ -65,31 +221,28 @@ def trim_to_token_budget(conversation_history, max_tokens=2000):
         message_tokens = estimate_tokens(message)
         
         if current_tokens + message_tokens <= max_tokens:
-            trimmed.insert(0, message)
+            trimmed.append(message)
             current_tokens += message_tokens
         else:
             # Budget exceeded, stop adding older messages
             break
     
+    # Collected newest first; restore chronological order
+    trimmed.reverse()
     return trimmed
 
 
-def create_conversation_summary(conversation_history, max_length=500):
+def extract_key_points(conversation_history):
     """
-    Create a condensed summary of conversation history.
-    Extracts key topics and facts from older conversations.
+    Extract the key points of a list of messages: each meaningful user
+    query ("Q: ...") and the first sentence of each response ("A: ...").
     
     Args:
         conversation_history (list): List of conversation strings
-        max_length (int): Maximum character length for summary
         
     Returns:
-        str: Condensed summary of conversations
+        list: Key point strings in conversation order
     """
-    if not conversation_history:
-        return ""
-    
-    # Extract user queries and key responses
     key_points = []
     
     for i, message in enumerate(conversation_history):
@@ -105,8 +258,26 @@ def create_conversation_summary(conversation_history, max_length=500):
             if len(first_sentence) < 150:  # Keep it concise
                 key_points.append(f"A: {first_sentence}")
     
-    # Combine into summary
-    summary = " | ".join(key_points)
+    return key_points
+
+
+def create_conversation_summary(conversation_history, max_length=500):
+    """
+    Create a condensed summary of conversation history.
+    Extracts key topics and facts from older conversations.
+    
+    Args:
+        conversation_history (list): List of conversation strings
+        max_length (int): Maximum character length for summary
+        
+    Returns:
+        str: Condensed summary of conversations
+    """
+    if not conversation_history:
+        return ""
+    
+    # Combine key points into summary
+    summary = " | ".join(extract_key_points(conversation_history))
     
     # Trim to max length if needed
     if len(summary) > max_length:
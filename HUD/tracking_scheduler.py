@@ -0,0 +1,182 @@
+"""
+Hand Tracking Scheduler for LUDO
+Rate-limits MediaPipe inference, runs it on a downscaled frame, skips it
+when nothing in front of the camera moves, backs off on camera read
+failures and publishes each result as one HandSnapshot
+"""
+
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from hand_tracking import HandSnapshot, landmarks_to_points
+
+FINGER_TIPS = (8, 12, 16, 20)
+
+
+class HandTrackingScheduler:
+    """Paces camera reads and hand inference for the tracking thread"""
+
+    def __init__(self, hands, capture, screen_size, publish, max_fps=15, inference_width=320,
+                 motion_threshold=3.0, idle_inference_s=1.0, backoff_initial=0.05, backoff_max=2.0,
+                 latency_report_s=60.0):
+        """
+        Initialize the scheduler
+
+        Args:
+            hands: mediapipe Hands instance
+            capture: Object with read() -> (success, BGR image), e.g. cv2.VideoCapture
+            screen_size: Callable returning the current (width, height) of the HUD
+            publish: Callable receiving each new HandSnapshot
+            max_fps: Maximum inference rate
+            inference_width: Frames are downscaled to this width before inference (0 keeps full size)
+            motion_threshold: Mean absolute difference (0-255) of a tiny grayscale
+                              thumbnail below which a frame counts as still
+            idle_inference_s: Run inference at least this often even without motion
+            backoff_initial: First sleep after a failed camera read (seconds)
+            backoff_max: Longest sleep between failed reads (seconds)
+            latency_report_s: Print capture-to-landmark latency this often (0 disables)
+        """
+        self.hands = hands
+        self.capture = capture
+        self.screen_size = screen_size
+        self.publish = publish
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.inference_width = inference_width
+        self.motion_threshold = motion_threshold
+        self.idle_inference_s = idle_inference_s
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+
+        self.snapshot = HandSnapshot(0)
+        self.running = False
+        self._backoff = backoff_initial
+        self._reference_thumb = None  # Thumbnail of the last frame inference ran on
+        self._last_inference = 0.0
+        self.stats = {'frames': 0, 'inferences': 0, 'skipped_still': 0, 'read_failures': 0}
+        self.latency_report_s = latency_report_s
+        self.latencies = deque(maxlen=300)  # Seconds from camera grab to published landmarks
+        self._last_report = time.monotonic()
+
+    def prepare(self, image):
+        """Downscale, mirror and convert a BGR camera frame to RGB for inference"""
+        if self.inference_width and image.shape[1] > self.inference_width:
+            height = int(image.shape[0] * self.inference_width / image.shape[1])
+            image = cv2.resize(image, (self.inference_width, height), interpolation=cv2.INTER_AREA)
+        image = cv2.flip(image, 1)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    def thumbnail(self, rgb):
+        """64x48 grayscale thumbnail used for motion gating"""
+        return cv2.resize(cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY), (64, 48), interpolation=cv2.INTER_AREA)
+
+    def has_motion(self, thumb):
+        """Cheap frame-difference check against the frame inference last ran on"""
+        reference = self._reference_thumb
+        if reference is None:
+            return True
+        return float(np.mean(cv2.absdiff(thumb, reference))) >= self.motion_threshold
+
+    def infer(self, rgb):
+        """Run hand inference and publish the resulting snapshot"""
+        self.stats['inferences'] += 1
+        self._last_inference = time.monotonic()
+        results = self.hands.process(rgb)
+        previous = self.snapshot
+
+        if results.multi_hand_landmarks:
+            hand = results.multi_hand_landmarks[0]
+
+            # Determine if hand is closed (fingertips below lower joints)
+            closed = all(hand.landmark[tip].y > hand.landmark[tip - 2].y for tip in FINGER_TIPS)
+
+            # Convert all landmarks to screen coordinates once, off the render thread
+            width, height = self.screen_size()
+            points = landmarks_to_points(hand.landmark, width, height)
+            snapshot = HandSnapshot(previous.seq + 1, points, closed, (int(points[0][0]), int(points[0][1])))
+        elif previous.points is not None:
+            snapshot = HandSnapshot(previous.seq + 1)
+        else:
+            return previous
+
+        self.snapshot = snapshot
+        self.publish(snapshot)
+
+        # End-to-end latency, when the capture stage timestamps its frames
+        frame_time = getattr(self.capture, 'last_frame_time', None)
+        if frame_time is not None:
+            self.latencies.append(time.monotonic() - frame_time)
+        return snapshot
+
+    def latency_stats(self):
+        """
+        Capture-to-landmark latency over the recent inferences.
+
+        Returns:
+            dict: p50_ms, p95_ms, max_ms and sample count (empty if unmeasured)
+        """
+        if not self.latencies:
+            return {}
+        ordered = sorted(self.latencies)
+        return {
+            'p50_ms': ordered[len(ordered) // 2] * 1000,
+            'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            'max_ms': ordered[-1] * 1000,
+            'samples': len(ordered),
+        }
+
+    def report(self):
+        """Print tracking rates and latency"""
+        latency = self.latency_stats()
+        stats = self.stats
+        line = (f"🖐️ Hand tracking: {stats['inferences']} inferences, {stats['skipped_still']} still frames skipped, "
+                f"{stats['read_failures']} read failures")
+        if latency:
+            line += f", capture-to-landmark p50 {latency['p50_ms']:.0f} ms / p95 {latency['p95_ms']:.0f} ms"
+        print(line)
+
+    def step(self):
+        """
+        Read one frame and run inference if it is due.
+
+        Returns:
+            float: Seconds to wait before the next step
+        """
+        success, image = self.capture.read()
+        if not success or image is None:
+            # Camera unplugged or busy: back off instead of spinning
+            self.stats['read_failures'] += 1
+            delay = self._backoff
+            self._backoff = min(self._backoff * 2, self.backoff_max)
+            return delay
+        self._backoff = self.backoff_initial
+        self.stats['frames'] += 1
+
+        started = time.monotonic()
+        rgb = self.prepare(image)
+        thumb = self.thumbnail(rgb)
+        idle_due = started - self._last_inference >= self.idle_inference_s
+        if idle_due or self.has_motion(thumb):
+            self._reference_thumb = thumb
+            self.infer(rgb)
+        else:
+            self.stats['skipped_still'] += 1
+
+        return max(0.0, self.min_interval - (time.monotonic() - started))
+
+    def run(self):
+        """Loop until stop() is called"""
+        self.running = True
+        while self.running:
+            delay = self.step()
+            if self.latency_report_s and time.monotonic() - self._last_report >= self.latency_report_s:
+                self._last_report = time.monotonic()
+                self.report()
+            if delay:
+                time.sleep(delay)
+
+    def stop(self):
+        """Ask run() to return"""
+        self.running = False